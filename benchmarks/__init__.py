@@ -0,0 +1,4 @@
+"""
+Benchmarks dos caminhos críticos (carga, gravação, métricas, relatórios e planilha)
+Rodar da raiz do projeto: python -m benchmarks.executar --help
+"""
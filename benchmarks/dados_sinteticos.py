@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geração de dados sintéticos para os benchmarks
+Mesma estrutura do dados_investimentos.json, reprodutível pela semente
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from nucleo.armazenamento import criar_dados_padrao
+from nucleo.categorizacao import CATEGORIAS_SAIDA
+
+# Tamanhos nomeados: transações (entradas + saídas + aportes + proventos) e ativos na carteira
+TRANSACOES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+ATIVOS = {'10': 10, '1000': 1_000}
+
+# Fração das transações em cada coleção
+PROPORCOES = {'entradas': 0.10, 'saidas': 0.60, 'aportes': 0.15, 'proventos': 0.15}
+
+# Mesmas opções dos formulários do app (app_investimentos.py)
+TIPOS_ATIVO = ["FII", "Ação", "Renda Fixa"]
+CATEGORIAS_ENTRADA = ["Salário", "Freelance", "Vendas", "Presente", "Reembolso", "Outros"]
+TIPOS_PROVENTO = ["Dividendo", "JCP", "Rendimento"]
+ANOS_HISTORICO = 5
+
+def _datas(rng, quantidade, hoje):
+    """Datas 'YYYY-MM-DD' uniformes nos últimos ANOS_HISTORICO anos (o mês atual incluído)"""
+    fim = np.datetime64(hoje.strftime('%Y-%m-%d'), 'D')
+    dias = rng.integers(0, 365 * ANOS_HISTORICO, quantidade)
+    return (fim - dias).astype(str).tolist()
+
+def _escolher(rng, opcoes, quantidade):
+    return np.asarray(opcoes, dtype=object)[rng.integers(0, len(opcoes), quantidade)].tolist()
+
+def _valores(rng, quantidade, media):
+    return np.round(rng.lognormal(np.log(media), 0.8, quantidade), 2).tolist()
+
+def gerar_dados(transacoes, ativos, semente=42, hoje=None):
+    """Dados do app (registros como dicts, datas em texto) com `transacoes` e `ativos`"""
+    rng = np.random.default_rng(semente)
+    hoje = hoje or datetime.now()
+    dados = criar_dados_padrao()
+    quantidades = {colecao: int(transacoes * fracao) for colecao, fracao in PROPORCOES.items()}
+    quantidades['saidas'] += transacoes - sum(quantidades.values())
+
+    codigos = [f"AT{i:04d}" for i in range(ativos)]
+    preco_medio = np.round(rng.uniform(5, 150, ativos), 2)
+    cotacao = np.round(preco_medio * rng.normal(1.05, 0.2, ativos).clip(0.3), 2)
+    colunas = zip(codigos, _escolher(rng, TIPOS_ATIVO, ativos), rng.integers(1, 1_000, ativos).tolist(),
+                  preco_medio.tolist(), cotacao.tolist(), _datas(rng, ativos, hoje))
+    dados['carteira'] = [
+        {'codigo': codigo, 'tipo': tipo, 'cotas': cotas, 'preco_medio': preco,
+         'cotacao_atual': atual, 'data_inclusao': data}
+        for codigo, tipo, cotas, preco, atual, data in colunas
+    ]
+
+    for colecao, categorias, media in (('entradas', CATEGORIAS_ENTRADA, 3_000),
+                                       ('saidas', CATEGORIAS_SAIDA, 80)):
+        n = quantidades[colecao]
+        colunas = zip(_datas(rng, n, hoje), _escolher(rng, categorias, n),
+                      [f"Lançamento {i % 500}" for i in range(n)], _valores(rng, n, media),
+                      (rng.random(n) < 0.1).tolist())
+        dados[colecao] = [
+            {'data': data, 'categoria': categoria, 'descricao': descricao, 'valor': valor, 'recorrente': recorrente}
+            for data, categoria, descricao, valor, recorrente in colunas
+        ]
+
+    n = quantidades['aportes']
+    cotas = rng.integers(1, 100, n)
+    colunas = zip(_datas(rng, n, hoje), _escolher(rng, codigos, n), cotas.tolist(),
+                  np.round(cotas * rng.uniform(5, 150, n), 2).tolist())
+    dados['aportes'] = [{'data': data, 'ativo': ativo, 'cotas': c, 'valor': valor}
+                        for data, ativo, c, valor in colunas]
+
+    n = quantidades['proventos']
+    colunas = zip(_datas(rng, n, hoje), _escolher(rng, codigos, n), _escolher(rng, TIPOS_PROVENTO, n),
+                  _valores(rng, n, 40))
+    dados['proventos'] = [{'data': data, 'ativo': ativo, 'tipo': tipo, 'valor': valor}
+                          for data, ativo, tipo, valor in colunas]
+
+    meses = 12 * ANOS_HISTORICO
+    patrimonio = np.cumsum(rng.normal(2_000, 1_500, meses)) + 10_000
+    dados['historico_patrimonio'] = [
+        {'data': (hoje - timedelta(days=30 * (meses - i))).strftime('%Y-%m-%d'), 'valor': round(float(valor), 2)}
+        for i, valor in enumerate(patrimonio)
+    ]
+    dados['metas'] = {'patrimonio_anual': 500_000, 'renda_passiva_mensal': 5_000, 'economia_mensal': 3_000}
+    dados['cdi_anual'] = 13.65
+    return dados
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks dos caminhos críticos
+Tempo e pico de memória (tracemalloc) de cada operação, por tamanho de dados; em JSON com --saida
+
+    python -m benchmarks.executar --tamanhos 1k,100k --ativos 10 --saida antes.json
+    python -m benchmarks.executar --tamanhos 1k,100k --ativos 10 --comparar antes.json
+
+Nada aqui importa o Streamlit: as operações são as mesmas funções que o app chama.
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.dados_sinteticos import ATIVOS, TRANSACOES, gerar_dados
+from nucleo import derivados
+from nucleo.agregados import construir_indices
+from nucleo.armazenamento import criar_armazenamento, preparar_dados
+from nucleo.repositorio import Repositorio
+from nucleo.retornos import retornos_carteira, retornos_por_ativo
+from sistema_investimentos import criar_sistema_investimentos
+
+MB = 1024 * 1024
+
+# ========== OPERAÇÕES ==========
+# Cada operação recebe o contexto do conjunto de dados ({'arquivo', 'backend',
+# 'dados', 'indices', ...}) e roda uma vez; o cache de derivados é limpo antes.
+
+def _salvar_dados(ctx):
+    """Núcleo de salvar_dados: snapshot completo no armazenamento"""
+    armazenamento = criar_armazenamento(ctx['arquivo'], ctx['backend'], intervalo_gravacao_ms=0)
+    armazenamento.compactar(ctx['dados'])
+
+def _carregar_dados(ctx):
+    """carregar_dados do app numa sessão nova: leitura, livros, índices e instantâneo"""
+    repositorio = Repositorio(criar_armazenamento(ctx['arquivo'], ctx['backend'], intervalo_gravacao_ms=0))
+    return repositorio.instantaneo()
+
+def _metricas_carteira(ctx):
+    carteira = ctx['dados']['carteira']
+    return (derivados.calcular_patrimonio_atual(carteira), derivados.calcular_total_investido(carteira),
+            derivados.calcular_rentabilidade_total(carteira))
+
+def _indices_mensais(ctx):
+    """Índices (ano, mês) de que dependem as métricas do mês"""
+    return construir_indices(ctx['dados'])
+
+def _calcular_mes(ctx):
+    """Família calcular_*_mes sobre os índices já montados"""
+    indices = ctx['indices']
+    return (derivados.calcular_proventos_mes_atual(indices['proventos']),
+            derivados.calcular_entradas_mes(indices['entradas']),
+            derivados.calcular_saidas_mes(indices['saidas']),
+            derivados.calcular_aportes_mes(indices['aportes']),
+            derivados.calcular_saldo_mes(indices['entradas'], indices['saidas']),
+            derivados.calcular_taxa_poupanca(indices['entradas'], indices['aportes']))
+
+def _relatorio_carteira(ctx):
+    """df_cart dos Relatórios: carteira detalhada, ordenação e o texto de cada ativo"""
+    df_cart = derivados.carteira_detalhada(ctx['dados']['carteira'])
+    df_cart = df_cart.sort_values('rent_%', ascending=False)
+    linhas = [f"{ativo['codigo']} • R$ {ativo['investido']:,.2f} • R$ {ativo['atual']:,.2f} • {ativo['rent_%']:+.2f}%"
+              for _, ativo in df_cart.iterrows()]
+    return df_cart, linhas
+
+def _retornos(ctx):
+    """TWR e XIRR por ativo e da carteira (Performance)"""
+    dados, hoje = ctx['dados'], datetime.now().date()
+    return (retornos_por_ativo(dados['carteira'], dados['aportes'], dados['proventos'], hoje),
+            retornos_carteira(dados['carteira'], dados['aportes'], dados['proventos'],
+                              dados['historico_patrimonio'], hoje))
+
+def _planilha(ctx):
+    return criar_sistema_investimentos(io.BytesIO(), ctx['dados'], verboso=False)
+
+OPERACOES = {
+    'salvar_dados': _salvar_dados,
+    'carregar_dados': _carregar_dados,
+    'metricas_carteira': _metricas_carteira,
+    'indices_mensais': _indices_mensais,
+    'calcular_mes': _calcular_mes,
+    'relatorio_carteira': _relatorio_carteira,
+    'retornos': _retornos,
+    'criar_sistema_investimentos': _planilha,
+}
+
+# ========== MEDIÇÃO ==========
+def medir(funcao, ctx, repeticoes):
+    """{'segundos' (melhor), 'mediana', 'pico_mb'}: tempos sem tracemalloc, pico numa rodada à parte"""
+    tempos = []
+    for _ in range(repeticoes):
+        derivados.cache.limpar()
+        inicio = time.perf_counter()
+        funcao(ctx)
+        tempos.append(time.perf_counter() - inicio)
+
+    derivados.cache.limpar()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        funcao(ctx)
+        pico = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return {'segundos': min(tempos), 'mediana': statistics.median(tempos), 'pico_mb': pico / MB}
+
+def medir_conjunto(transacoes, ativos, operacoes, repeticoes, backend='json', semente=42, relatar=print):
+    """Gera o conjunto, grava, carrega e mede as operações pedidas; devolve os resultados"""
+    resultados = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        ctx = {'arquivo': Path(diretorio) / 'dados_investimentos.json', 'backend': backend,
+               'dados': preparar_dados(gerar_dados(transacoes, ativos, semente))}
+        # A carga sempre parte de um arquivo gravado; as demais usam os dados carregados, como no app
+        _salvar_dados(ctx)
+        instantaneo = _carregar_dados(ctx)
+        ctx['dados'], ctx['indices'] = instantaneo.dados, instantaneo.indices
+        for nome in operacoes:
+            medida = medir(OPERACOES[nome], ctx, repeticoes)
+            resultados.append({'transacoes': transacoes, 'ativos': ativos, 'operacao': nome, **medida})
+            relatar(f"{transacoes:>9,} x {ativos:>5,}  {nome:<28} {medida['segundos'] * 1000:>10.3f} ms  "
+                    f"{medida['pico_mb']:>9.1f} MB")
+    return resultados
+
+# ========== RELATÓRIO ==========
+def _revisao_git():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def ambiente():
+    """Metadados para comparar execuções entre versões e máquinas"""
+    return {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'revisao': _revisao_git(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+    }
+
+def comparar(resultados, arquivo_base, relatar=print):
+    """Razão de tempo e memória atual/base para as medidas presentes nos dois arquivos"""
+    with open(arquivo_base, encoding='utf-8') as f:
+        base = {(r['transacoes'], r['ativos'], r['operacao']): r for r in json.load(f)['resultados']}
+    relatar(f"\nComparação com {arquivo_base} (atual / base):")
+    for r in resultados:
+        anterior = base.get((r['transacoes'], r['ativos'], r['operacao']))
+        if anterior is None:
+            continue
+        tempo = r['segundos'] / anterior['segundos'] if anterior['segundos'] else float('nan')
+        memoria = r['pico_mb'] / anterior['pico_mb'] if anterior['pico_mb'] else float('nan')
+        relatar(f"{r['transacoes']:>9,} x {r['ativos']:>5,}  {r['operacao']:<28} "
+                f"tempo {tempo:>6.2f}x  memória {memoria:>6.2f}x")
+
+def _lista(texto, opcoes):
+    itens = [item.strip() for item in texto.split(',') if item.strip()]
+    invalidos = [item for item in itens if item not in opcoes]
+    if invalidos:
+        raise argparse.ArgumentTypeError(f"{', '.join(invalidos)} (opções: {', '.join(opcoes)})")
+    return itens
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de carga, gravação, métricas e planilha")
+    parser.add_argument('--tamanhos', type=lambda t: _lista(t, TRANSACOES), default=list(TRANSACOES),
+                        help=f"transações: {','.join(TRANSACOES)} (padrão: todos)")
+    parser.add_argument('--ativos', type=lambda t: _lista(t, ATIVOS), default=list(ATIVOS),
+                        help=f"ativos na carteira: {','.join(ATIVOS)} (padrão: todos)")
+    parser.add_argument('--operacoes', type=lambda t: _lista(t, OPERACOES), default=list(OPERACOES),
+                        help=f"operações: {','.join(OPERACOES)} (padrão: todas)")
+    parser.add_argument('--repeticoes', type=int, default=3, help="rodadas cronometradas por operação (padrão: 3)")
+    parser.add_argument('--backend', choices=('json', 'sqlite'), default='json')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--saida', metavar='JSON', help="arquivo JSON dos resultados (sem ele nada é gravado)")
+    parser.add_argument('--comparar', metavar='JSON', help="resultados anteriores para comparar")
+    args = parser.parse_args(argumentos)
+
+    resultados = []
+    for tamanho in args.tamanhos:
+        for ativos in args.ativos:
+            resultados += medir_conjunto(TRANSACOES[tamanho], ATIVOS[ativos], args.operacoes,
+                                         args.repeticoes, args.backend, args.semente)
+    if args.saida:
+        saida = {'ambiente': {**ambiente(), 'backend': args.backend, 'repeticoes': args.repeticoes,
+                              'semente': args.semente},
+                 'resultados': resultados}
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(saida, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados em {args.saida}")
+    if args.comparar:
+        comparar(resultados, args.comparar)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Núcleo do sistema financeiro, sem Streamlit
+Usado pelo app (app_investimentos.py), pela planilha (sistema_investimentos.py) e pelos benchmarks
+
+    livro          livros-razão colunares (NumPy) de cada coleção
+    armazenamento  JSON + journal ou SQLite; carga, gravação e operações
+    agregados      índices de totais mensais
+    repositorio    cópia mestre compartilhada, instantâneos e conflitos
+    derivados      cálculos memorizados pela revisão dos livros
+    projecoes      Monte Carlo e solver de metas
+    importacao     extratos CSV/OFX
+    categorizacao  regras de categorização das saídas
+    instrumentacao spans por execução, histórico e exportação Chrome trace/speedscope
+    amostragem     redução de séries longas (LTTB) para gráficos
+    retornos       rentabilidade TWR e XIRR, da carteira e por ativo
+
+Importar o pacote não carrega nada: cada módulo traz só as próprias dependências.
+"""
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índices de agregados mensais
+Totais por (ano, mês) e (ano, mês, categoria) mantidos de forma incremental
+"""
+
+from .instrumentacao import instrumentado
+
+# Coleções indexadas e o campo usado como "categoria" em cada uma
+CAMPOS_CATEGORIA = {
+    "entradas": "categoria",
+    "saidas": "categoria",
+    "proventos": "ativo",
+    "aportes": "ativo",
+}
+
+def _chave_mes(registro):
+    """(ano, mês) do registro; a data já vem convertida da carga"""
+    data = registro['data']
+    return data.year, data.month
+
+class IndiceMensal:
+    """Totais acumulados por mês e por categoria dentro do mês"""
+
+    def __init__(self, campo_categoria='categoria'):
+        self.campo_categoria = campo_categoria
+        self.totais = {}          # (ano, mes) -> total
+        self.contagens = {}       # (ano, mes) -> quantidade de registros
+        self.por_categoria = {}   # (ano, mes) -> {categoria: total}
+        self.contagens_categoria = {}  # (ano, mes, categoria) -> quantidade
+
+    @classmethod
+    def construir(cls, registros, campo_categoria='categoria'):
+        """Monta o índice a partir de um livro colunar (ou lista de registros)"""
+        indice = cls(campo_categoria)
+        if hasattr(registros, 'como_dataframe'):
+            indice._somar_vetorizado(registros.como_dataframe(['data', campo_categoria, 'valor']))
+        else:
+            for registro in registros:
+                indice.adicionar(registro)
+        return indice
+
+    def _somar_vetorizado(self, df):
+        """Acumula um DataFrame (data, categoria, valor) nos totais com dois groupby"""
+        df = df.dropna(subset=['data'])
+        ano, mes = df['data'].dt.year, df['data'].dt.month
+        por_mes = df.groupby([ano, mes])['valor'].agg(['sum', 'count'])
+        for (a, m), linha in por_mes.iterrows():
+            self.totais[(a, m)] = self.totais.get((a, m), 0) + float(linha['sum'])
+            self.contagens[(a, m)] = self.contagens.get((a, m), 0) + int(linha['count'])
+        categoria = df[self.campo_categoria].astype(object).fillna('Outros')
+        por_categoria = df.groupby([ano, mes, categoria])['valor'].agg(['sum', 'count'])
+        for (a, m, c), linha in por_categoria.iterrows():
+            categorias = self.por_categoria.setdefault((a, m), {})
+            categorias[c] = categorias.get(c, 0) + float(linha['sum'])
+            self.contagens_categoria[(a, m, c)] = self.contagens_categoria.get((a, m, c), 0) + int(linha['count'])
+
+    def estender(self, livro, ids):
+        """Soma de uma vez os registros `ids` do livro (importações em lote)"""
+        posicoes = [livro.posicao(id_registro) for id_registro in ids]
+        self._somar_vetorizado(livro.como_dataframe(['data', self.campo_categoria, 'valor']).iloc[posicoes])
+
+    def copia(self):
+        """Cópia independente do índice"""
+        novo = IndiceMensal(self.campo_categoria)
+        novo.totais = dict(self.totais)
+        novo.contagens = dict(self.contagens)
+        novo.por_categoria = {mes: dict(categorias) for mes, categorias in self.por_categoria.items()}
+        novo.contagens_categoria = dict(self.contagens_categoria)
+        return novo
+
+    def adicionar(self, registro):
+        """Soma o registro aos totais do seu mês"""
+        self._somar(registro, +1)
+
+    def remover(self, registro):
+        """Retira o registro dos totais do seu mês"""
+        self._somar(registro, -1)
+
+    def _somar(self, registro, sinal):
+        chave = _chave_mes(registro)
+        valor = registro['valor'] * sinal
+        categoria = registro.get(self.campo_categoria, 'Outros')
+
+        contagem = self.contagens.get(chave, 0) + sinal
+        if contagem <= 0:
+            # Mês ficou vazio: descarta a chave em vez de acumular resíduo de float
+            self.contagens.pop(chave, None)
+            self.totais.pop(chave, None)
+            for categoria_mes in self.por_categoria.pop(chave, {}):
+                self.contagens_categoria.pop((*chave, categoria_mes), None)
+            return
+        self.contagens[chave] = contagem
+        self.totais[chave] = self.totais.get(chave, 0) + valor
+
+        chave_categoria = (*chave, categoria)
+        categorias = self.por_categoria.setdefault(chave, {})
+        contagem = self.contagens_categoria.get(chave_categoria, 0) + sinal
+        if contagem <= 0:
+            self.contagens_categoria.pop(chave_categoria, None)
+            categorias.pop(categoria, None)
+        else:
+            self.contagens_categoria[chave_categoria] = contagem
+            categorias[categoria] = categorias.get(categoria, 0) + valor
+
+    def total_mes(self, ano, mes):
+        """Total do mês em O(1)"""
+        return self.totais.get((ano, mes), 0)
+
+    def totais_categoria(self, ano, mes):
+        """Totais por categoria do mês (dict categoria -> total)"""
+        return dict(self.por_categoria.get((ano, mes), {}))
+
+    def total_categoria(self, ano, mes, categoria):
+        """Total de uma categoria no mês em O(1)"""
+        return self.por_categoria.get((ano, mes), {}).get(categoria, 0)
+
+@instrumentado()
+def construir_indices(dados):
+    """Cria os índices mensais de todas as coleções indexadas"""
+    return {
+        colecao: IndiceMensal.construir(dados.get(colecao, []), campo)
+        for colecao, campo in CAMPOS_CATEGORIA.items()
+    }
+
+def atualizar_indices(indices, dados, operacao, afetado):
+    """Propaga uma operação já aplicada (ver armazenamento.aplicar_operacao) aos índices"""
+    colecao = operacao.get('colecao')
+    if colecao not in indices:
+        return
+    indice = indices[colecao]
+    tipo = operacao['op']
+    if tipo == 'adicionar':
+        # Lido do livro: operações vindas do journal trazem datas ainda como texto
+        indice.adicionar(dados[colecao].registro_por_id(afetado['id']))
+    elif tipo == 'estender':
+        indice.estender(dados[colecao], [registro['id'] for registro in afetado])
+    elif tipo == 'remover':
+        indice.remover(afetado)
+    elif tipo == 'atualizar':
+        # `afetado` é a versão anterior do registro
+        indice.remover(afetado)
+        livro = dados[colecao]
+        indice.adicionar(livro.registro_por_id(operacao['id']) if 'id' in operacao
+                         else livro[operacao['indice']])
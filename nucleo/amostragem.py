@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redução de séries para gráficos
+Largest-Triangle-Three-Buckets (Steinarsson, 2013): mantém picos, vales e a forma da curva
+com um número fixo de pontos, seja qual for o tamanho da série
+"""
+
+import numpy as np
+
+def eixo_numerico(x):
+    """Eixo x como float64 (datas viram nanossegundos desde 1970)"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+def lttb(x, y, limite):
+    """Índices (crescentes) dos `limite` pontos escolhidos; séries menores voltam inteiras
+
+    O primeiro e o último ponto são sempre mantidos; o miolo é dividido em
+    `limite - 2` baldes e, em cada um, fica o ponto que forma o maior triângulo
+    com o ponto escolhido no balde anterior e a média do balde seguinte.
+    """
+    n = len(y)
+    if limite >= n or limite < 3:
+        return np.arange(n)
+    x = eixo_numerico(x)
+    y = np.asarray(y, dtype=np.float64)
+    bordas = np.linspace(1, n - 1, limite - 1).astype(np.int64)  # baldes [bordas[i], bordas[i + 1])
+    escolhidos = np.empty(limite, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(limite - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        proximo_inicio, proximo_fim = (bordas[i + 1], bordas[i + 2]) if i + 2 < len(bordas) else (n - 1, n)
+        media_x = x[proximo_inicio:proximo_fim].mean()
+        media_y = y[proximo_inicio:proximo_fim].mean()
+        ax, ay = x[anterior], y[anterior]
+        # Dobro da área do triângulo (anterior, candidato, média do próximo balde)
+        areas = np.abs((ax - media_x) * (y[inicio:fim] - ay) - (ax - x[inicio:fim]) * (media_y - ay))
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[i + 1] = anterior
+    return escolhidos
@@ -0,0 +1,764 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento dos dados do app
+Backends: snapshot JSON + journal de operações (padrão) ou SQLite em modo WAL
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+from .instrumentacao import instrumentado
+from .livro import CAMPO_ID, ESQUEMAS, Livro, criar_livro
+
+# Chave interna gravada no snapshot com o último seq do journal já incorporado
+CHAVE_SEQ = "_seq"
+# Próximo id de cada coleção: gravado para que o id do último registro removido nunca volte
+CHAVE_IDS = "_proximos_ids"
+
+# ========== DATAS ==========
+# Em memória as datas são `datetime` (meia-noite) ou colunas de dias nos livros,
+# convertidas uma única vez na carga; só voltam a ser texto 'YYYY-MM-DD' ao gravar.
+FORMATO_DATA = '%Y-%m-%d'
+
+def para_data(valor):
+    """Converte texto 'YYYY-MM-DD', date ou datetime em datetime (meia-noite)"""
+    if isinstance(valor, datetime):
+        return datetime(valor.year, valor.month, valor.day)
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day)
+    return datetime.fromisoformat(valor[:10])
+
+def serializar_valor(valor):
+    """`default` do json.dump: datas viram texto 'YYYY-MM-DD' e livros viram listas"""
+    if isinstance(valor, date):
+        return valor.strftime(FORMATO_DATA)
+    if isinstance(valor, Livro):
+        return valor.registros(datas_como_texto=True)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+def para_json(dados, **opcoes):
+    """Serializa os dados (ou uma operação) no formato JSON do app"""
+    return json.dumps(dados, ensure_ascii=False, default=serializar_valor, **opcoes)
+
+def preparar_dados(dados):
+    """Completa as chaves padrão, monta os livros colunares e converte as datas"""
+    mesclar_com_padrao(dados)
+    dados.pop(CHAVE_SEQ, None)
+    proximos_ids = dados.pop(CHAVE_IDS, None) or {}
+    for colecao in ESQUEMAS:
+        if not isinstance(dados[colecao], Livro):
+            dados[colecao] = criar_livro(colecao, dados[colecao])
+        livro = dados[colecao]
+        livro.proximo_id = max(livro.proximo_id, int(proximos_ids.get(colecao, 1)))
+    perfil = dados.get('perfil', {})
+    if isinstance(perfil.get('data_inicio'), str):
+        perfil['data_inicio'] = para_data(perfil['data_inicio'])
+    return dados
+
+def proximos_ids(dados):
+    """{coleção: próximo id}, gravado junto com os dados (CHAVE_IDS)"""
+    return {colecao: dados[colecao].proximo_id for colecao in ESQUEMAS if isinstance(dados.get(colecao), Livro)}
+
+def criar_dados_padrao():
+    """Retorna a estrutura vazia de dados do sistema"""
+    return {
+        "carteira": [],
+        "proventos": [],
+        "aportes": [],
+        "historico_patrimonio": [],
+        "entradas": [],  # Novo: salários, rendas extras
+        "saidas": [],    # Novo: despesas do dia a dia
+        "despesas_fixas": [],  # Novo: contas mensais fixas
+        "metas": {
+            "patrimonio_anual": 0,
+            "renda_passiva_mensal": 0,
+            "economia_mensal": 0
+        },
+        "cdi_anual": 0,
+        "regras_categoria": [],  # categorização automática de saídas (ver categorizacao.py)
+        "perfil": {
+            "nome": "",
+            "renda_mensal": 0,
+            "data_inicio": datetime.now().strftime('%Y-%m-%d'),
+            "itens_por_pagina": 20  # tamanho padrão das listas paginadas
+        }
+    }
+
+def mesclar_com_padrao(dados_carregados):
+    """Garante que todas as chaves padrão existam nos dados carregados"""
+    for chave, valor in criar_dados_padrao().items():
+        if chave not in dados_carregados:
+            dados_carregados[chave] = valor
+        elif isinstance(valor, dict):
+            # Para dicionários aninhados (como 'metas' e 'perfil')
+            for sub_chave, sub_valor in valor.items():
+                if sub_chave not in dados_carregados[chave]:
+                    dados_carregados[chave][sub_chave] = sub_valor
+    return dados_carregados
+
+# ========== GRAVAÇÃO ATÔMICA ==========
+def _sincronizar_diretorio(diretorio):
+    """fsync do diretório para tornar a troca de nomes durável (POSIX)"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(diretorio, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+# os.umask só se lê trocando-o; feito uma vez na importação, antes da thread de gravação adiada
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+def _modo_arquivo(arquivo):
+    """Permissões do arquivo existente; para um arquivo novo, o padrão do umask (mkstemp cria com 0600)"""
+    try:
+        return stat.S_IMODE(os.stat(arquivo).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+def gravar_atomico(arquivo, conteudo):
+    """Grava num temporário do mesmo diretório, fsync e os.replace: o arquivo nunca fica truncado"""
+    arquivo = Path(arquivo)
+    fd, temporario = tempfile.mkstemp(dir=arquivo.parent, prefix=f".{arquivo.name}.", suffix=".tmp")
+    try:
+        os.chmod(temporario, _modo_arquivo(arquivo))
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, arquivo)
+    except BaseException:
+        Path(temporario).unlink(missing_ok=True)
+        raise
+    _sincronizar_diretorio(arquivo.parent)
+
+@contextmanager
+def trava_arquivo(caminho):
+    """Trava exclusiva entre processos (flock) enquanto o bloco executa"""
+    if fcntl is None:
+        yield
+        return
+    with open(caminho, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _inode(caminho):
+    try:
+        return os.stat(caminho).st_ino
+    except FileNotFoundError:
+        return None
+
+# ========== OPERAÇÕES ==========
+# Toda mutação dos dados é descrita por uma operação (dict serializável):
+#   {"op": "adicionar", "colecao": "saidas", "registro": {...}}
+#   {"op": "estender",  "colecao": "saidas", "registros": [{...}, ...]}
+#   {"op": "remover",   "colecao": "saidas", "id": 42}
+#   {"op": "atualizar", "colecao": "carteira", "id": 7, "campos": {...}}
+#   {"op": "definir",   "caminho": ["metas", "patrimonio_anual"], "valor": 1000}
+# A mesma função aplica a operação ao vivo e no replay do journal. Registros são
+# referenciados pelo id estável; "indice" (posição) só aparece em journals antigos.
+# Em "adicionar" e "estender" os ids gerados são gravados nos registros antes
+# de irem para o journal.
+
+def aplicar_operacao(dados, operacao):
+    """Aplica uma operação sobre os dados em memória e retorna o registro afetado"""
+    tipo = operacao['op']
+    if tipo == 'adicionar':
+        return dados[operacao['colecao']].adicionar(operacao['registro'])
+    if tipo == 'estender':
+        return dados[operacao['colecao']].estender(operacao['registros'])
+    if tipo == 'remover':
+        livro = dados[operacao['colecao']]
+        if CAMPO_ID in operacao:
+            return livro.remover_id(operacao[CAMPO_ID])
+        return livro.remover(operacao['indice'])
+    if tipo == 'atualizar':
+        livro = dados[operacao['colecao']]
+        if CAMPO_ID in operacao:
+            return livro.atualizar_id(operacao[CAMPO_ID], operacao['campos'])
+        return livro.atualizar(operacao['indice'], operacao['campos'])
+    if tipo == 'definir':
+        *caminho, chave = operacao['caminho']
+        alvo = dados
+        for parte in caminho:
+            alvo = alvo.setdefault(parte, {})
+        anterior = alvo.get(chave)
+        alvo[chave] = operacao['valor']
+        return anterior
+    raise ValueError(f"Operação desconhecida: {tipo}")
+
+# ========== CONSULTAS EM MEMÓRIA ==========
+# Versões vetorizadas (sobre os livros) das consultas que o backend SQLite
+# resolve em SQL. `inicio` e `fim` são datetime; `fim` é exclusivo.
+
+def _filtrar_intervalo(df, inicio, fim):
+    mascara = df['data'].notna()
+    if inicio is not None:
+        mascara &= df['data'] >= inicio
+    if fim is not None:
+        mascara &= df['data'] < fim
+    return df[mascara]
+
+def listar_em_memoria(dados, colecao, inicio=None, fim=None):
+    """DataFrame da coleção no intervalo, do mais recente para o mais antigo"""
+    df = _filtrar_intervalo(dados[colecao].como_dataframe(), inicio, fim)
+    return df.sort_values(['data', CAMPO_ID], ascending=[False, True])
+
+def somar_por_categoria_em_memoria(dados, colecao, inicio=None, fim=None, campo='categoria'):
+    """Total de `valor` por categoria (ou outro campo) no intervalo, do maior para o menor
+
+    Registros sem a categoria ficam de fora; empates saem em ordem de categoria.
+    """
+    df = _filtrar_intervalo(dados[colecao].como_dataframe(['data', campo, 'valor']), inicio, fim)
+    totais = df.groupby(campo, observed=True)['valor'].sum().reset_index()
+    totais[campo] = totais[campo].astype(object)
+    totais = totais.sort_values(['valor', campo], ascending=[False, True], kind='stable')
+    return dict(zip(totais[campo], totais['valor']))
+
+def somar_por_mes_em_memoria(dados, colecao):
+    """Total de `valor` por mês ('YYYY-MM'), em ordem cronológica"""
+    df = dados[colecao].como_dataframe(['data', 'valor']).dropna(subset=['data'])
+    totais = df.groupby(df['data'].dt.to_period('M'))['valor'].sum()
+    return {str(mes): total for mes, total in totais.items()}
+
+# ========== BACKEND JSON + JOURNAL ==========
+class ArmazenamentoJournal:
+    """Snapshot JSON completo + journal de operações; cada gravação custa O(1)"""
+
+    def __init__(self, arquivo, limite_compactacao=1000):
+        self.arquivo = Path(arquivo)
+        self.arquivo_journal = self.arquivo.with_suffix('.journal')
+        self.arquivo_trava = self.arquivo.with_suffix('.lock')
+        self.limite_compactacao = limite_compactacao
+        self.seq = 0               # último seq gravado (snapshot ou journal)
+        self.operacoes_journal = 0  # operações no journal desde o último snapshot
+        # O que já foi lido do disco, para enxergar gravações de outros processos
+        self._inode_snapshot = None
+        self._inode_journal = None
+        self._offset_journal = 0
+
+    def travar(self):
+        """Trava entre processos para o ciclo sincronizar -> aplicar -> gravar"""
+        return trava_arquivo(self.arquivo_trava)
+
+    @instrumentado("armazenamento.carregar")
+    def carregar(self, somente_leitura=False):
+        """Reconstrói os dados: snapshot + replay da cauda do journal
+
+        Com `somente_leitura` (exportação, geração em lote) os arquivos nunca são
+        alterados: os ids que faltam são gerados só em memória.
+        """
+        self._inode_snapshot = self._inode_journal = None
+        self._offset_journal = 0
+        if self.arquivo.exists():
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                self._inode_snapshot = os.fstat(f.fileno()).st_ino
+                dados = json.load(f)
+        else:
+            dados = criar_dados_padrao()
+        seq_snapshot = dados.pop(CHAVE_SEQ, 0)
+        # Arquivos anteriores aos ids estáveis: os ids gerados na carga são gravados em seguida
+        migrar = any(CAMPO_ID not in registro
+                     for colecao in ESQUEMAS for registro in dados.get(colecao, []))
+        preparar_dados(dados)
+
+        self.seq = seq_snapshot
+        self.operacoes_journal = 0
+        if self.arquivo_journal.exists():
+            with open(self.arquivo_journal, 'rb') as f:
+                self._inode_journal = os.fstat(f.fileno()).st_ino
+                for operacao in self._ler_journal(f):
+                    # Operações já incorporadas ao snapshot são ignoradas
+                    if operacao['seq'] <= seq_snapshot:
+                        continue
+                    aplicar_operacao(dados, operacao)
+                    self.seq = operacao['seq']
+                    self.operacoes_journal += 1
+        preparar_dados(dados)
+        if migrar and not somente_leitura:
+            self.compactar(dados)
+        return dados
+
+    def _ler_journal(self, f):
+        """Operações das linhas completas a partir da posição atual de `f`; avança o offset lido"""
+        for linha in f:
+            if not linha.endswith(b'\n'):
+                break  # linha ainda em gravação ou truncada por uma queda
+            if linha.strip():
+                try:
+                    operacao = json.loads(linha)
+                except json.JSONDecodeError:
+                    break
+                self._offset_journal += len(linha)
+                yield operacao
+            else:
+                self._offset_journal += len(linha)
+
+    def mudou_no_disco(self):
+        """Verificação barata (só stat, sem trava) de que há algo para `sincronizar`"""
+        if _inode(self.arquivo) != self._inode_snapshot:
+            return True
+        try:
+            estado = os.stat(self.arquivo_journal)
+        except FileNotFoundError:
+            return bool(self._offset_journal)
+        return estado.st_ino != self._inode_journal or estado.st_size > self._offset_journal
+
+    def sincronizar(self, dados):
+        """Aplica em `dados` as operações que outros processos gravaram desde a última leitura
+
+        Lê só a cauda nova do journal. Devolve [(operação, afetado)], ou None quando
+        outro processo compactou os arquivos e é preciso recarregar tudo.
+        """
+        if _inode(self.arquivo) != self._inode_snapshot:
+            return None
+        try:
+            f = open(self.arquivo_journal, 'rb')
+        except FileNotFoundError:
+            return None if self._offset_journal else []
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self._inode_journal:
+                if self._offset_journal:
+                    return None
+                self._inode_journal = inode
+            f.seek(self._offset_journal)
+            aplicadas = []
+            for operacao in self._ler_journal(f):
+                if operacao['seq'] <= self.seq:
+                    continue
+                aplicadas.append((operacao, aplicar_operacao(dados, operacao)))
+                self.seq = operacao['seq']
+                self.operacoes_journal += 1
+            if any(operacao['op'] == 'definir' for operacao, _ in aplicadas):
+                preparar_dados(dados)  # valores vindos do JSON (ex.: perfil.data_inicio)
+            return aplicadas
+
+    def registrar(self, dados, operacao):
+        """Acrescenta a operação (já aplicada em `dados`) ao journal"""
+        self.registrar_lote(dados, [operacao])
+
+    def registrar_lote(self, dados, operacoes):
+        """Acrescenta várias operações já aplicadas com um único write + fsync"""
+        self.gravar_lote([self.preparar(dados, operacao) for operacao in operacoes])
+        if self.deve_compactar():
+            self.compactar(dados)
+
+    def preparar(self, dados, operacao):
+        """Numera e serializa a operação agora; a linha pode ser gravada depois"""
+        self.seq += 1
+        return para_json({"seq": self.seq, **operacao})
+
+    def gravar_lote(self, linhas):
+        """Acrescenta as linhas ao journal com um único write + fsync"""
+        with open(self.arquivo_journal, 'ab') as f:
+            f.write(''.join(linha + '\n' for linha in linhas).encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            self._inode_journal = os.fstat(f.fileno()).st_ino
+            self._offset_journal = f.tell()
+        self.operacoes_journal += len(linhas)
+
+    def deve_compactar(self, pendentes=0):
+        return self.operacoes_journal + pendentes >= self.limite_compactacao
+
+    @instrumentado("armazenamento.compactar")
+    def compactar(self, dados):
+        """Grava um snapshot completo (de forma atômica) e descarta o journal"""
+        gravar_atomico(self.arquivo, para_json(
+            {**dados, CHAVE_SEQ: self.seq, CHAVE_IDS: proximos_ids(dados)}, indent=2))
+        self._inode_snapshot = _inode(self.arquivo)
+        # O snapshot já tem o seq: se cair antes daqui, o replay pula as operações antigas
+        self.arquivo_journal.unlink(missing_ok=True)
+        self._inode_journal = None
+        self._offset_journal = 0
+        self.operacoes_journal = 0
+
+    def listar(self, dados, colecao, inicio=None, fim=None):
+        return listar_em_memoria(dados, colecao, inicio, fim)
+
+    def somar_por_categoria(self, dados, colecao, inicio=None, fim=None, campo='categoria'):
+        return somar_por_categoria_em_memoria(dados, colecao, inicio, fim, campo)
+
+    def somar_por_mes(self, dados, colecao):
+        return somar_por_mes_em_memoria(dados, colecao)
+
+# ========== BACKEND SQLITE ==========
+# Uma tabela por coleção; campos fora do esquema ficam na coluna `extras` (JSON).
+# O id do registro é o rowid da linha (tabelas antigas já têm rowid: nada a migrar).
+ESQUEMA_SQLITE = {
+    "carteira": ["codigo", "tipo", "cotas", "preco_medio", "cotacao_atual", "data_inclusao"],
+    "proventos": ["data", "ativo", "tipo", "valor"],
+    "aportes": ["data", "ativo", "cotas", "valor"],
+    "historico_patrimonio": ["data", "valor"],
+    "entradas": ["data", "categoria", "descricao", "valor", "recorrente"],
+    "saidas": ["data", "categoria", "descricao", "valor", "recorrente"],
+    "despesas_fixas": ["nome", "categoria", "valor", "dia_vencimento", "ativa"],
+}
+CAMPOS_BOOLEANOS = {"recorrente", "ativa"}
+COLUNAS_INDEXADAS = ("data", "categoria", "ativo")
+
+class ArmazenamentoSQLite:
+    """Backend SQLite (WAL) com tabelas indexadas por data, categoria e ativo"""
+
+    def __init__(self, arquivo, arquivo_json=None, somente_leitura=False):
+        self.arquivo = Path(arquivo)
+        self.arquivo_json = Path(arquivo_json) if arquivo_json else None
+        self.somente_leitura = somente_leitura
+        self._lock = threading.Lock()
+        self._versao_dados = None
+        if somente_leitura:
+            # Banco de outra pessoa (exportação, lote): sem criar tabelas, trocar o modo do journal ou importar
+            uri = f"{self.arquivo.resolve().as_uri()}?mode=ro"
+            self._conexao = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        self._conexao = sqlite3.connect(self.arquivo, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._criar_tabelas()
+
+    def travar(self):
+        """Trava entre processos para o ciclo sincronizar -> aplicar -> gravar"""
+        return trava_arquivo(self.arquivo.with_suffix('.lock'))
+
+    def _ler_versao_dados(self):
+        # data_version só muda com commits de outras conexões
+        return self._conexao.execute("PRAGMA data_version").fetchone()[0]
+
+    def mudou_no_disco(self):
+        with self._lock:
+            return self._ler_versao_dados() != self._versao_dados
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+    def sincronizar(self, dados):
+        """[] se ninguém mais gravou no banco desde a carga; None pede recarga completa"""
+        with self._lock:
+            return [] if self._ler_versao_dados() == self._versao_dados else None
+
+    def _criar_tabelas(self):
+        with self._lock, self._conexao:
+            for tabela, colunas in ESQUEMA_SQLITE.items():
+                definicao = ", ".join(colunas + ["extras TEXT"])
+                self._conexao.execute(f"CREATE TABLE IF NOT EXISTS {tabela} ({definicao})")
+                for coluna in COLUNAS_INDEXADAS:
+                    if coluna in colunas:
+                        self._conexao.execute(
+                            f"CREATE INDEX IF NOT EXISTS idx_{tabela}_{coluna} ON {tabela}({coluna})")
+            self._conexao.execute("CREATE TABLE IF NOT EXISTS config (chave TEXT PRIMARY KEY, valor TEXT)")
+
+    # ----- conversão registro <-> linha -----
+    @staticmethod
+    def _para_linha(colecao, registro):
+        colunas = ESQUEMA_SQLITE[colecao]
+        extras = {k: v for k, v in registro.items() if k not in colunas and k != CAMPO_ID}
+        linha = [registro.get(c) for c in colunas]
+        linha = [v.strftime(FORMATO_DATA) if isinstance(v, date) else v for v in linha]
+        return [registro[CAMPO_ID]] + linha + [para_json(extras) if extras else None]
+
+    @staticmethod
+    def _para_registro(colecao, linha):
+        colunas = ESQUEMA_SQLITE[colecao]
+        registro = {CAMPO_ID: linha[0]}
+        for coluna, valor in zip(colunas, linha[1:]):
+            if valor is None:
+                continue
+            registro[coluna] = bool(valor) if coluna in CAMPOS_BOOLEANOS else valor
+        if linha[-1]:
+            registro.update(json.loads(linha[-1]))
+        return registro
+
+    @staticmethod
+    def _sql_insercao(colecao):
+        colunas = ", ".join(["rowid"] + ESQUEMA_SQLITE[colecao] + ["extras"])
+        marcadores = ", ".join("?" * (len(ESQUEMA_SQLITE[colecao]) + 2))
+        return f"INSERT INTO {colecao} ({colunas}) VALUES ({marcadores})"
+
+    def _inserir(self, colecao, registros):
+        if isinstance(registros, Livro):
+            registros = registros.registros(datas_como_texto=True)
+        self._conexao.executemany(
+            self._sql_insercao(colecao), (self._para_linha(colecao, r) for r in registros))
+
+    # ----- interface comum de armazenamento -----
+    @instrumentado("armazenamento.carregar")
+    def carregar(self):
+        """Lê todas as tabelas; na primeira execução importa o JSON existente"""
+        # Um banco aberto só para leitura pode ser de uma versão sem alguma das tabelas
+        tabelas = {nome for (nome,) in self._conexao.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        vazio = all(
+            self._conexao.execute(f"SELECT 1 FROM {t} LIMIT 1").fetchone() is None
+            for t in list(ESQUEMA_SQLITE) + ["config"] if t in tabelas)
+        if vazio and self.arquivo_json and self.arquivo_json.exists():
+            if self.somente_leitura:
+                return ArmazenamentoJournal(self.arquivo_json).carregar(somente_leitura=True)
+            self.importar_json(self.arquivo_json)
+
+        dados = {}
+        with self._lock:
+            for colecao in ESQUEMA_SQLITE:
+                if colecao not in tabelas:
+                    continue
+                linhas = self._conexao.execute(f"SELECT rowid, * FROM {colecao} ORDER BY rowid").fetchall()
+                dados[colecao] = [self._para_registro(colecao, linha) for linha in linhas]
+            for chave, valor in self._conexao.execute("SELECT chave, valor FROM config") if 'config' in tabelas else ():
+                dados[chave] = json.loads(valor)
+            self._versao_dados = self._ler_versao_dados()
+        return preparar_dados(dados)
+
+    def registrar(self, dados, operacao):
+        """Reflete a operação (já aplicada em `dados`) nas tabelas"""
+        self.registrar_lote(dados, [operacao])
+
+    def registrar_lote(self, dados, operacoes):
+        """Reflete várias operações já aplicadas numa única transação"""
+        self.gravar_lote([self.preparar(dados, operacao) for operacao in operacoes])
+
+    def preparar(self, dados, operacao):
+        """Traduz a operação em (sql, parâmetros), ou numa lista deles, com os valores atuais; a execução pode vir depois"""
+        tipo = operacao['op']
+        colecao = operacao.get('colecao')
+        if tipo == 'adicionar':
+            return [(self._sql_insercao(colecao), self._para_linha(colecao, operacao['registro'])),
+                    self._sql_proximos_ids(dados)]
+        if tipo == 'estender':
+            # Lista de linhas: gravar_lote usa executemany
+            return [(self._sql_insercao(colecao), [self._para_linha(colecao, r) for r in operacao['registros']]),
+                    self._sql_proximos_ids(dados)]
+        if tipo == 'remover':
+            return f"DELETE FROM {colecao} WHERE rowid = ?", (operacao[CAMPO_ID],)
+        if tipo == 'atualizar' and not dados[colecao].tem_id(operacao[CAMPO_ID]):
+            return None  # removido depois, no mesmo lote: o DELETE seguinte basta
+        if tipo == 'atualizar':
+            colunas = ESQUEMA_SQLITE[colecao]
+            id_registro, *valores = self._para_linha(colecao, dados[colecao].registro_por_id(operacao[CAMPO_ID]))
+            atribuicoes = ", ".join(f"{c} = ?" for c in colunas + ["extras"])
+            return f"UPDATE {colecao} SET {atribuicoes} WHERE rowid = ?", valores + [id_registro]
+        if tipo == 'definir':
+            chave = operacao['caminho'][0]
+            return "INSERT OR REPLACE INTO config VALUES (?, ?)", (chave, para_json(dados[chave]))
+        raise ValueError(f"Operação desconhecida: {tipo}")
+
+    @staticmethod
+    def _sql_proximos_ids(dados):
+        return "INSERT OR REPLACE INTO config VALUES (?, ?)", (CHAVE_IDS, para_json(proximos_ids(dados)))
+
+    def gravar_lote(self, comandos):
+        """Executa os comandos preparados (um ou uma lista por operação) numa única transação"""
+        with self._lock, self._conexao:
+            for sql, parametros in (item for comando in filter(None, comandos)
+                                    for item in (comando if isinstance(comando, list) else [comando])):
+                if parametros and isinstance(parametros[0], list):
+                    self._conexao.executemany(sql, parametros)
+                else:
+                    self._conexao.execute(sql, parametros)
+
+    def deve_compactar(self, pendentes=0):
+        return False
+
+    @instrumentado("armazenamento.compactar")
+    def compactar(self, dados):
+        """Substitui todo o conteúdo do banco pelos dados informados"""
+        with self._lock, self._conexao:
+            for colecao in ESQUEMA_SQLITE:
+                self._conexao.execute(f"DELETE FROM {colecao}")
+                self._inserir(colecao, dados.get(colecao, []))
+            self._conexao.execute("DELETE FROM config")
+            self._conexao.executemany(
+                "INSERT INTO config VALUES (?, ?)",
+                [(chave, para_json(valor))
+                 for chave, valor in dados.items() if chave not in ESQUEMA_SQLITE]
+                + [(CHAVE_IDS, para_json(proximos_ids(dados)))])
+
+    def importar_json(self, arquivo):
+        """Importa um arquivo no formato JSON do app (substitui o conteúdo atual)"""
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        self.compactar(preparar_dados(dados))
+
+    # ----- consultas resolvidas no SQL -----
+    @staticmethod
+    def _filtro_data(inicio, fim):
+        # Registros sem data ficam de fora, como em _filtrar_intervalo
+        condicoes, parametros = ["data IS NOT NULL"], []
+        if inicio is not None:
+            condicoes.append("data >= ?")
+            parametros.append(inicio.strftime(FORMATO_DATA))
+        if fim is not None:
+            condicoes.append("data < ?")
+            parametros.append(fim.strftime(FORMATO_DATA))
+        return " WHERE " + " AND ".join(condicoes), parametros
+
+    def listar(self, dados, colecao, inicio=None, fim=None):
+        where, parametros = self._filtro_data(inicio, fim)
+        with self._lock:
+            linhas = self._conexao.execute(
+                f"SELECT rowid, * FROM {colecao}{where} ORDER BY data DESC, rowid", parametros).fetchall()
+        return criar_livro(colecao, [self._para_registro(colecao, linha) for linha in linhas]).como_dataframe()
+
+    def somar_por_categoria(self, dados, colecao, inicio=None, fim=None, campo='categoria'):
+        if campo not in ESQUEMA_SQLITE[colecao]:
+            raise ValueError(f"Campo inválido para {colecao}: {campo}")
+        where, parametros = self._filtro_data(inicio, fim)
+        # Mesmo resultado da versão em memória: sem a categoria nula, empates pela categoria
+        with self._lock:
+            linhas = self._conexao.execute(
+                f"SELECT {campo}, TOTAL(valor) AS total FROM {colecao}{where} AND {campo} IS NOT NULL "
+                f"GROUP BY {campo} ORDER BY total DESC, {campo}", parametros).fetchall()
+        return dict(linhas)
+
+    def somar_por_mes(self, dados, colecao):
+        with self._lock:
+            linhas = self._conexao.execute(
+                f"SELECT substr(data, 1, 7) AS mes, TOTAL(valor) FROM {colecao} "
+                f"WHERE data IS NOT NULL GROUP BY mes ORDER BY mes").fetchall()
+        return dict(linhas)
+
+# ========== GRAVAÇÃO ADIADA (WRITE-BEHIND) ==========
+class GravacaoAdiada:
+    """Envolve um backend: as operações vão para um buffer e uma thread grava em lote,
+    no máximo uma vez a cada `intervalo_ms` (rajadas de edições viram um único write)"""
+
+    def __init__(self, armazenamento, intervalo_ms=250):
+        self.armazenamento = armazenamento
+        self.intervalo = intervalo_ms / 1000
+        self._pendentes = []
+        self._condicao = threading.Condition()
+        self._gravando = threading.Lock()  # serializa lotes e compactações
+        self._encerrado = False
+        self._thread = threading.Thread(target=self._laco, name="gravacao-adiada", daemon=True)
+        self._thread.start()
+        atexit.register(self.fechar)
+
+    def _laco(self):
+        while True:
+            with self._condicao:
+                while not self._pendentes and not self._encerrado:
+                    self._condicao.wait()
+                if self._encerrado and not self._pendentes:
+                    return
+            # Espera a rajada terminar antes de gravar o lote acumulado
+            time.sleep(self.intervalo)
+            self.descarregar()
+
+    def registrar(self, dados, operacao):
+        """Prepara a operação já (estado atual) e agenda a gravação"""
+        self.registrar_lote(dados, [operacao])
+
+    def registrar_lote(self, dados, operacoes):
+        with self._condicao:
+            self._pendentes.extend(self.armazenamento.preparar(dados, operacao) for operacao in operacoes)
+            pendentes = len(self._pendentes)
+            self._condicao.notify()
+        if self.armazenamento.deve_compactar(pendentes):
+            self.compactar(dados)
+
+    def descarregar(self):
+        """Grava imediatamente o que estiver pendente"""
+        with self._gravando:
+            with self._condicao:
+                lote, self._pendentes = self._pendentes, []
+            if lote:
+                self.armazenamento.gravar_lote(lote)
+
+    def compactar(self, dados):
+        """Snapshot completo; as operações pendentes já estão contidas nele"""
+        with self._gravando:
+            with self._condicao:
+                self._pendentes = []
+            self.armazenamento.compactar(dados)
+
+    def carregar(self):
+        self.descarregar()
+        return self.armazenamento.carregar()
+
+    # Entre processos o lote adiado só fica visível após gravado: para vários
+    # processos no mesmo arquivo, prefira a gravação imediata
+    def travar(self):
+        return self.armazenamento.travar()
+
+    def mudou_no_disco(self):
+        return self.armazenamento.mudou_no_disco()
+
+    def sincronizar(self, dados):
+        self.descarregar()
+        return self.armazenamento.sincronizar(dados)
+
+    def fechar(self):
+        """Grava o restante e encerra a thread (chamado também na saída do processo)"""
+        with self._condicao:
+            self._encerrado = True
+            self._condicao.notify()
+        self._thread.join()
+        self.descarregar()
+
+    # Consultas podem ir ao disco (SQLite): o buffer é gravado antes
+    def listar(self, dados, colecao, inicio=None, fim=None):
+        self.descarregar()
+        return self.armazenamento.listar(dados, colecao, inicio, fim)
+
+    def somar_por_categoria(self, dados, colecao, inicio=None, fim=None, campo='categoria'):
+        self.descarregar()
+        return self.armazenamento.somar_por_categoria(dados, colecao, inicio, fim, campo)
+
+    def somar_por_mes(self, dados, colecao):
+        self.descarregar()
+        return self.armazenamento.somar_por_mes(dados, colecao)
+
+# ========== SELEÇÃO DO BACKEND ==========
+def criar_armazenamento(arquivo_json, backend=None, intervalo_gravacao_ms=None):
+    """Cria o backend escolhido (variável SISTEMA_FINANCEIRO_BACKEND: json ou sqlite)
+
+    Com SISTEMA_FINANCEIRO_GRAVACAO_MS > 0 (ou `intervalo_gravacao_ms`) as gravações
+    passam a ser adiadas e agrupadas por uma thread (ver GravacaoAdiada).
+    """
+    backend = (backend or os.environ.get("SISTEMA_FINANCEIRO_BACKEND", "json")).lower()
+    if intervalo_gravacao_ms is None:
+        intervalo_gravacao_ms = int(os.environ.get("SISTEMA_FINANCEIRO_GRAVACAO_MS", "0"))
+    arquivo_json = Path(arquivo_json)
+    if backend == "json":
+        armazenamento = ArmazenamentoJournal(arquivo_json)
+    elif backend == "sqlite":
+        armazenamento = ArmazenamentoSQLite(arquivo_json.with_suffix('.db'), arquivo_json=arquivo_json)
+    else:
+        raise ValueError(f"Backend de armazenamento desconhecido: {backend}")
+    if intervalo_gravacao_ms > 0:
+        return GravacaoAdiada(armazenamento, intervalo_gravacao_ms)
+    return armazenamento
+
+def carregar_arquivo(arquivo_dados):
+    """Dados a partir de um arquivo do app (JSON + journal, ou o .db do backend SQLite)
+
+    Só leitura: nenhum arquivo é criado ou reescrito (migração de ids, importação do
+    JSON no banco), então exportar não mexe nos dados de quem está usando o app.
+    """
+    arquivo_dados = Path(arquivo_dados)
+    if arquivo_dados.suffix == '.db':
+        armazenamento = ArmazenamentoSQLite(arquivo_dados, arquivo_dados.with_suffix('.json'), somente_leitura=True)
+        try:
+            return armazenamento.carregar()
+        finally:
+            armazenamento.fechar()
+    return ArmazenamentoJournal(arquivo_dados.with_suffix('.json')).carregar(somente_leitura=True)
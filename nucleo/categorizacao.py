@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Categorização automática de saídas
+Regras do usuário (texto, regex e faixa de valor) compiladas num único matcher
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+TIPOS_REGRA = ('texto', 'regex')
+CATEGORIAS_SAIDA = ["Alimentação", "Transporte", "Moradia", "Saúde", "Lazer",
+                    "Educação", "Vestuário", "Contas", "Outros"]
+
+# Regra: {"tipo": "texto" | "regex", "padrao": "uber", "categoria": "Transporte",
+#         "valor_min": None, "valor_max": 50.0}
+# As regras valem na ordem da lista: a primeira que casar (texto e faixa) decide.
+
+def _padrao_regex(posicao, regra):
+    tipo = regra.get('tipo', 'texto')
+    padrao = str(regra['padrao']).strip()
+    if tipo == 'texto':
+        return re.escape(padrao)
+    if tipo != 'regex':
+        raise ValueError(f"Regra {posicao}: tipo desconhecido ({tipo})")
+    try:
+        re.compile(padrao)
+    except re.error as erro:
+        raise ValueError(f"Regra {posicao}: regex inválida ({erro})")
+    return padrao
+
+def _isolada(padrao):
+    """Regex que não pode entrar no regex combinado sem mudar de sentido
+
+    Grupos de captura (e as referências a eles, \\1 ou (?P=nome)) seriam renumerados
+    dentro do regex combinado, e dois (?P<nome>...) iguais o tornariam inválido;
+    flags globais como (?i) só são aceitas no início de um regex.
+    """
+    compilado = re.compile(padrao)
+    return compilado.groups > 0 or bool(compilado.flags & ~re.UNICODE)
+
+def _limite(valor, padrao):
+    return padrao if valor is None or pd.isna(valor) else float(valor)
+
+class Classificador:
+    """Todas as regras num só regex de lookaheads opcionais, um grupo nomeado por regra
+
+    Uma busca por descrição distinta diz quais regras casam com ela (mesmo as
+    sobrepostas, como "uber" e "uber eats"); faixa de valor e prioridade são
+    resolvidas depois, em NumPy, sobre a matriz linhas x regras. Regexes com
+    grupos próprios ou flags globais (ver _isolada) são buscadas à parte.
+    """
+
+    def __init__(self, regras=()):
+        self.regras = [regra for regra in regras if regra.get('padrao') and regra.get('categoria')]
+        padroes = [_padrao_regex(i + 1, regra) for i, regra in enumerate(self.regras)]
+        self._combinadas = [i for i, padrao in enumerate(padroes) if not _isolada(padrao)]
+        self._grupos = [f"_regra{i}" for i in self._combinadas]
+        partes = [f"(?=.*?(?P<{grupo}>{padroes[i]}))?" for grupo, i in zip(self._grupos, self._combinadas)]
+        try:
+            self._matcher = re.compile(''.join(partes), re.IGNORECASE | re.DOTALL)
+        except re.error as erro:
+            raise ValueError(f"Regras incompatíveis entre si ({erro})")
+        self._isoladas = [(i, re.compile(padrao, re.IGNORECASE | re.DOTALL))
+                          for i, padrao in enumerate(padroes) if _isolada(padrao)]
+        self._minimos = np.array([_limite(r.get('valor_min'), -np.inf) for r in self.regras])
+        self._maximos = np.array([_limite(r.get('valor_max'), np.inf) for r in self.regras])
+        self._categorias = np.array([r['categoria'] for r in self.regras], dtype=object)
+
+    def __len__(self):
+        return len(self.regras)
+
+    def classificar(self, descricoes, valores, padrao=None):
+        """Array com a categoria de cada linha; `padrao` onde nenhuma regra casa"""
+        descricoes = pd.Series(descricoes, dtype=object).fillna('').astype(str)
+        resultado = np.full(len(descricoes), padrao, dtype=object)
+        if not self.regras or descricoes.empty:
+            return resultado
+        # Extratos repetem muito as descrições: o regex roda uma vez por texto distinto
+        codigos, unicas = pd.factorize(descricoes)
+        casou = np.zeros((len(unicas), len(self.regras)), dtype=bool)
+        if self._combinadas:
+            casou[:, self._combinadas] = pd.Series(unicas).str.extract(self._matcher)[self._grupos].notna().to_numpy()
+        for i, matcher in self._isoladas:
+            casou[:, i] = np.fromiter((matcher.search(texto) is not None for texto in unicas), dtype=bool, count=len(unicas))
+        valores = np.abs(np.asarray(valores, dtype=float))[:, None]
+        casou = casou[codigos] & (valores >= self._minimos) & (valores <= self._maximos)
+        primeira = casou.argmax(axis=1)
+        algum = casou[np.arange(len(casou)), primeira]
+        resultado[algum] = self._categorias[primeira[algum]]
+        return resultado
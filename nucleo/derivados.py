@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dados derivados memorizados
+Cálculos das páginas guardados pela revisão (Livro.versao) dos livros de entrada
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import wraps
+
+import pandas as pd
+
+from .instrumentacao import coleta_atual, instrumentado, span
+from .livro import Livro
+
+# ========== CACHE ==========
+class CacheDerivados:
+    """LRU limitado: uma entrada por (função, argumentos), válida enquanto a revisão não mudar"""
+
+    def __init__(self, limite=256):
+        self.limite = limite
+        self.acertos = 0
+        self.falhas = 0
+        self._itens = OrderedDict()  # chave -> (revisão, valor)
+        self._trava = threading.Lock()
+
+    def obter(self, chave, revisao, calcular):
+        """Devolve o valor memorizado ou calcula (fora da trava) e guarda"""
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None and item[0] == revisao:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return item[1]
+            self.falhas += 1
+        valor = calcular()
+        with self._trava:
+            # Revisão nova substitui a antiga na mesma chave
+            self._itens[chave] = (revisao, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.limite:
+                self._itens.popitem(last=False)
+        return valor
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
+
+cache = CacheDerivados()
+
+def memorizar(nome, argumentos, calcular):
+    """Memoriza `calcular()`; livros entre os argumentos entram pela linhagem e revisão
+
+    Um livro e suas cópias (instantâneos) têm a mesma linhagem e, enquanto não
+    forem alterados, a mesma revisão: compartilham os resultados.
+    """
+    chave, revisao = [nome], []
+    for argumento in argumentos:
+        if isinstance(argumento, Livro):
+            chave.append(('livro', argumento.linhagem))
+            revisao.append(argumento.versao)
+        else:
+            chave.append(argumento)
+    return cache.obter(tuple(chave), tuple(revisao), calcular)
+
+def derivado(funcao):
+    """Decorador: só recalcula quando um livro recebido como argumento sofre mutação"""
+    @wraps(funcao)
+    def envoltorio(*argumentos, **nomeados):
+        chave = argumentos + tuple(sorted(nomeados.items()))
+        if coleta_atual() is None:
+            return memorizar(funcao.__name__, chave, lambda: funcao(*argumentos, **nomeados))
+        # Com instrumentação ativa o span diz se a chamada saiu do cache ou recalculou
+        with span(funcao.__name__, cache='acerto') as registro:
+            def calcular():
+                registro.args['cache'] = 'falha'
+                return funcao(*argumentos, **nomeados)
+            return memorizar(funcao.__name__, chave, calcular)
+    envoltorio.sem_cache = funcao
+    return envoltorio
+
+# Os DataFrames devolvidos são compartilhados entre reruns: trate-os como somente leitura
+
+# ========== CARTEIRA ==========
+@derivado
+def calcular_patrimonio_atual(carteira):
+    """Calcula patrimônio total da carteira"""
+    return float((carteira.coluna('cotas') * carteira.coluna('cotacao_atual')).sum())
+
+@derivado
+def calcular_total_investido(carteira):
+    """Calcula total investido (cotas x preço médio)"""
+    return float((carteira.coluna('cotas') * carteira.coluna('preco_medio')).sum())
+
+@derivado
+def calcular_rentabilidade_total(carteira):
+    """Calcula rentabilidade total da carteira"""
+    investido = calcular_total_investido(carteira)
+    atual = calcular_patrimonio_atual(carteira)
+    if investido > 0:
+        return ((atual - investido) / investido) * 100
+    return 0
+
+@derivado
+def carteira_detalhada(carteira):
+    """Carteira com investido, atual, lucro e rent_% por ativo"""
+    df = carteira.como_dataframe()
+    df['investido'] = df['cotas'] * df['preco_medio']
+    df['atual'] = df['cotas'] * df['cotacao_atual']
+    df['lucro'] = df['atual'] - df['investido']
+    df['rent_%'] = (df['lucro'] / df['investido'] * 100).round(2)
+    return df.sort_values('id')  # ordem de inclusão
+
+# ========== MOVIMENTAÇÕES ==========
+@derivado
+def ordenado_por_id(livro):
+    """DataFrame do livro na ordem de inclusão (as posições mudam com as remoções)"""
+    return livro.como_dataframe().sort_values('id')
+
+@derivado
+def ordenado_por_data(livro, decrescente=False):
+    """DataFrame do livro ordenado por data (empates na ordem de inclusão)"""
+    return livro.como_dataframe().sort_values(['data', 'id'], ascending=[not decrescente, True])
+
+@derivado
+def gastos_ultimos_dias(saidas, hoje, dias=30):
+    """(saídas dos últimos `dias` dias, totais por categoria em ordem decrescente)"""
+    df = saidas.como_dataframe()
+    limite = pd.Timestamp(hoje) - pd.Timedelta(days=dias - 1)
+    recentes = df[df['data'] >= limite]
+    gastos_cat = recentes.groupby('categoria', observed=True)['valor'].sum().sort_values(ascending=False)
+    return recentes, gastos_cat
+
+# ========== MÉTRICAS DO MÊS (ÍNDICES MENSAIS) ==========
+def intervalo_do_filtro(filtro):
+    """Converte o filtro de mês da tela em (inicio, fim)"""
+    hoje = datetime.now()
+    inicio_mes = datetime(hoje.year, hoje.month, 1)
+    if filtro == "Este mês":
+        inicio = inicio_mes
+        fim = (inicio_mes + timedelta(days=32)).replace(day=1)
+    elif filtro == "Mês passado":
+        inicio = (inicio_mes - timedelta(days=1)).replace(day=1)
+        fim = inicio_mes
+    else:
+        return None, None
+    return inicio, fim
+
+def _total_mes_atual(indice):
+    hoje = datetime.now()
+    return indice.total_mes(hoje.year, hoje.month)
+
+@instrumentado()
+def calcular_proventos_mes_atual(indice_proventos):
+    """Calcula total de proventos do mês atual (consulta O(1) no índice mensal)"""
+    return _total_mes_atual(indice_proventos)
+
+@instrumentado()
+def calcular_entradas_mes(indice_entradas):
+    """Calcula total de entradas do mês atual"""
+    return _total_mes_atual(indice_entradas)
+
+@instrumentado()
+def calcular_saidas_mes(indice_saidas):
+    """Calcula total de saídas do mês atual"""
+    return _total_mes_atual(indice_saidas)
+
+@instrumentado()
+def calcular_aportes_mes(indice_aportes):
+    """Calcula total aportado no mês atual"""
+    return _total_mes_atual(indice_aportes)
+
+@instrumentado()
+def calcular_saldo_mes(indice_entradas, indice_saidas):
+    """Calcula saldo do mês (entradas - saídas)"""
+    return calcular_entradas_mes(indice_entradas) - calcular_saidas_mes(indice_saidas)
+
+@instrumentado()
+def calcular_taxa_poupanca(indice_entradas, indice_aportes):
+    """Calcula taxa de poupança do mês"""
+    entrada_total = calcular_entradas_mes(indice_entradas)
+    if entrada_total == 0:
+        return 0
+    aportes_mes = calcular_aportes_mes(indice_aportes)
+    return (aportes_mes / entrada_total) * 100
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Importação de extratos bancários (CSV e OFX)
+Leitura em blocos, deduplicação por hash e gravação num único lote de operações
+"""
+
+import csv
+import io
+import os
+import re
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+TAMANHO_BLOCO = 50_000
+CAMPOS_EXTRATO = ('data', 'descricao', 'valor', 'categoria')
+CATEGORIA_PADRAO = 'Outros'
+# Destino das linhas: pelo sinal do valor ou tudo numa coleção (valores em módulo)
+DESTINOS = ('sinal', 'entradas', 'saidas')
+
+# ========== LEITURA EM BLOCOS ==========
+# Os leitores geram DataFrames de texto com as colunas de CAMPOS_EXTRATO
+# presentes no arquivo; a conversão de tipos fica em normalizar_bloco.
+
+@contextmanager
+def _abrir_texto(arquivo):
+    """Caminho ou arquivo binário (upload) -> texto, em UTF-8 ou, se não decodificar, Latin-1
+
+    Um caminho é aberto e fechado aqui; um upload continua aberto para o chamador.
+    """
+    if isinstance(arquivo, (str, os.PathLike)):
+        with open(arquivo, 'rb') as binario:
+            with _abrir_texto(binario) as texto:
+                yield texto
+        return
+    arquivo.seek(0)
+    inicio = arquivo.read(1 << 16)
+    arquivo.seek(0)
+    try:
+        inicio.decode('utf-8')
+        codificacao = 'utf-8-sig'
+    except UnicodeDecodeError as erro:
+        # Erro só nos últimos bytes: caractere cortado pela amostra
+        codificacao = 'utf-8-sig' if erro.start >= len(inicio) - 3 else 'latin-1'
+    texto = io.TextIOWrapper(arquivo, encoding=codificacao, newline='')
+    try:
+        yield texto
+    finally:
+        texto.detach()
+
+def ler_cabecalho_csv(arquivo):
+    """(colunas, separador) do CSV, para montar o mapeamento de colunas"""
+    with _abrir_texto(arquivo) as texto:
+        primeira = texto.readline()
+    try:
+        separador = csv.Sniffer().sniff(primeira, delimiters=';,\t|').delimiter
+    except csv.Error:
+        separador = ','
+    colunas = next(csv.reader([primeira], delimiter=separador), [])
+    return [coluna.strip() for coluna in colunas], separador
+
+def ler_csv(arquivo, mapeamento, tamanho_bloco=TAMANHO_BLOCO):
+    """Blocos de até `tamanho_bloco` linhas; `mapeamento` é campo -> coluna do arquivo
+
+    'data' e 'valor' são obrigatórios; 'descricao' e 'categoria', opcionais.
+    """
+    colunas, separador = ler_cabecalho_csv(arquivo)
+    renomear = {coluna: campo for campo, coluna in mapeamento.items() if coluna}
+    faltando = [coluna for coluna in renomear if coluna not in colunas]
+    if faltando or not {'data', 'valor'} <= set(renomear.values()):
+        raise ValueError(f"Mapeamento inválido: colunas {faltando or ['data/valor']} ausentes")
+    with _abrir_texto(arquivo) as texto:
+        leitor = pd.read_csv(
+            texto, sep=separador, usecols=lambda c: c.strip() in renomear, dtype=str,
+            keep_default_na=False, chunksize=tamanho_bloco, skipinitialspace=True)
+        for bloco in leitor:
+            yield bloco.rename(columns=lambda c: renomear[c.strip()])
+
+_TRANSACAO_OFX = re.compile(r'<STMTTRN>(.*?)</STMTTRN>', re.S | re.I)
+_CAMPO_OFX = re.compile(r'<(\w+)>([^<\r\n]*)')
+
+def ler_ofx(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    """Blocos das transações (<STMTTRN>) de um OFX, lido aos pedaços de 1 MB"""
+    with _abrir_texto(arquivo) as texto:
+        linhas, resto = [], ''
+        while True:
+            pedaco = texto.read(1 << 20)
+            resto += pedaco
+            fim = 0
+            for transacao in _TRANSACAO_OFX.finditer(resto):
+                campos = {nome.upper(): valor.strip() for nome, valor in _CAMPO_OFX.findall(transacao.group(1))}
+                linhas.append((campos.get('DTPOSTED', '')[:8], campos.get('MEMO') or campos.get('NAME', ''),
+                               campos.get('TRNAMT', '')))
+                fim = transacao.end()
+            resto = resto[fim:]  # transação incompleta continua no próximo pedaço
+            while len(linhas) >= tamanho_bloco or (linhas and not pedaco):
+                bloco, linhas = linhas[:tamanho_bloco], linhas[tamanho_bloco:]
+                yield pd.DataFrame(bloco, columns=['data', 'descricao', 'valor'])
+            if not pedaco:
+                break
+
+def ler_extrato(arquivo, nome, mapeamento=None, tamanho_bloco=TAMANHO_BLOCO):
+    """Escolhe o leitor pela extensão do arquivo (.ofx/.qfx ou CSV)"""
+    if nome.lower().endswith(('.ofx', '.qfx')):
+        return ler_ofx(arquivo, tamanho_bloco)
+    return ler_csv(arquivo, mapeamento, tamanho_bloco)
+
+# ========== NORMALIZAÇÃO ==========
+_FORMATOS_DATA = ('%d/%m/%Y', '%d/%m/%y', '%d-%m-%Y', '%Y%m%d', 'ISO8601')
+
+def _datas(serie):
+    """Texto -> datetime64 tentando os formatos comuns de extrato (vetorizado)"""
+    serie = serie.str.strip()
+    datas = pd.Series(pd.NaT, index=serie.index, dtype='datetime64[ns]')
+    for formato in _FORMATOS_DATA:
+        faltando = datas.isna()
+        if not faltando.any():
+            break
+        datas[faltando] = pd.to_datetime(serie[faltando], format=formato, errors='coerce')
+    return datas.dt.normalize()
+
+def _valor(texto):
+    """'R$ -1.234,56', '1,234.56', '(12,00)' -> float; o separador decimal é o último que aparece"""
+    texto = texto.replace('R$', '').replace(' ', '')
+    negativo = texto.startswith('(') and texto.endswith(')')
+    texto = texto.strip('()')
+    if texto.rfind(',') > texto.rfind('.'):
+        texto = texto.replace('.', '').replace(',', '.')
+    else:
+        texto = texto.replace(',', '')
+    try:
+        valor = float(texto)
+    except ValueError:
+        return np.nan
+    return -valor if negativo else valor
+
+def _valores(serie):
+    """Texto -> float numa só passada por valor (várias operações .str custam uma passada cada)"""
+    return pd.Series([_valor(texto) for texto in serie], index=serie.index, dtype=float)
+
+def normalizar_bloco(bloco):
+    """(DataFrame data/descricao/valor/categoria válido, nº de linhas descartadas)"""
+    df = pd.DataFrame({
+        'data': _datas(bloco['data']),
+        'descricao': bloco['descricao'].str.strip() if 'descricao' in bloco else '',
+        'valor': _valores(bloco['valor']),
+        'categoria': bloco['categoria'].str.strip() if 'categoria' in bloco else '',
+    })
+    validos = df['data'].notna() & df['valor'].notna() & (df['valor'] != 0)
+    return df[validos], int((~validos).sum())
+
+# ========== DEDUPLICAÇÃO ==========
+_MISTURA = np.uint64(0x9E3779B97F4A7C15)
+
+def hashes_conteudo(datas, valores, descricoes):
+    """Hash (uint64) de data + valor em centavos + descrição normalizada de cada linha"""
+    return pd.util.hash_pandas_object(pd.DataFrame({
+        'dia': np.asarray(datas, dtype='datetime64[D]').astype(np.int64),
+        'centavos': np.round(np.abs(np.asarray(valores, dtype=float)) * 100).astype(np.int64),
+        'texto': pd.Series(descricoes).fillna('').str.lower().str.replace(r'\s+', ' ', regex=True).to_numpy(),
+    }), index=False).to_numpy()
+
+class IndiceHashes:
+    """Chaves de deduplicação: hash do conteúdo combinado com o nº da ocorrência
+
+    Duas compras iguais no mesmo dia são legítimas: a k-ésima ocorrência de um
+    conteúdo no extrato só é duplicata se já existir uma k-ésima igual na coleção.
+    """
+
+    def __init__(self):
+        self._ocorrencias = {}  # hash do conteúdo -> quantas vezes já apareceu
+
+    def chaves(self, hashes):
+        """Chaves dos próximos registros, na ordem (os blocos podem vir em várias chamadas)"""
+        serie = pd.Series(hashes)
+        anteriores = serie.map(self._ocorrencias).fillna(0).to_numpy(dtype=np.uint64)
+        ocorrencia = serie.groupby(serie).cumcount().to_numpy(dtype=np.uint64) + anteriores
+        for valor, quantidade in serie.value_counts().items():
+            self._ocorrencias[valor] = self._ocorrencias.get(valor, 0) + quantidade
+        with np.errstate(over='ignore'):
+            return hashes + ocorrencia * _MISTURA
+
+def chaves_existentes(livro):
+    """Chaves de deduplicação dos registros já gravados na coleção"""
+    df = livro.como_dataframe(['data', 'descricao', 'valor'])
+    return IndiceHashes().chaves(hashes_conteudo(df['data'], df['valor'], df['descricao']))
+
+# ========== IMPORTAÇÃO ==========
+def preparar_importacao(blocos, dados, destino='sinal', categoria_padrao=CATEGORIA_PADRAO, classificador=None):
+    """Normaliza e deduplica os blocos; devolve (operações 'estender', resumo)
+
+    Saídas sem categoria no arquivo passam pelo `classificador` (categorizacao.py).
+    As operações vão juntas para Repositorio.executar_lote: um único write.
+    """
+    if destino not in DESTINOS:
+        raise ValueError(f"Destino inválido: {destino}")
+    colecoes = ('entradas', 'saidas') if destino == 'sinal' else (destino,)
+    existentes = {colecao: chaves_existentes(dados[colecao]) for colecao in colecoes}
+    vistos = {colecao: IndiceHashes() for colecao in colecoes}
+    novos = {colecao: [] for colecao in colecoes}
+    resumo = {'lidas': 0, 'invalidas': 0, 'duplicadas': 0}
+
+    for bloco in blocos:
+        resumo['lidas'] += len(bloco)
+        df, invalidas = normalizar_bloco(bloco)
+        resumo['invalidas'] += invalidas
+        for colecao in colecoes:
+            if destino == 'sinal':
+                parte = df[df['valor'] > 0] if colecao == 'entradas' else df[df['valor'] < 0]
+            else:
+                parte = df
+            if parte.empty:
+                continue
+            chaves = vistos[colecao].chaves(hashes_conteudo(parte['data'], parte['valor'], parte['descricao']))
+            inedito = ~np.isin(chaves, existentes[colecao])
+            resumo['duplicadas'] += int((~inedito).sum())
+            novos[colecao].append(parte[inedito])
+
+    operacoes = []
+    for colecao, partes in novos.items():
+        df = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+        resumo[colecao] = len(df)
+        if df.empty:
+            continue
+        if colecao == 'saidas' and classificador is not None:
+            sem_categoria = (df['categoria'] == '').to_numpy()
+            df.loc[sem_categoria, 'categoria'] = classificador.classificar(
+                df['descricao'][sem_categoria], df['valor'][sem_categoria], '')
+            resumo['categorizadas'] = int((df['categoria'][sem_categoria] != '').sum())
+        colunas = zip(
+            df['data'].to_numpy(dtype='datetime64[D]').astype(str).tolist(),
+            df['categoria'].where(df['categoria'] != '', categoria_padrao).tolist(),
+            df['descricao'].tolist(),
+            df['valor'].abs().round(2).tolist(),
+        )
+        registros = [
+            {'data': data, 'categoria': categoria, 'descricao': descricao, 'valor': valor, 'recorrente': False}
+            for data, categoria, descricao, valor in colunas
+        ]
+        operacoes.append({"op": "estender", "colecao": colecao, "registros": registros})
+    return operacoes, resumo
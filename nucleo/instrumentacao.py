@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentação dos caminhos críticos
+Spans nomeados coletados por execução (um rerun do app), histórico de percentis
+por span e exportação para Chrome trace (chrome://tracing, Perfetto) e speedscope
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+import numpy as np
+
+# Coleta ativa no contexto atual (cada thread do Streamlit tem o seu); sem coleta, span não custa nada
+_COLETA = ContextVar('coleta', default=None)
+
+class Span:
+    """Trecho cronometrado: início relativo à coleta e duração, em segundos"""
+    __slots__ = ('nome', 'inicio', 'duracao', 'args')
+
+    def __init__(self, nome, inicio, duracao=0.0, args=None):
+        self.nome = nome
+        self.inicio = inicio
+        self.duracao = duracao
+        self.args = args or {}
+
+    @property
+    def fim(self):
+        return self.inicio + self.duracao
+
+class Coleta:
+    """Spans de uma execução, na ordem em que foram abertos"""
+
+    def __init__(self, nome, **args):
+        self.nome = nome
+        self.args = args
+        self.relogio = time.perf_counter()  # origem dos tempos dos spans
+        self.epoca = time.time()
+        self.thread = threading.get_ident()
+        self.spans = []
+        self.duracao = None  # preenchida ao concluir
+
+    def agora(self):
+        return time.perf_counter() - self.relogio
+
+    def registrar(self, nome, inicio, duracao, **args):
+        """Span já medido por fora (ex.: etapas marcadas pelo cronômetro do app); `inicio` em perf_counter"""
+        span = Span(nome, inicio - self.relogio, duracao, args)
+        self.spans.append(span)
+        return span
+
+    def em_ordem(self):
+        """(span, nível) em ordem de início; o nível vem da contenção no tempo, não de quem abriu quem"""
+        fins = []
+        for registro in sorted(self.spans, key=lambda s: (s.inicio, -s.duracao)):
+            while fins and fins[-1] <= registro.inicio:
+                fins.pop()
+            yield registro, len(fins)
+            fins.append(registro.fim)
+
+    def totais(self):
+        """nome -> (chamadas, segundos somados) nesta execução"""
+        totais = {}
+        for span in self.spans:
+            chamadas, segundos = totais.get(span.nome, (0, 0.0))
+            totais[span.nome] = (chamadas + 1, segundos + span.duracao)
+        return totais
+
+@contextmanager
+def span(nome, **args):
+    """Cronometra o bloco na coleta ativa; entrega o Span (ou None sem coleta) para anotar args"""
+    coleta = _COLETA.get()
+    if coleta is None:
+        yield None
+        return
+    registro = Span(nome, coleta.agora(), args=args)
+    coleta.spans.append(registro)
+    try:
+        yield registro
+    finally:
+        registro.duracao = coleta.agora() - registro.inicio
+
+def instrumentado(nome=None):
+    """Decorador: cada chamada vira um span (`nome` ou o nome da função)"""
+    def decorar(funcao):
+        rotulo = nome or funcao.__name__
+
+        @wraps(funcao)
+        def envoltorio(*argumentos, **nomeados):
+            if _COLETA.get() is None:
+                return funcao(*argumentos, **nomeados)
+            with span(rotulo):
+                return funcao(*argumentos, **nomeados)
+        return envoltorio
+    return decorar
+
+def coleta_atual():
+    return _COLETA.get()
+
+def iniciar_coleta(nome, inicio=None, **args):
+    """Abre a coleta da execução no contexto atual; `inicio` (perf_counter) antecipa a origem"""
+    coleta = Coleta(nome, **args)
+    if inicio is not None:
+        coleta.epoca -= coleta.relogio - inicio
+        coleta.relogio = inicio
+    _COLETA.set(coleta)
+    return coleta
+
+def concluir_coleta(coleta, historico=None):
+    """Fecha a coleta, desativa-a no contexto e guarda no histórico (padrão: HISTORICO)"""
+    coleta.duracao = coleta.agora()
+    if _COLETA.get() is coleta:
+        _COLETA.set(None)
+    (historico or HISTORICO).adicionar(coleta)
+    return coleta
+
+# ========== HISTÓRICO ==========
+PERCENTIS = (50, 90, 99)
+
+class Historico:
+    """Últimas execuções e amostras de duração por span, limitadas, compartilhadas pelo processo"""
+
+    def __init__(self, limite_execucoes=100, limite_amostras=1000):
+        self.limite_amostras = limite_amostras
+        self.execucoes = deque(maxlen=limite_execucoes)
+        self._amostras = {}  # nome -> deque de durações (s)
+        self._trava = threading.Lock()
+
+    def adicionar(self, coleta):
+        with self._trava:
+            self.execucoes.append(coleta)
+            for span in coleta.spans:
+                amostras = self._amostras.get(span.nome)
+                if amostras is None:
+                    amostras = self._amostras[span.nome] = deque(maxlen=self.limite_amostras)
+                amostras.append(span.duracao)
+
+    def recentes(self, filtro=None):
+        """Execuções guardadas, da mais nova para a mais antiga"""
+        with self._trava:
+            execucoes = list(self.execucoes)
+        return [coleta for coleta in reversed(execucoes) if filtro is None or filtro(coleta)]
+
+    def percentis(self, percentis=PERCENTIS):
+        """Por span: chamadas, total e percentis das durações guardadas (ms), do maior total ao menor"""
+        with self._trava:
+            amostras = {nome: np.fromiter(valores, float) for nome, valores in self._amostras.items()}
+        linhas = []
+        for nome, valores in amostras.items():
+            ms = valores * 1000
+            linha = {'span': nome, 'chamadas': len(ms), 'total_ms': float(ms.sum())}
+            linha.update({f'p{p}_ms': float(v) for p, v in zip(percentis, np.percentile(ms, percentis))})
+            linha['max_ms'] = float(ms.max())
+            linhas.append(linha)
+        return sorted(linhas, key=lambda linha: linha['total_ms'], reverse=True)
+
+    def limpar(self):
+        with self._trava:
+            self.execucoes.clear()
+            self._amostras.clear()
+
+HISTORICO = Historico()
+
+# ========== EXPORTAÇÃO ==========
+def _rotulo(coleta):
+    detalhes = ' '.join(str(valor) for valor in coleta.args.values())
+    return f"{coleta.nome} {detalhes}".strip()
+
+def para_chrome_trace(coletas):
+    """Trace Event Format (eventos 'X' completos, em µs) para chrome://tracing, Perfetto ou speedscope"""
+    coletas = sorted(coletas, key=lambda coleta: coleta.epoca)
+    if not coletas:
+        return {'traceEvents': [], 'displayTimeUnit': 'ms'}
+    origem = coletas[0].epoca
+    pid = os.getpid()
+    eventos = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'Sistema Financeiro'}}]
+    for coleta in coletas:
+        base = (coleta.epoca - origem) * 1e6
+        duracao = coleta.duracao if coleta.duracao is not None else coleta.agora()
+        eventos.append({'name': _rotulo(coleta), 'cat': 'execucao', 'ph': 'X', 'ts': base, 'dur': duracao * 1e6,
+                        'pid': pid, 'tid': coleta.thread, 'args': coleta.args})
+        for registro in coleta.spans:
+            eventos.append({'name': registro.nome, 'cat': registro.nome.split('.', 1)[0], 'ph': 'X',
+                            'ts': base + registro.inicio * 1e6, 'dur': registro.duracao * 1e6,
+                            'pid': pid, 'tid': coleta.thread, 'args': registro.args})
+    return {'traceEvents': eventos, 'displayTimeUnit': 'ms'}
+
+def para_speedscope(coletas, nome='Sistema Financeiro'):
+    """Formato próprio do speedscope: um perfil 'evented' por execução (ms)"""
+    quadros, indices = [], {}
+
+    def quadro(nome_quadro):
+        if nome_quadro not in indices:
+            indices[nome_quadro] = len(quadros)
+            quadros.append({'name': nome_quadro})
+        return indices[nome_quadro]
+
+    perfis = []
+    for coleta in sorted(coletas, key=lambda coleta: coleta.epoca):
+        fim_execucao = coleta.duracao if coleta.duracao is not None else coleta.agora()
+        eventos, pilha = [], []  # pilha: (quadro, fim)
+
+        def fechar_ate(instante):
+            while pilha and pilha[-1][1] <= instante:
+                indice, fim = pilha.pop()
+                eventos.append({'type': 'C', 'frame': indice, 'at': fim * 1000})
+
+        for registro, _ in coleta.em_ordem():
+            fechar_ate(registro.inicio)
+            # O fim de um filho nunca passa o do pai (arredondamentos), senão o speedscope rejeita
+            fim = min(registro.fim, pilha[-1][1]) if pilha else min(registro.fim, fim_execucao)
+            inicio = max(registro.inicio, eventos[-1]['at'] / 1000) if eventos else registro.inicio
+            indice = quadro(registro.nome)
+            eventos.append({'type': 'O', 'frame': indice, 'at': inicio * 1000})
+            pilha.append((indice, max(fim, inicio)))
+        fechar_ate(float('inf'))
+        perfis.append({'type': 'evented', 'name': _rotulo(coleta), 'unit': 'milliseconds',
+                       'startValue': 0, 'endValue': fim_execucao * 1000, 'events': eventos})
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': nome,
+        'exporter': 'nucleo.instrumentacao',
+        'shared': {'frames': quadros},
+        'profiles': perfis,
+    }
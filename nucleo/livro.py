@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Livro-razão colunar
+Cada coleção (entradas, saidas, proventos...) guardada como arrays NumPy tipados
+"""
+
+from datetime import date, datetime
+from itertools import count
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacao import instrumentado
+
+# ========== TIPOS DE COLUNA ==========
+DATA = "data"            # int32: dias desde 1970-01-01
+VALOR = "valor"          # float64
+CATEGORIA = "categoria"  # int32: código na lista de categorias da coluna
+TEXTO = "texto"          # object (str)
+BOOLEANO = "booleano"    # int8: 1/0
+INTEIRO = "inteiro"      # int64
+
+NULO_DATA = np.iinfo(np.int32).min
+NULO_INTEIRO = np.iinfo(np.int64).min
+
+DTYPES = {
+    DATA: np.int32,
+    VALOR: np.float64,
+    CATEGORIA: np.int32,
+    TEXTO: object,
+    BOOLEANO: np.int8,
+    INTEIRO: np.int64,
+}
+NULOS = {
+    DATA: NULO_DATA,
+    VALOR: np.nan,
+    CATEGORIA: -1,
+    TEXTO: None,
+    BOOLEANO: -1,
+    INTEIRO: NULO_INTEIRO,
+}
+
+ESQUEMAS = {
+    "carteira": {"codigo": TEXTO, "tipo": CATEGORIA, "cotas": VALOR, "preco_medio": VALOR,
+                 "cotacao_atual": VALOR, "data_inclusao": DATA},
+    "proventos": {"data": DATA, "ativo": CATEGORIA, "tipo": CATEGORIA, "valor": VALOR},
+    "aportes": {"data": DATA, "ativo": CATEGORIA, "cotas": VALOR, "valor": VALOR},
+    "historico_patrimonio": {"data": DATA, "valor": VALOR},
+    "entradas": {"data": DATA, "categoria": CATEGORIA, "descricao": TEXTO, "valor": VALOR,
+                 "recorrente": BOOLEANO},
+    "saidas": {"data": DATA, "categoria": CATEGORIA, "descricao": TEXTO, "valor": VALOR,
+               "recorrente": BOOLEANO},
+    "despesas_fixas": {"nome": TEXTO, "categoria": CATEGORIA, "valor": VALOR,
+                       "dia_vencimento": INTEIRO, "ativa": BOOLEANO},
+}
+
+_EPOCA = date(1970, 1, 1).toordinal()
+
+# Revisões globais: cada mutação de qualquer livro recebe um número novo e crescente
+_REVISOES = count(1)
+# Linhagem: identifica um livro e todas as suas cópias
+_LINHAGENS = count(1)
+
+def _dias(valor):
+    """Data (texto 'YYYY-MM-DD', date ou datetime) -> dias desde 1970-01-01"""
+    if isinstance(valor, str):
+        valor = date.fromisoformat(valor[:10])
+    return valor.toordinal() - _EPOCA
+
+def _dias_vetor(valores):
+    """Versão vetorizada de _dias; None vira NULO_DATA"""
+    try:
+        dias = np.array(valores, dtype='datetime64[D]').astype(np.int64)
+    except (ValueError, TypeError):
+        dias = np.array([NULO_DATA if v is None else _dias(v) for v in valores], dtype=np.int64)
+    dias[dias == np.iinfo(np.int64).min] = NULO_DATA
+    return dias.astype(np.int32)
+
+def dias_para_datetime64(dias):
+    """Array de dias (int32) -> datetime64[ns], com NaT nos nulos"""
+    datas = dias.astype('datetime64[D]').astype('datetime64[ns]')
+    datas[dias == NULO_DATA] = np.datetime64('NaT')
+    return datas
+
+CAMPO_ID = "id"
+
+class Livro:
+    """Coleção de registros em colunas tipadas, com views DataFrame sem cópia"""
+
+    def __init__(self, esquema, registros=()):
+        # Todo registro tem um id estável, único na coleção (também é a chave no SQLite)
+        self.esquema = {CAMPO_ID: INTEIRO, **esquema}
+        self.versao = next(_REVISOES)  # muda a cada mutação (chave dos caches derivados)
+        self.linhagem = next(_LINHAGENS)
+        self._tamanho = 0
+        self._capacidade = 0
+        self._colunas = {nome: np.empty(0, dtype=DTYPES[tipo]) for nome, tipo in self.esquema.items()}
+        self._posicoes = {}    # id -> posição atual no livro
+        self.proximo_id = 1
+        self._categorias = {}  # coluna -> lista de categorias (índice = código)
+        self._codigos = {}     # coluna -> {categoria: código}
+        for nome, tipo in self.esquema.items():
+            if tipo == CATEGORIA:
+                self._categorias[nome] = []
+                self._codigos[nome] = {}
+        self.estender(registros)
+
+    # ----- estrutura interna -----
+    def _garantir_capacidade(self, necessario):
+        if necessario <= self._capacidade:
+            return
+        capacidade = max(necessario, self._capacidade * 2, 16)
+        for nome, array in self._colunas.items():
+            novo = np.full(capacidade, NULOS[self.esquema[nome]], dtype=array.dtype)
+            novo[:self._tamanho] = array[:self._tamanho]
+            self._colunas[nome] = novo
+        self._capacidade = capacidade
+
+    def _garantir_colunas(self, nomes):
+        """Campos fora do esquema viram colunas de texto (nada é descartado)"""
+        for nome in nomes:
+            if nome not in self.esquema:
+                self.esquema[nome] = TEXTO
+                self._colunas[nome] = np.full(self._capacidade, None, dtype=object)
+
+    def _codigo(self, nome, valor):
+        if valor is None:
+            return -1
+        codigos = self._codigos[nome]
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = codigos[valor] = len(self._categorias[nome])
+            self._categorias[nome].append(valor)
+        return codigo
+
+    def _converter(self, nome, valor):
+        tipo = self.esquema[nome]
+        if valor is None:
+            return NULOS[tipo]
+        if tipo == DATA:
+            return _dias(valor)
+        if tipo == CATEGORIA:
+            return self._codigo(nome, valor)
+        if tipo == BOOLEANO:
+            return int(bool(valor))
+        return valor
+
+    def _converter_vetor(self, nome, valores):
+        tipo = self.esquema[nome]
+        if tipo == DATA:
+            return _dias_vetor(valores)
+        if tipo == CATEGORIA:
+            return [self._codigo(nome, v) for v in valores]
+        if tipo == BOOLEANO:
+            return [-1 if v is None else int(bool(v)) for v in valores]
+        if tipo in (VALOR, INTEIRO):
+            return [NULOS[tipo] if v is None else v for v in valores]
+        return valores
+
+    def _valor_python(self, nome, valor):
+        """Valor da coluna -> tipo Python do registro (None quando nulo)"""
+        tipo = self.esquema[nome]
+        if tipo == DATA:
+            return None if valor == NULO_DATA else datetime.fromordinal(int(valor) + _EPOCA)
+        if tipo == CATEGORIA:
+            return None if valor < 0 else self._categorias[nome][valor]
+        if tipo == BOOLEANO:
+            return None if valor < 0 else bool(valor)
+        if tipo == INTEIRO:
+            return None if valor == NULO_INTEIRO else int(valor)
+        if tipo == VALOR:
+            return None if np.isnan(valor) else float(valor)
+        return valor
+
+    def _reservar_id(self, id_registro):
+        """Valida um id informado ou gera o próximo; mantém proximo_id acima de todos"""
+        if id_registro is None:
+            id_registro = self.proximo_id
+        elif id_registro in self._posicoes:
+            raise ValueError(f"id duplicado: {id_registro}")
+        self.proximo_id = max(self.proximo_id, id_registro + 1)
+        return id_registro
+
+    def _posicao(self, posicao):
+        if posicao < 0:
+            posicao += self._tamanho
+        if not 0 <= posicao < self._tamanho:
+            raise IndexError("posição fora do livro")
+        return posicao
+
+    # ----- mutações -----
+    def adicionar(self, registro):
+        """Acrescenta um registro (O(1) amortizado); o id gerado é gravado no próprio dict"""
+        registro[CAMPO_ID] = self._reservar_id(registro.get(CAMPO_ID))
+        self._garantir_colunas(registro)
+        self._garantir_capacidade(self._tamanho + 1)
+        for nome, array in self._colunas.items():
+            array[self._tamanho] = self._converter(nome, registro.get(nome))
+        self._posicoes[registro[CAMPO_ID]] = self._tamanho
+        self._tamanho += 1
+        self.versao = next(_REVISOES)
+        return registro
+
+    def estender(self, registros):
+        """Acrescenta vários registros convertendo coluna a coluna; os ids vão para os dicts"""
+        registros = list(registros)
+        if not registros:
+            return registros
+        self._garantir_colunas({nome for registro in registros for nome in registro})
+        self._garantir_capacidade(self._tamanho + len(registros))
+        fim = self._tamanho + len(registros)
+        # Registros sem id (arquivos antigos) recebem um na carga: é a migração
+        ids = [registro.get(CAMPO_ID) for registro in registros]
+        ids = [self._reservar_id(i) if i is not None else None for i in ids]
+        ids = [i if i is not None else self._reservar_id(None) for i in ids]
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids duplicados")
+        for nome, array in self._colunas.items():
+            if nome == CAMPO_ID:
+                array[self._tamanho:fim] = ids
+                continue
+            valores = [registro.get(nome) for registro in registros]
+            array[self._tamanho:fim] = self._converter_vetor(nome, valores)
+        self._posicoes.update(zip(ids, range(self._tamanho, fim)))
+        self._tamanho = fim
+        self.versao = next(_REVISOES)
+        for registro, id_registro in zip(registros, ids):
+            registro[CAMPO_ID] = id_registro
+        return registros
+
+    def remover(self, posicao):
+        """Remove o registro na posição deslocando os seguintes (O(n), preserva a ordem)
+
+        Mantido para o replay de journals antigos, com operações por posição.
+        """
+        posicao = self._posicao(posicao)
+        removido = self.registro(posicao)
+        ultimo = self._tamanho - 1
+        for nome, array in self._colunas.items():
+            array[posicao:ultimo] = array[posicao + 1:self._tamanho]
+            array[ultimo] = NULOS[self.esquema[nome]]
+        self._tamanho = ultimo
+        del self._posicoes[removido[CAMPO_ID]]
+        for nova_posicao, id_registro in enumerate(self.coluna(CAMPO_ID)[posicao:].tolist(), posicao):
+            self._posicoes[id_registro] = nova_posicao
+        self.versao = next(_REVISOES)
+        return removido
+
+    def remover_id(self, id_registro):
+        """Remove o registro pelo id em O(1): o último registro ocupa a posição liberada"""
+        posicao = self.posicao(id_registro)
+        removido = self.registro(posicao)
+        ultimo = self._tamanho - 1
+        for nome, array in self._colunas.items():
+            array[posicao] = array[ultimo]
+            array[ultimo] = NULOS[self.esquema[nome]]
+        del self._posicoes[id_registro]
+        if posicao != ultimo:
+            self._posicoes[int(self._colunas[CAMPO_ID][posicao])] = posicao
+        self._tamanho = ultimo
+        self.versao = next(_REVISOES)
+        return removido
+
+    def atualizar_id(self, id_registro, campos):
+        """Altera campos do registro com o id informado (O(1))"""
+        return self.atualizar(self.posicao(id_registro), campos)
+
+    def atualizar(self, posicao, campos):
+        """Altera campos de um registro e devolve a versão anterior"""
+        posicao = self._posicao(posicao)
+        if CAMPO_ID in campos:
+            raise ValueError("o id de um registro não pode ser alterado")
+        anterior = self.registro(posicao)
+        self._garantir_colunas(campos)
+        for nome, valor in campos.items():
+            self._colunas[nome][posicao] = self._converter(nome, valor)
+        self.versao = next(_REVISOES)
+        return anterior
+
+    def copia(self):
+        """Cópia independente com a mesma revisão (instantâneos para leitura concorrente)"""
+        novo = Livro.__new__(Livro)
+        novo.esquema = dict(self.esquema)
+        novo.versao = self.versao
+        novo.linhagem = self.linhagem
+        novo._tamanho = novo._capacidade = self._tamanho
+        novo._colunas = {nome: self.coluna(nome).copy() for nome in self._colunas}
+        novo._posicoes = dict(self._posicoes)
+        novo.proximo_id = self.proximo_id
+        novo._categorias = {nome: list(categorias) for nome, categorias in self._categorias.items()}
+        novo._codigos = {nome: dict(codigos) for nome, codigos in self._codigos.items()}
+        return novo
+
+    # ----- leitura -----
+    def __len__(self):
+        return self._tamanho
+
+    def __iter__(self):
+        return iter(self.registros())
+
+    def __getitem__(self, chave):
+        if isinstance(chave, slice):
+            return [self.registro(i) for i in range(*chave.indices(self._tamanho))]
+        return self.registro(self._posicao(chave))
+
+    def posicao(self, id_registro):
+        """Posição atual do registro com o id informado"""
+        try:
+            return self._posicoes[id_registro]
+        except KeyError:
+            raise KeyError(f"registro com id {id_registro} não encontrado") from None
+
+    def tem_id(self, id_registro):
+        return id_registro in self._posicoes
+
+    def registro_por_id(self, id_registro):
+        """Registro (dict) com o id informado"""
+        return self.registro(self.posicao(id_registro))
+
+    def registro(self, posicao):
+        """Materializa um registro como dict (campos nulos são omitidos)"""
+        registro = {}
+        for nome, array in self._colunas.items():
+            valor = self._valor_python(nome, array[posicao])
+            if valor is not None:
+                registro[nome] = valor
+        return registro
+
+    def registros(self, datas_como_texto=False):
+        """Todos os registros como lista de dicts (para serialização)"""
+        colunas = {}
+        for nome, tipo in self.esquema.items():
+            array = self.coluna(nome)
+            if tipo == DATA:
+                datas = dias_para_datetime64(array)
+                valores = (np.datetime_as_string(datas, unit='D') if datas_como_texto
+                           else datas.astype('datetime64[us]').astype(object)).tolist()
+                colunas[nome] = [None if d == NULO_DATA else v for d, v in zip(array.tolist(), valores)]
+            elif tipo == CATEGORIA:
+                categorias = self._categorias[nome]
+                colunas[nome] = [None if c < 0 else categorias[c] for c in array.tolist()]
+            elif tipo == BOOLEANO:
+                colunas[nome] = [None if b < 0 else bool(b) for b in array.tolist()]
+            elif tipo == INTEIRO:
+                colunas[nome] = [None if i == NULO_INTEIRO else i for i in array.tolist()]
+            elif tipo == VALOR:
+                colunas[nome] = [None if v != v else v for v in array.tolist()]
+            else:
+                colunas[nome] = array.tolist()
+        nomes = list(colunas)
+        return [
+            {nome: valor for nome, valor in zip(nomes, linha) if valor is not None}
+            for linha in zip(*colunas.values())
+        ]
+
+    def coluna(self, nome):
+        """View (sem cópia) da coluna bruta: dias, códigos, floats..."""
+        return self._colunas[nome][:self._tamanho]
+
+    def somar(self, nome='valor'):
+        """Soma vetorizada de uma coluna numérica (ignora nulos)"""
+        return float(np.nansum(self.coluna(nome)))
+
+    def categorias(self, nome):
+        """Lista de categorias da coluna (índice = código)"""
+        return list(self._categorias[nome])
+
+    def datas(self, nome='data'):
+        """Coluna de data como datetime64[ns]"""
+        return dias_para_datetime64(self.coluna(nome))
+
+    @instrumentado("livro.como_dataframe")
+    def como_dataframe(self, colunas=None):
+        """DataFrame com views das colunas numéricas/texto; datas e categorias convertidas"""
+        dados = {}
+        for nome in colunas or self.esquema:
+            tipo = self.esquema[nome]
+            array = self.coluna(nome)
+            if tipo == DATA:
+                dados[nome] = dias_para_datetime64(array)
+            elif tipo == CATEGORIA:
+                dados[nome] = pd.Categorical.from_codes(array, categories=self._categorias[nome])
+            elif tipo == BOOLEANO:
+                dados[nome] = array == 1
+            else:
+                dados[nome] = array
+        return pd.DataFrame(dados, copy=False)
+
+def criar_livro(colecao, registros=()):
+    """Cria o livro da coleção com o esquema padrão"""
+    return Livro(ESQUEMAS[colecao], registros)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Projeções de patrimônio por Monte Carlo
+Milhares de trajetórias de retorno simuladas de uma vez com NumPy
+"""
+
+import numpy as np
+
+from .derivados import derivado
+
+MESES_MAXIMOS = 480  # 40 anos
+CAMINHOS_PADRAO = 10_000
+PERCENTIS_PADRAO = (5, 50, 95)
+SEMENTE = 20240101
+RENDIMENTO_PASSIVO_ANUAL = 8.0  # % a.a. sobre o patrimônio para estimar a renda passiva
+
+# ========== CHOQUES ALEATÓRIOS ==========
+@derivado
+def choques_padrao(caminhos=CAMINHOS_PADRAO, semente=SEMENTE):
+    """Matriz (MESES_MAXIMOS x caminhos) de normais padrão em float32, somente leitura
+
+    Sorteada uma vez e reaproveitada: mudar um parâmetro (ou o horizonte) só
+    reescala os mesmos choques, então as faixas variam suavemente com o slider.
+    """
+    choques = np.random.default_rng(semente).standard_normal((MESES_MAXIMOS, caminhos), dtype=np.float32)
+    choques.flags.writeable = False
+    return choques
+
+# ========== SIMULAÇÃO ==========
+def aportes_por_mes(aporte_mensal, crescimento_aporte_anual, meses):
+    """Aporte de cada mês; o valor sobe `crescimento_aporte_anual` % a cada 12 meses"""
+    anos = np.arange(meses) // 12
+    return aporte_mensal * (1 + crescimento_aporte_anual/100) ** anos
+
+@derivado
+def simular_patrimonio(patrimonio, aporte_mensal, rentabilidade_anual, volatilidade_anual=0.0,
+                       crescimento_aporte_anual=0.0, meses=36, caminhos=CAMINHOS_PADRAO,
+                       percentis=PERCENTIS_PADRAO):
+    """Faixas de percentis do patrimônio mês a mês: array (len(percentis) x meses)
+
+    Retornos mensais lognormais com média anual `rentabilidade_anual` % e desvio
+    anual `volatilidade_anual` %; o aporte entra no fim de cada mês. Com
+    volatilidade zero todas as faixas coincidem com a capitalização composta.
+    """
+    if not 1 <= meses <= MESES_MAXIMOS:
+        raise ValueError(f"Horizonte deve ficar entre 1 e {MESES_MAXIMOS} meses")
+    sigma = volatilidade_anual / 100 / np.sqrt(12)
+    mu = np.log1p(rentabilidade_anual / 100) / 12 - sigma * sigma / 2
+
+    # Fatores de crescimento (1 + retorno) de todos os caminhos, no mesmo buffer
+    trajetorias = np.multiply(choques_padrao(caminhos)[:meses], np.float32(sigma))
+    trajetorias += np.float32(mu)
+    np.exp(trajetorias, out=trajetorias)
+
+    # A recorrência é sequencial no tempo mas vetorizada entre os caminhos;
+    # cada linha do buffer passa a guardar o patrimônio daquele mês
+    aportes = aportes_por_mes(aporte_mensal, crescimento_aporte_anual, meses).astype(np.float32)
+    atual = np.full(caminhos, patrimonio, dtype=np.float32)
+    for mes in range(meses):
+        atual *= trajetorias[mes]
+        atual += aportes[mes]
+        trajetorias[mes] = atual
+
+    # Ordenar cada mês sai mais barato que np.percentile para poucas faixas
+    trajetorias.sort(axis=1)
+    posicoes = np.round(np.asarray(percentis) / 100 * (caminhos - 1)).astype(int)
+    faixas = trajetorias[:, posicoes].T.astype(np.float64)
+    faixas.flags.writeable = False
+    return faixas
+
+def meses_ate(serie, alvo):
+    """Primeiro mês (1 = próximo mês) em que a série atinge o alvo, ou None"""
+    atingiu = np.flatnonzero(np.asarray(serie) >= alvo)
+    return int(atingiu[0]) + 1 if len(atingiu) else None
+
+# ========== METAS ==========
+# Fórmulas de anuidade com aporte no fim de cada mês. Todos os argumentos
+# aceitam escalares ou arrays e seguem o broadcasting do NumPy: uma grade de
+# cenários inteira (ex.: rentabilidades[:, None] x aportes[None, :]) sai de
+# uma única chamada.
+
+RENTABILIDADE_MINIMA = -50.0   # % a.a., limites da busca em rentabilidade_necessaria
+RENTABILIDADE_MAXIMA = 200.0
+
+def taxa_mensal(rentabilidade_anual):
+    """Taxa mensal equivalente à rentabilidade anual (em %)"""
+    return np.power(1 + np.asarray(rentabilidade_anual, dtype=float) / 100, 1/12) - 1
+
+def _fator_anuidade(taxa, meses):
+    """((1+i)^n - 1) / i, com o limite n quando i -> 0"""
+    crescimento = np.power(1 + taxa, meses)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.abs(taxa) < 1e-12, meses, (crescimento - 1) / taxa), crescimento
+
+def valor_futuro(patrimonio, aporte_mensal, rentabilidade_anual, meses):
+    """Patrimônio após `meses` meses de capitalização e aportes"""
+    fator, crescimento = _fator_anuidade(taxa_mensal(rentabilidade_anual), np.asarray(meses, dtype=float))
+    return patrimonio * crescimento + aporte_mensal * fator
+
+def aporte_necessario(meta, patrimonio, rentabilidade_anual, meses):
+    """Aporte mensal para chegar à meta em `meses` meses (0 se já chega sem aportar)"""
+    meses = np.maximum(np.asarray(meses, dtype=float), 1)
+    fator, crescimento = _fator_anuidade(taxa_mensal(rentabilidade_anual), meses)
+    return np.maximum((meta - patrimonio * crescimento) / fator, 0.0)
+
+def meses_necessarios(meta, patrimonio, aporte_mensal, rentabilidade_anual):
+    """Meses até a meta (fracionário); inf quando ela nunca é atingida"""
+    taxa = taxa_mensal(rentabilidade_anual)
+    meta, patrimonio, aporte_mensal = (np.asarray(x, dtype=float) for x in (meta, patrimonio, aporte_mensal))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # n = ln((M·i + A) / (P·i + A)) / ln(1 + i)
+        razao = (meta * taxa + aporte_mensal) / (patrimonio * taxa + aporte_mensal)
+        composto = np.log(razao) / np.log1p(taxa)
+        linear = (meta - patrimonio) / aporte_mensal
+    meses = np.where(np.abs(taxa) < 1e-12, linear, composto)
+    meses = np.where(np.isfinite(meses) & (meses >= 0), meses, np.inf)
+    return np.where(patrimonio >= meta, 0.0, meses)
+
+def rentabilidade_necessaria(meta, patrimonio, aporte_mensal, meses, iteracoes=60):
+    """Rentabilidade anual (%) que leva à meta em `meses` meses; nan fora de [mínima, máxima]
+
+    Sem forma fechada: bisseção vetorizada, todos os cenários avançam juntos
+    (o valor futuro cresce com a taxa quando patrimônio e aportes são positivos).
+    """
+    meta, patrimonio, aporte_mensal, meses = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (meta, patrimonio, aporte_mensal, meses)))
+    baixa = np.full(meta.shape, taxa_mensal(RENTABILIDADE_MINIMA))
+    alta = np.full(meta.shape, taxa_mensal(RENTABILIDADE_MAXIMA))
+
+    def falta(taxa):
+        fator, crescimento = _fator_anuidade(taxa, meses)
+        return patrimonio * crescimento + aporte_mensal * fator - meta
+
+    alcancavel = (falta(baixa) <= 0) & (falta(alta) >= 0)
+    for _ in range(iteracoes):
+        meio = (baixa + alta) / 2
+        acima = falta(meio) >= 0
+        alta = np.where(acima, meio, alta)
+        baixa = np.where(acima, baixa, meio)
+    anual = (np.power(1 + (baixa + alta) / 2, 12) - 1) * 100
+    return np.where(alcancavel, anual, np.nan)
+
+def formatar_prazo(meses):
+    """'X anos e Y meses' arredondando para cima; '—' quando o prazo é infinito"""
+    if not np.isfinite(meses):
+        return "—"
+    if meses <= 0:
+        return "Já atingida"
+    anos, resto = divmod(int(np.ceil(meses)), 12)
+    partes = [f"{anos} ano{'s' if anos > 1 else ''}"] if anos else []
+    if resto:
+        partes.append(f"{resto} {'meses' if resto > 1 else 'mês'}")
+    return " e ".join(partes)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Repositório compartilhado entre sessões
+Uma única cópia mestre dos dados por processo, trava leitor/escritor e detecção de conflitos
+"""
+
+import copy
+import threading
+from contextlib import contextmanager
+
+from .agregados import atualizar_indices, construir_indices
+from .armazenamento import aplicar_operacao, preparar_dados
+from .derivados import memorizar
+from .livro import CAMPO_ID, Livro
+
+class ConflitoDeEscrita(Exception):
+    """O registro foi alterado (ou removido) por outra sessão depois de ter sido lido"""
+
+# ========== TRAVA LEITOR/ESCRITOR ==========
+class TravaLeituraEscrita:
+    """Vários leitores ou um escritor; escritores esperando têm preferência"""
+
+    def __init__(self):
+        self._condicao = threading.Condition()
+        self._leitores = 0
+        self._escrevendo = False
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def leitura(self):
+        with self._condicao:
+            while self._escrevendo or self._escritores_esperando:
+                self._condicao.wait()
+            self._leitores += 1
+        try:
+            yield
+        finally:
+            with self._condicao:
+                self._leitores -= 1
+                if not self._leitores:
+                    self._condicao.notify_all()
+
+    @contextmanager
+    def escrita(self):
+        with self._condicao:
+            self._escritores_esperando += 1
+            while self._escrevendo or self._leitores:
+                self._condicao.wait()
+            self._escritores_esperando -= 1
+            self._escrevendo = True
+        try:
+            yield
+        finally:
+            with self._condicao:
+                self._escrevendo = False
+                self._condicao.notify_all()
+
+# ========== INSTANTÂNEO ==========
+class Instantaneo:
+    """Visão somente leitura dos dados numa revisão do repositório"""
+
+    def __init__(self, revisao, dados, indices):
+        self.revisao = revisao
+        self.dados = dados
+        self.indices = indices
+
+# ========== REPOSITÓRIO ==========
+def _alvo(operacao):
+    """Chave do que a operação altera: (coleção, id) ou ('definir', caminho)"""
+    tipo = operacao['op']
+    if tipo in ('remover', 'atualizar') and CAMPO_ID in operacao:
+        return operacao['colecao'], operacao[CAMPO_ID]
+    if tipo == 'definir':
+        return 'definir', tuple(operacao['caminho'])
+    return None
+
+class Repositorio:
+    """Dados mestres do processo; sessões leem instantâneos e escrevem por `executar`
+
+    Cada operação aplicada incrementa `revisao`, e o repositório guarda a revisão e
+    o autor da última alteração de cada registro (ou caminho de `definir`). Uma
+    operação feita a partir de um instantâneo antigo sobre algo que outra sessão
+    (ou outro processo) alterou depois gera ConflitoDeEscrita em vez de sobrescrever.
+    """
+
+    def __init__(self, armazenamento):
+        self.armazenamento = armazenamento
+        self.trava = TravaLeituraEscrita()
+        self._montando = threading.Lock()
+        self.revisao = 0
+        # A carga pode migrar um arquivo antigo (ids) e gravá-lo: mesma trava das escritas
+        with self.armazenamento.travar():
+            self._carregar()
+
+    def _carregar(self):
+        self.dados = self.armazenamento.carregar()
+        self.indices = construir_indices(self.dados)
+        self.revisao += 1
+        # Após uma recarga completa não se sabe o que mudou: leituras anteriores ficam velhas
+        self._revisao_base = self.revisao
+        self._alteracoes = {}  # alvo -> (revisão, autor)
+        self._copias = {}      # coleção -> cópia do livro usada nos instantâneos
+        self._instantaneo = None
+
+    # ----- leitura -----
+    def instantaneo(self):
+        """Dados e índices da revisão atual; a mesma cópia serve a todas as sessões"""
+        # A trava de escrita e o flock só quando outro processo gravou algo: leitores não se enfileiram
+        with self.trava.leitura():
+            externo = self.armazenamento.mudou_no_disco()
+        if externo:
+            self.sincronizar()
+        with self.trava.leitura(), self._montando:
+            if self._instantaneo is None or self._instantaneo.revisao != self.revisao:
+                self._instantaneo = self._montar_instantaneo()
+            return self._instantaneo
+
+    def consultar(self, dados, metodo, colecao, *argumentos):
+        """Consulta do armazenamento (listar, somar_por_*) memorizada pela revisão da coleção"""
+        return memorizar(
+            metodo, (dados[colecao], *argumentos),
+            lambda: getattr(self.armazenamento, metodo)(dados, colecao, *argumentos)
+        )
+
+    def _montar_instantaneo(self):
+        dados, indices = {}, {}
+        for chave, valor in self.dados.items():
+            if isinstance(valor, Livro):
+                # Só coleções alteradas desde o último instantâneo são copiadas
+                copia = self._copias.get(chave)
+                if copia is None or copia.versao != valor.versao:
+                    copia = self._copias[chave] = valor.copia()
+                dados[chave] = copia
+            else:
+                dados[chave] = copy.deepcopy(valor)
+        for colecao, indice in self.indices.items():
+            indices[colecao] = indice.copia()
+        return Instantaneo(self.revisao, dados, indices)
+
+    # ----- escrita -----
+    def executar(self, operacao, lida_em=None, autor=None):
+        """Aplica a operação nos dados mestres, nos índices e no armazenamento
+
+        `lida_em` é a revisão do instantâneo em que a sessão se baseou; `autor`
+        identifica a sessão (as próprias alterações nunca geram conflito).
+        """
+        return self.executar_lote([operacao], lida_em, autor)[0]
+
+    def executar_lote(self, operacoes, lida_em=None, autor=None):
+        """Como `executar`, para várias operações gravadas juntas (um único write)
+
+        Os conflitos são verificados antes de aplicar qualquer uma, e se uma
+        operação ou a gravação falhar no meio do lote os dados mestres voltam ao
+        que está no disco: ou entram todas, ou nenhuma.
+        """
+        with self.trava.escrita(), self.armazenamento.travar():
+            self._sincronizar()
+            alvos = [_alvo(operacao) for operacao in operacoes]
+            if lida_em is not None:
+                for operacao, alvo in zip(operacoes, alvos):
+                    if alvo is not None:
+                        self._verificar_conflito(operacao, alvo, lida_em, autor)
+            resultados = []
+            try:
+                for operacao, alvo in zip(operacoes, alvos):
+                    resultado = aplicar_operacao(self.dados, operacao)
+                    atualizar_indices(self.indices, self.dados, operacao, resultado)
+                    self.revisao += 1
+                    if alvo is not None:
+                        self._alteracoes[alvo] = (self.revisao, autor)
+                    resultados.append(resultado)
+                self.armazenamento.registrar_lote(self.dados, operacoes)
+            except BaseException:
+                # Parte do lote já foi aplicada em memória mas não gravada: recarrega o estado gravado
+                self._carregar()
+                raise
+            return resultados
+
+    def _verificar_conflito(self, operacao, alvo, lida_em, autor):
+        if alvo[0] != 'definir' and not self.dados[alvo[0]].tem_id(alvo[1]):
+            raise ConflitoDeEscrita(f"O registro {alvo[1]} de {alvo[0]} foi removido por outra sessão.")
+        if lida_em < self._revisao_base:
+            raise ConflitoDeEscrita("Os dados foram recarregados do disco depois da sua leitura.")
+        revisao, quem = self._alteracoes.get(alvo, (0, None))
+        if revisao > lida_em and quem != autor:
+            descricao = '.'.join(alvo[1]) if alvo[0] == 'definir' else f"o registro {alvo[1]} de {alvo[0]}"
+            raise ConflitoDeEscrita(f"Outra sessão alterou {descricao} depois da sua leitura.")
+
+    def substituir(self, dados):
+        """Troca todo o conteúdo (importação/limpeza) e grava um snapshot"""
+        with self.trava.escrita(), self.armazenamento.travar():
+            dados = preparar_dados(dados)
+            self.armazenamento.compactar(dados)
+            self._carregar()
+
+    def compactar(self):
+        with self.trava.escrita(), self.armazenamento.travar():
+            self.armazenamento.compactar(self.dados)
+
+    # ----- outros processos -----
+    def sincronizar(self):
+        """Incorpora gravações de outros processos no mesmo arquivo"""
+        with self.trava.escrita(), self.armazenamento.travar():
+            self._sincronizar()
+
+    def _sincronizar(self):
+        aplicadas = self.armazenamento.sincronizar(self.dados)
+        if aplicadas is None:
+            self._carregar()
+            return
+        for operacao, resultado in aplicadas:
+            atualizar_indices(self.indices, self.dados, operacao, resultado)
+            self.revisao += 1
+            alvo = _alvo(operacao)
+            if alvo is not None:
+                self._alteracoes[alvo] = (self.revisao, 'externo')
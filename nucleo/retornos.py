@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rentabilidade ponderada pelo tempo (TWR) e pelo dinheiro (XIRR)
+Aportes, proventos, cotações e snapshots do patrimônio em arrays de fluxos; a TIR de
+todos os ativos (e da carteira) sai de um único Newton vetorizado
+"""
+
+import numpy as np
+import pandas as pd
+
+from .derivados import derivado
+from .livro import NULO_DATA
+
+DIAS_ANO = 365.0
+TAXA_MINIMA = -0.9999  # a.a., limites da busca da XIRR
+TAXA_MAXIMA = 100.0    # 10.000% a.a.
+
+# ========== XIRR ==========
+def xirr_grupos(grupos, valores, anos, n_grupos, iteracoes=100, tolerancia=1e-10):
+    """Taxa anual (fração) que zera o valor dos fluxos de cada grupo; nan sem solução em [mínima, máxima]
+
+    `valores` são os fluxos do ponto de vista do investidor (aporte < 0, proventos e
+    valor final > 0) e `anos` a distância de cada um até a data de referência (>= 0);
+    zera-se o valor futuro sum(v * (1 + r) ** anos). Newton protegido: cada grupo
+    mantém um intervalo com troca de sinal e cai na bisseção quando o passo de
+    Newton sai dele, então converge mesmo com fluxos que mudam de sinal várias vezes.
+    """
+    grupos = np.asarray(grupos, dtype=np.int64)
+    valores = np.asarray(valores, dtype=np.float64)
+    anos = np.asarray(anos, dtype=np.float64)
+
+    def valor_e_derivada(taxa):
+        base = 1 + taxa[grupos]
+        fatores = np.power(base, anos)
+        valor = np.bincount(grupos, valores * fatores, minlength=n_grupos)
+        derivada = np.bincount(grupos, valores * anos * fatores / base, minlength=n_grupos)
+        return valor, derivada
+
+    baixa = np.full(n_grupos, TAXA_MINIMA)
+    alta = np.full(n_grupos, TAXA_MAXIMA)
+    valor_baixa = valor_e_derivada(baixa)[0]
+    valido = np.sign(valor_baixa) * np.sign(valor_e_derivada(alta)[0]) < 0
+
+    taxa = np.full(n_grupos, 0.1)
+    for _ in range(iteracoes):
+        valor, derivada = valor_e_derivada(taxa)
+        # O intervalo encolhe a cada iteração, do lado em que a taxa atual caiu
+        mesmo_lado = np.sign(valor) == np.sign(valor_baixa)
+        baixa = np.where(mesmo_lado, taxa, baixa)
+        valor_baixa = np.where(mesmo_lado, valor, valor_baixa)
+        alta = np.where(mesmo_lado, alta, taxa)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = taxa - valor / derivada
+        # A taxa atual já é uma das pontas: o passo de Newton só é recusado se passar delas
+        fora = ~np.isfinite(newton) | (newton < baixa) | (newton > alta)
+        nova = np.where(fora, (baixa + alta) / 2, newton)
+        convergiu = np.abs(nova - taxa) <= tolerancia * (1 + np.abs(taxa))
+        taxa = nova
+        if np.all(convergiu | ~valido):
+            break
+    return np.where(valido, taxa, np.nan)
+
+# ========== FLUXOS DA CARTEIRA ==========
+def _dia(hoje):
+    return int(np.datetime64(hoje, 'D').astype(np.int64))
+
+def _posicoes_na_carteira(carteira, livro):
+    """Posição na carteira do ativo de cada registro (pelo código); -1 fora da carteira"""
+    posicoes = {codigo: i for i, codigo in enumerate(carteira.coluna('codigo'))}
+    # O -1 extra no fim atende o código de categoria nulo (-1)
+    mapa = np.array([posicoes.get(nome, -1) for nome in livro.categorias('ativo')] + [-1], dtype=np.int64)
+    return mapa[livro.coluna('ativo')]
+
+def _aportes_na_carteira(carteira, aportes, dia_hoje):
+    """(ativo, dia, cotas, valor) dos aportes registrados em ativos da carteira"""
+    ativos = _posicoes_na_carteira(carteira, aportes)
+    dias = aportes.coluna('data').astype(np.int64)
+    cotas = aportes.coluna('cotas')
+    validos = (ativos >= 0) & (dias != NULO_DATA) & (dias <= dia_hoje) & (cotas > 0)
+    return ativos[validos], dias[validos], cotas[validos], aportes.coluna('valor')[validos]
+
+def _compras_sem_aporte(carteira, registradas, dia_hoje):
+    """(ativo, dia, cotas, valor) das cotas da carteira que os aportes `registradas` não explicam
+
+    Entram como uma compra ao preço médio na data de inclusão do ativo (ou hoje, sem data).
+    """
+    sem_aporte = np.maximum(
+        np.nan_to_num(carteira.coluna('cotas')) - np.bincount(registradas[0], registradas[2], minlength=len(carteira)), 0)
+    inclusao = carteira.coluna('data_inclusao').astype(np.int64)
+    inclusao = np.where((inclusao == NULO_DATA) | (inclusao > dia_hoje), dia_hoje, inclusao)
+    iniciais = np.flatnonzero(sem_aporte > 0)
+    return iniciais, inclusao[iniciais], sem_aporte[iniciais], sem_aporte[iniciais] * carteira.coluna('preco_medio')[iniciais]
+
+def _compras(carteira, aportes, dia_hoje):
+    """(ativo, dia, cotas, valor) de cada compra: aportes registrados e a posição sem aporte"""
+    registradas = _aportes_na_carteira(carteira, aportes, dia_hoje)
+    iniciais = _compras_sem_aporte(carteira, registradas, dia_hoje)
+    return tuple(np.concatenate(par) for par in zip(registradas, iniciais))
+
+def _proventos_validos(carteira, proventos, dia_hoje):
+    ativos = _posicoes_na_carteira(carteira, proventos)
+    dias = proventos.coluna('data').astype(np.int64)
+    validos = (ativos >= 0) & (dias != NULO_DATA) & (dias <= dia_hoje)
+    return ativos[validos], dias[validos], np.nan_to_num(proventos.coluna('valor')[validos])
+
+def _twr_por_ativo(n, compras, recebidos, valor_cota_hoje, dia_hoje):
+    """TWR acumulada de cada ativo, com o preço de cada aporte (valor / cotas) como avaliação
+
+    Cada compra fecha um subperíodo: o retorno dele é a variação do preço da cota
+    mais os proventos recebidos no período sobre o valor da posição no início.
+    """
+    if n == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    ativos, dias, cotas, valores = compras
+    # Pontos de avaliação: cada compra e a cotação de hoje (por último no mesmo dia)
+    p_ativos = np.concatenate([ativos, np.arange(n)])
+    p_dias = np.concatenate([dias, np.full(n, dia_hoje)])
+    p_cotas = np.concatenate([cotas, np.zeros(n)])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_precos = np.concatenate([valores / cotas, valor_cota_hoje])
+    p_final = np.concatenate([np.zeros(len(ativos), dtype=bool), np.ones(n, dtype=bool)])
+    ordem = np.lexsort((p_final, p_dias, p_ativos))
+    p_ativos, p_dias, p_cotas, p_precos = p_ativos[ordem], p_dias[ordem], p_cotas[ordem], p_precos[ordem]
+
+    inicio = np.r_[True, p_ativos[1:] != p_ativos[:-1]]
+    posicao_inicio = np.flatnonzero(inicio)
+    acumulado = np.cumsum(p_cotas) - p_cotas
+    cotas_antes = acumulado - acumulado[posicao_inicio][np.cumsum(inicio) - 1]
+    preco_antes = np.r_[np.nan, p_precos[:-1]]
+
+    # Provento vai para o subperíodo que termina no primeiro ponto do ativo no mesmo dia ou depois
+    chaves = p_ativos * (1 << 32) + (p_dias + (1 << 31))
+    r_ativos, r_dias, r_valores = recebidos
+    destino = np.searchsorted(chaves, r_ativos * (1 << 32) + (r_dias + (1 << 31)), side='left')
+    no_ativo = destino < len(chaves)
+    no_ativo[no_ativo] = p_ativos[destino[no_ativo]] == r_ativos[no_ativo]
+    proventos_periodo = np.bincount(destino[no_ativo], r_valores[no_ativo], minlength=len(chaves))
+
+    base = cotas_antes * preco_antes
+    periodo = ~inicio & (cotas_antes > 0) & (base > 0) & np.isfinite(p_precos)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fatores = np.where(periodo, (cotas_antes * p_precos + proventos_periodo) / base, 1.0)
+    return np.multiply.reduceat(fatores, posicao_inicio) - 1, np.minimum.reduceat(p_dias, posicao_inicio)
+
+def _anualizar(acumulado, dias):
+    """Taxa anual equivalente; nan em períodos menores que um ano (não se anualiza o que não durou um ano)"""
+    dias = np.asarray(dias, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        anual = np.power(1 + np.asarray(acumulado, dtype=np.float64), DIAS_ANO / dias) - 1
+    return np.where(dias >= DIAS_ANO, anual, np.nan)
+
+@derivado
+def _retornos(carteira, aportes, proventos, hoje):
+    """(DataFrame por ativo, XIRR da carteira): uma única resolução com os ativos e a carteira juntos"""
+    dia_hoje = _dia(hoje)
+    n = len(carteira)
+    compras = _compras(carteira, aportes, dia_hoje)
+    recebidos = _proventos_validos(carteira, proventos, dia_hoje)
+    valor_cota = np.nan_to_num(carteira.coluna('cotacao_atual'))
+    valor_atual = np.nan_to_num(carteira.coluna('cotas')) * valor_cota
+
+    # Fluxos do investidor: compras saem, proventos e o valor de hoje entram
+    ativos = np.concatenate([compras[0], recebidos[0], np.arange(n)])
+    dias = np.concatenate([compras[1], recebidos[1], np.full(n, dia_hoje)])
+    valores = np.concatenate([-compras[3], recebidos[2], valor_atual])
+    # O grupo n é a carteira inteira: os mesmos fluxos somados por dia (no máximo um por dia)
+    dia_inicial = int(dias.min()) if len(dias) else dia_hoje
+    por_dia = np.bincount(dias - dia_inicial, valores)
+    dias_carteira = np.flatnonzero(por_dia) + dia_inicial
+    taxas = xirr_grupos(np.concatenate([ativos, np.full(len(dias_carteira), n)]),
+                        np.concatenate([valores, por_dia[dias_carteira - dia_inicial]]),
+                        (dia_hoje - np.concatenate([dias, dias_carteira])) / DIAS_ANO, n + 1)
+
+    twr, primeiro_dia = _twr_por_ativo(n, compras, recebidos, valor_cota, dia_hoje)
+    df = pd.DataFrame({
+        'codigo': carteira.coluna('codigo'),
+        'aportado': np.bincount(compras[0], compras[3], minlength=n),
+        'proventos': np.bincount(recebidos[0], recebidos[2], minlength=n),
+        'valor_atual': valor_atual,
+        'twr_%': twr * 100,
+        'twr_anual_%': _anualizar(twr, dia_hoje - primeiro_dia) * 100,
+        'xirr_%': taxas[:n] * 100,
+        'desde': pd.to_datetime(primeiro_dia, unit='D'),
+    })
+    return df, float(taxas[n] * 100)
+
+# ========== API ==========
+@derivado
+def retornos_por_ativo(carteira, aportes, proventos, hoje):
+    """Por ativo da carteira: aportado, proventos, valor_atual, twr_% (acumulada), twr_anual_% e xirr_% (a.a.)
+
+    Anualizadas só com pelo menos um ano de histórico (nan antes disso); XIRR é nan
+    quando os fluxos não trocam de sinal (ex.: posição incluída hoje).
+    """
+    return _retornos(carteira, aportes, proventos, hoje)[0]
+
+def _twr_snapshots(historico_patrimonio, aportes, proventos, sem_aporte):
+    """(TWR acumulada, dias) entre o primeiro e o último snapshot do patrimônio
+
+    Aportes do período entram no fim dele (o snapshot já os inclui) e proventos
+    recebidos contam como retorno: (V_k + proventos - aportes) / V_(k-1). As
+    posições sem aporte (`sem_aporte`, de _compras_sem_aporte) contam como aporte
+    na data de inclusão, como na XIRR. Se algum período fica com fator <= 0
+    (aportes maiores que o patrimônio registrado), os snapshots não batem com os
+    aportes e a TWR é nan.
+    """
+    dias = historico_patrimonio.coluna('data').astype(np.int64)
+    validos = dias != NULO_DATA
+    ordem = np.argsort(dias[validos], kind='stable')
+    dias = dias[validos][ordem]
+    valores = historico_patrimonio.coluna('valor')[validos][ordem]
+    if len(dias) < 2:
+        return np.nan, 0
+
+    def por_periodo(datas, fluxos):
+        datas = datas.astype(np.int64)
+        periodo = np.searchsorted(dias, datas, side='left')
+        dentro = (datas != NULO_DATA) & (periodo >= 1) & (periodo < len(dias))
+        return np.bincount(periodo[dentro], np.nan_to_num(fluxos[dentro]), minlength=len(dias))
+
+    entradas = (por_periodo(aportes.coluna('data'), aportes.coluna('valor'))
+                + por_periodo(sem_aporte[1], sem_aporte[3]))
+    anterior = valores[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fatores = (valores[1:] + por_periodo(proventos.coluna('data'), proventos.coluna('valor'))[1:]
+                   - entradas[1:]) / anterior
+    fatores = np.where(anterior > 0, fatores, 1.0)
+    if np.any(fatores <= 0):
+        return np.nan, int(dias[-1] - dias[0])
+    return float(np.prod(fatores) - 1), int(dias[-1] - dias[0])
+
+@derivado
+def retornos_carteira(carteira, aportes, proventos, historico_patrimonio, hoje):
+    """Carteira inteira: {'xirr_%', 'twr_%', 'twr_anual_%', 'dias_twr'}
+
+    XIRR pelos fluxos reais (aportes, proventos e o valor de hoje); TWR pelos
+    snapshots do patrimônio, neutralizando os aportes entre eles. Nas duas, a
+    posição da carteira sem aporte registrado é uma compra ao preço médio.
+    """
+    dia_hoje = _dia(hoje)
+    sem_aporte = _compras_sem_aporte(carteira, _aportes_na_carteira(carteira, aportes, dia_hoje), dia_hoje)
+    twr, dias = _twr_snapshots(historico_patrimonio, aportes, proventos, sem_aporte)
+    return {
+        'xirr_%': _retornos(carteira, aportes, proventos, hoje)[1],
+        'twr_%': twr * 100,
+        'twr_anual_%': float(_anualizar(twr, dias)) * 100,
+        'dias_twr': dias,
+    }
@@ -0,0 +1,4 @@
+"""
+Páginas do app Streamlit, uma por módulo
+Cada módulo expõe renderizar(dados, indices) e só é importado quando a página é aberta
+"""
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 📅 Aportes
+Planejamento e histórico de aportes
+"""
+
+import streamlit as st
+from datetime import datetime
+
+from nucleo.armazenamento import para_data
+from nucleo.derivados import calcular_aportes_mes, ordenado_por_data
+from paginas.comum import adicionar_registro
+
+def renderizar(dados, indices):
+    st.markdown('<h1 class="main-header">📅 Planejamento de Aportes</h1>', unsafe_allow_html=True)
+    
+    # Formulário para registrar aporte
+    with st.expander("➕ Registrar Novo Aporte", expanded=False):
+        with st.form("form_aporte"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                data_aporte = st.date_input("📅 Data do Aporte", value=datetime.now())
+                ativo = st.text_input("🏢 Código do Ativo", placeholder="Ex: MXRF11")
+            
+            with col2:
+                cotas_aporte = st.number_input("🔢 Quantidade de Cotas", min_value=1, value=1)
+                valor_aporte = st.number_input("💵 Valor Total (R$)", min_value=0.01, value=100.00, format="%.2f")
+            
+            submitted = st.form_submit_button("✅ Registrar Aporte")
+            
+            if submitted:
+                if ativo.strip():
+                    novo_aporte = {
+                        "data": para_data(data_aporte),
+                        "ativo": ativo.upper().strip(),
+                        "cotas": cotas_aporte,
+                        "valor": valor_aporte
+                    }
+                    adicionar_registro(dados, 'aportes', novo_aporte)
+                    st.success(f"✅ Aporte em {ativo.upper()} registrado!")
+                    st.rerun()
+                else:
+                    st.error("❌ Por favor, preencha o código do ativo.")
+    
+    # Resumo de aportes
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+    
+    total_mes = calcular_aportes_mes(indices['aportes'])
+    total_ano = dados['aportes'].somar('valor')
+    
+    with col1:
+        st.metric("💵 Aportado este Mês", f"R$ {total_mes:,.2f}")
+    
+    with col2:
+        st.metric("📊 Total em 2026", f"R$ {total_ano:,.2f}")
+    
+    # Histórico
+    st.markdown("---")
+    st.subheader("📋 Histórico de Aportes")
+    
+    if dados['aportes']:
+        df_aportes = ordenado_por_data(dados['aportes'], True)
+        
+        df_display = df_aportes[['data', 'ativo', 'cotas', 'valor']].copy()
+        df_display['data'] = df_display['data'].dt.strftime('%d/%m/%Y')
+        df_display.columns = ['Data', 'Ativo', 'Cotas', 'Valor']
+        
+        st.dataframe(
+            df_display.style.format({'Valor': 'R$ {:.2f}'}),
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("📌 Nenhum aporte registrado ainda!")
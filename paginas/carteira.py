@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 💼 Carteira
+Ativos da carteira: cadastro, lista paginada e tabela editável
+"""
+
+import streamlit as st
+from datetime import datetime
+
+from nucleo.armazenamento import para_data
+from nucleo.derivados import carteira_detalhada
+from paginas.comum import (
+    MODOS_EXIBICAO, adicionar_registro, remover_registro, atualizar_registro, paginar, editar_em_tabela,
+)
+
+def renderizar(dados, indices):
+    itens_por_pagina = dados['perfil'].get('itens_por_pagina', 20)
+
+    st.markdown('<h1 class="main-header">💼 Minha Carteira de Investimentos</h1>', unsafe_allow_html=True)
+    
+    # Formulário para adicionar novo ativo
+    with st.expander("➕ Adicionar Novo Ativo", expanded=False):
+        with st.form("form_novo_ativo"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                codigo = st.text_input("🏢 Código do Ativo", placeholder="Ex: MXRF11, ITSA3")
+                tipo = st.selectbox("📂 Tipo", ["FII", "Ação", "Renda Fixa"])
+                cotas = st.number_input("🔢 Quantidade de Cotas", min_value=1, value=1)
+            
+            with col2:
+                preco_medio = st.number_input("💵 Preço Médio de Compra (R$)", min_value=0.01, value=10.00, format="%.2f")
+                cotacao_atual = st.number_input("📈 Cotação Atual (R$)", min_value=0.01, value=10.00, format="%.2f")
+            
+            submitted = st.form_submit_button("✅ Adicionar à Carteira")
+            
+            if submitted:
+                if codigo.strip():
+                    novo_ativo = {
+                        "codigo": codigo.upper().strip(),
+                        "tipo": tipo,
+                        "cotas": cotas,
+                        "preco_medio": preco_medio,
+                        "cotacao_atual": cotacao_atual,
+                        "data_inclusao": para_data(datetime.now())
+                    }
+                    adicionar_registro(dados, 'carteira', novo_ativo)
+                    st.success(f"✅ {codigo.upper()} adicionado com sucesso!")
+                    st.rerun()
+                else:
+                    st.error("❌ Por favor, preencha o código do ativo.")
+    
+    # Exibir carteira atual
+    st.markdown("---")
+    st.subheader("📋 Ativos na Carteira")
+    
+    if dados['carteira']:
+        modo = st.radio("Modo de exibição:", MODOS_EXIBICAO, horizontal=True, key="modo_carteira")
+        inicio, fim = paginar(len(dados['carteira']), "pag_carteira", itens_por_pagina)
+        
+        if modo == "📝 Tabela editável":
+            editar_em_tabela(
+                dados, 'carteira', carteira_detalhada(dados['carteira']).iloc[inicio:fim],
+                ['codigo', 'tipo', 'cotas', 'preco_medio', 'cotacao_atual'],
+                {
+                    "codigo": st.column_config.TextColumn("Código", disabled=True),
+                    "tipo": st.column_config.TextColumn("Tipo", disabled=True),
+                    "cotas": st.column_config.NumberColumn("Cotas", min_value=0),
+                    "preco_medio": st.column_config.NumberColumn("Preço Médio", min_value=0.01, format="R$ %.2f"),
+                    "cotacao_atual": st.column_config.NumberColumn("Cotação Atual", min_value=0.01, format="R$ %.2f"),
+                }
+            )
+        else:
+            for ativo in carteira_detalhada(dados['carteira']).iloc[inicio:fim].to_dict('records'):
+                col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+            
+                valor_investido = ativo['cotas'] * ativo['preco_medio']
+                valor_atual = ativo['cotas'] * ativo['cotacao_atual']
+                rentabilidade = ((valor_atual - valor_investido) / valor_investido * 100) if valor_investido > 0 else 0
+            
+                with col1:
+                    st.markdown(f"### {ativo['codigo']}")
+                    st.caption(f"{ativo['tipo']} • {ativo['cotas']:g} cotas")
+            
+                with col2:
+                    st.metric("Investido", f"R$ {valor_investido:,.2f}")
+            
+                with col3:
+                    st.metric("Atual", f"R$ {valor_atual:,.2f}", f"{rentabilidade:+.2f}%")
+            
+                with col4:
+                    if st.button("🗑️", key=f"del_{ativo['id']}"):
+                        remover_registro(dados, 'carteira', ativo['id'])
+                        st.rerun()
+            
+                # Editar cotação
+                with st.expander(f"✏️ Atualizar cotação de {ativo['codigo']}", expanded=False):
+                    nova_cotacao = st.number_input(
+                        "Nova cotação (R$)",
+                        min_value=0.01,
+                        value=ativo['cotacao_atual'],
+                        format="%.2f",
+                        key=f"cotacao_{ativo['id']}"
+                    )
+                    if st.button("💾 Salvar Cotação", key=f"save_{ativo['id']}"):
+                        atualizar_registro(dados, 'carteira', ativo['id'], cotacao_atual=nova_cotacao)
+                        st.success("✅ Cotação atualizada!")
+                        st.rerun()
+            
+                st.markdown("---")
+    else:
+        st.info("📌 Nenhum ativo cadastrado. Use o formulário acima para adicionar!")
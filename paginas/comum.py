@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Funções compartilhadas pelas páginas
+Acesso ao repositório da sessão, operações com detecção de conflito e tabelas paginadas/editáveis
+"""
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+from nucleo.armazenamento import criar_armazenamento, para_data
+from nucleo.instrumentacao import instrumentado, span
+from nucleo.repositorio import Repositorio, ConflitoDeEscrita
+
+# ========== FUNÇÕES DE DADOS ==========
+DATA_FILE = Path("dados_investimentos.json")
+
+@st.cache_resource
+def obter_repositorio():
+    """Repositório único do processo, compartilhado por todas as sessões"""
+    return Repositorio(criar_armazenamento(DATA_FILE))
+
+@instrumentado("carregar_dados")
+def carregar_dados():
+    """Instantâneo dos dados (e índices) na revisão atual, já com gravações de outras sessões"""
+    return obter_repositorio().instantaneo()
+
+@instrumentado("salvar_dados")
+def salvar_dados(dados):
+    """Substitui todos os dados e grava um snapshot completo (importação/limpeza)"""
+    obter_repositorio().substituir(dados)
+
+def registrar_operacao(dados, operacao):
+    """Aplica a operação nos dados compartilhados e grava apenas ela no journal
+
+    Se outra sessão alterou o mesmo registro depois da leitura desta página, a
+    operação é recusada e a página é recarregada com os dados atuais.
+    """
+    return registrar_operacoes(dados, [operacao])[0]
+
+def registrar_operacoes(dados, operacoes):
+    """Várias operações gravadas num único lote (um write/fsync ou uma transação)"""
+    try:
+        with span("registrar_operacoes", operacoes=len(operacoes)):
+            return obter_repositorio().executar_lote(
+                operacoes, lida_em=st.session_state.revisao_lida, autor=st.session_state.id_sessao)
+    except ConflitoDeEscrita as erro:
+        st.session_state.aviso_conflito = f"⚠️ Alteração não salva: {erro} Os dados foram atualizados; confira e tente de novo."
+        st.rerun()
+
+def adicionar_registro(dados, colecao, registro):
+    """Adiciona um registro a uma coleção (entradas, saidas, proventos...)"""
+    return registrar_operacao(dados, {"op": "adicionar", "colecao": colecao, "registro": registro})
+
+def remover_registro(dados, colecao, id_registro):
+    """Remove o registro da coleção pelo seu id (O(1))"""
+    return registrar_operacao(dados, {"op": "remover", "colecao": colecao, "id": id_registro})
+
+def atualizar_registro(dados, colecao, id_registro, **campos):
+    """Atualiza campos de um registro existente, localizado pelo id"""
+    return registrar_operacao(dados, {"op": "atualizar", "colecao": colecao, "id": id_registro, "campos": campos})
+
+def definir_valor(dados, caminho, valor):
+    """Define um valor simples, ex: ['metas', 'patrimonio_anual']"""
+    return registrar_operacao(dados, {"op": "definir", "caminho": caminho, "valor": valor})
+
+def definir_valores(dados, valores):
+    """Vários valores simples [(caminho, valor), ...] gravados juntos: um formulário vira um único lote"""
+    return registrar_operacoes(dados, [{"op": "definir", "caminho": caminho, "valor": valor}
+                                       for caminho, valor in valores])
+
+def consultar(dados, metodo, colecao, *argumentos):
+    """Consulta do armazenamento (listar, somar_por_*) memorizada pela revisão da coleção"""
+    with span("consultar", metodo=metodo, colecao=colecao):
+        return obter_repositorio().consultar(dados, metodo, colecao, *argumentos)
+
+def mostrar_grafico(fig, **opcoes):
+    """st.plotly_chart cronometrado: a serialização da figura costuma pesar tanto quanto montá-la"""
+    with span("st.plotly_chart"):
+        st.plotly_chart(fig, **opcoes)
+
+# ========== PAGINAÇÃO E TABELAS EDITÁVEIS ==========
+TAMANHOS_PAGINA = [10, 20, 50, 100]
+MODOS_EXIBICAO = ["📄 Lista paginada", "📝 Tabela editável"]
+
+def paginar(total, chave, tamanho_padrao=20):
+    """Controles de paginação; devolve (inicio, fim) dos registros da página atual"""
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        indice_padrao = TAMANHOS_PAGINA.index(tamanho_padrao) if tamanho_padrao in TAMANHOS_PAGINA else 1
+        tamanho = st.selectbox("Itens por página", TAMANHOS_PAGINA, index=indice_padrao, key=f"{chave}_tamanho")
+    paginas = max(1, -(-total // tamanho))
+    chave_pagina = f"{chave}_pagina"
+    # Após remoções a página guardada pode não existir mais
+    if st.session_state.get(chave_pagina, 1) > paginas:
+        st.session_state[chave_pagina] = paginas
+    with col2:
+        pagina_atual = st.number_input("Página", min_value=1, max_value=paginas, value=1, step=1, key=chave_pagina)
+    inicio = (pagina_atual - 1) * tamanho
+    fim = min(inicio + tamanho, total)
+    with col3:
+        st.caption(f"Exibindo {inicio + 1}–{fim} de {total} • página {pagina_atual} de {paginas}")
+    return inicio, fim
+
+def _valor_editado(valor):
+    """Valor devolvido pelo st.data_editor -> valor Python do registro"""
+    if isinstance(valor, datetime):
+        return para_data(valor)
+    if hasattr(valor, 'item'):
+        return valor.item()
+    return valor
+
+def editar_em_tabela(dados, colecao, df_pagina, campos, column_config=None):
+    """Uma única tabela editável para a página; grava só as linhas alteradas ou marcadas para remoção"""
+    original = df_pagina.set_index('id')[campos]
+    for campo in campos:
+        if isinstance(original[campo].dtype, pd.CategoricalDtype):
+            original[campo] = original[campo].astype(object)
+    original['remover'] = False
+
+    # A revisão do livro na chave descarta edições pendentes quando os dados mudam
+    editado = st.data_editor(
+        original,
+        key=f"editor_{colecao}_{original.index.min()}_{dados[colecao].versao}",
+        column_config={"remover": st.column_config.CheckboxColumn("🗑️ Remover"), **(column_config or {})},
+        use_container_width=True,
+    )
+
+    if st.button("💾 Salvar alterações", key=f"salvar_tabela_{colecao}"):
+        # Um único lote: uma gravação, e um conflito recusa todas as alterações, não só parte delas
+        operacoes = []
+        remover = editado['remover'].to_numpy(dtype=bool)
+        for id_registro, linha in editado[~remover].iterrows():
+            campos_alterados = {
+                campo: _valor_editado(linha[campo])
+                for campo in campos
+                if not (linha[campo] == original.at[id_registro, campo]
+                        or (pd.isna(linha[campo]) and pd.isna(original.at[id_registro, campo])))
+            }
+            if campos_alterados:
+                operacoes.append({"op": "atualizar", "colecao": colecao, "id": int(id_registro),
+                                  "campos": campos_alterados})
+        for id_registro in editado.index[remover]:
+            operacoes.append({"op": "remover", "colecao": colecao, "id": int(id_registro)})
+        if operacoes:
+            registrar_operacoes(dados, operacoes)
+        st.success(f"✅ {len(operacoes)} registro(s) alterado(s)!")
+        st.rerun()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tempos de cada execução do script (partida a frio e reruns)
+Cada execução é uma coleta de spans (nucleo.instrumentacao) que vai para o histórico
+da página de diagnóstico; com SISTEMA_FINANCEIRO_TEMPOS=1 o app também mostra as
+etapas no fim da barra lateral
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from itertools import count
+
+from nucleo.instrumentacao import concluir_coleta, iniciar_coleta, span
+
+ATIVO = os.environ.get("SISTEMA_FINANCEIRO_TEMPOS", "0") not in ("", "0")
+# Bibliotecas pesadas que só algumas páginas usam
+BIBLIOTECAS = ("plotly.express", "openpyxl")
+
+_EXECUCOES = count(1)  # execuções do script neste processo; a primeira paga os imports
+
+class Cronometro:
+    """Duração de cada etapa de uma execução do script; as etapas viram spans 'etapa.<nome>'"""
+
+    def __init__(self, inicio=None, **args):
+        self.execucao = next(_EXECUCOES)
+        self.inicio = inicio or time.perf_counter()
+        self.coleta = iniciar_coleta("rerun", self.inicio, execucao=self.execucao, **args)
+        self._marca = self.inicio
+        self.etapas = []  # (etapa, segundos)
+
+    def marcar(self, etapa):
+        """Fecha a etapa que vai da marca anterior até agora"""
+        agora = time.perf_counter()
+        self.etapas.append((etapa, agora - self._marca))
+        self.coleta.registrar(f"etapa.{etapa}", self._marca, agora - self._marca)
+        self._marca = agora
+
+    @contextmanager
+    def etapa(self, nome):
+        with span(f"etapa.{nome}"):
+            inicio = time.perf_counter()
+            try:
+                yield
+            finally:
+                self._marca = time.perf_counter()
+                self.etapas.append((nome, self._marca - inicio))
+
+    def concluir(self):
+        """Fecha a coleta da execução e a guarda no histórico"""
+        concluir_coleta(self.coleta)
+
+    def total(self):
+        return time.perf_counter() - self.inicio
+
+    def carregados(self):
+        """Páginas e bibliotecas pesadas já importadas neste processo"""
+        paginas = sorted(nome.split('.', 1)[1] for nome in sys.modules
+                         if nome.startswith('paginas.') and nome not in ('paginas.comum', 'paginas.cronometro'))
+        return paginas, [nome for nome in BIBLIOTECAS if nome in sys.modules]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 🛒 Despesas
+Despesas fixas mensais e gastos dos últimos 30 dias
+"""
+
+import streamlit as st
+from datetime import datetime
+
+from nucleo.derivados import calcular_saidas_mes, gastos_ultimos_dias, ordenado_por_id
+from paginas.comum import adicionar_registro, remover_registro
+
+def renderizar(dados, indices):
+    st.markdown('<h1 class="main-header">🛒 Controle de Despesas Pessoais</h1>', unsafe_allow_html=True)
+    
+    st.info("💡 **Dica:** Use esta aba para acompanhar gastos específicos do dia a dia e despesas fixas mensais.")
+    
+    # Resumo rápido
+    despesas_mes = calcular_saidas_mes(indices['saidas'])
+    despesas_fixas_total = dados['despesas_fixas'].somar('valor')
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("💳 Gastos Variáveis", f"R$ {despesas_mes:,.2f}")
+    with col2:
+        st.metric("📋 Despesas Fixas", f"R$ {despesas_fixas_total:,.2f}")
+    with col3:
+        st.metric("💰 Total Mensal", f"R$ {despesas_mes + despesas_fixas_total:,.2f}")
+    
+    st.markdown("---")
+    
+    # Despesas Fixas Mensais
+    st.subheader("📋 Despesas Fixas Mensais")
+    
+    with st.expander("➕ Adicionar Despesa Fixa", expanded=False):
+        with st.form("form_despesa_fixa"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                nome_despesa = st.text_input("📝 Nome da Despesa", placeholder="Ex: Aluguel, Internet, Academia")
+                categoria_despesa = st.selectbox("📂 Categoria", 
+                    ["Moradia", "Transporte", "Saúde", "Educação", "Seguros", "Assinaturas", "Outros"])
+            
+            with col2:
+                valor_despesa = st.number_input("💵 Valor Mensal (R$)", min_value=0.01, value=100.00, format="%.2f")
+                dia_vencimento = st.number_input("📅 Dia do Vencimento", min_value=1, max_value=31, value=10)
+            
+            submitted = st.form_submit_button("✅ Adicionar Despesa Fixa")
+            
+            if submitted:
+                nova_despesa_fixa = {
+                    "nome": nome_despesa,
+                    "categoria": categoria_despesa,
+                    "valor": valor_despesa,
+                    "dia_vencimento": dia_vencimento,
+                    "ativa": True
+                }
+                adicionar_registro(dados, 'despesas_fixas', nova_despesa_fixa)
+                st.success(f"✅ Despesa fixa '{nome_despesa}' adicionada!")
+                st.rerun()
+    
+    # Listar despesas fixas
+    if dados.get('despesas_fixas'):
+        st.markdown("### Lista de Despesas Fixas")
+        for despesa in ordenado_por_id(dados['despesas_fixas']).to_dict('records'):
+            col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+            
+            with col1:
+                st.markdown(f"**{despesa['nome']}**")
+                st.caption(f"{despesa['categoria']} • Vence dia {despesa['dia_vencimento']}")
+            
+            with col2:
+                st.metric("Valor", f"R$ {despesa['valor']:,.2f}")
+            
+            with col3:
+                st.metric("Anual", f"R$ {despesa['valor']*12:,.2f}")
+            
+            with col4:
+                if st.button("🗑️", key=f"del_desp_{despesa['id']}"):
+                    remover_registro(dados, 'despesas_fixas', despesa['id'])
+                    st.rerun()
+            
+            st.markdown("---")
+    else:
+        st.info("📌 Nenhuma despesa fixa cadastrada ainda!")
+    
+    # Análise de gastos
+    if dados.get('saidas'):
+        st.markdown("---")
+        st.subheader("📊 Análise de Gastos dos Últimos 30 Dias")
+        
+        # Últimos 30 dias e gastos por categoria (recalculados só quando as saídas mudam)
+        df_recente, gastos_cat = gastos_ultimos_dias(dados['saidas'], datetime.now().date())
+        
+        if len(df_recente) > 0:
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("#### 🏆 Top Categorias")
+                for i, (cat, valor) in enumerate(gastos_cat.head(5).items(), 1):
+                    perc = (valor / gastos_cat.sum() * 100)
+                    st.write(f"{i}. **{cat}**: R$ {valor:,.2f} ({perc:.1f}%)")
+            
+            with col2:
+                st.markdown("#### 💰 Maior Gasto")
+                maior_gasto = df_recente.loc[df_recente['valor'].idxmax()]
+                st.error(f"**R$ {maior_gasto['valor']:,.2f}**")
+                st.caption(f"{maior_gasto['descricao']} • {maior_gasto['categoria']}")
+                st.caption(f"Data: {maior_gasto['data'].strftime('%d/%m/%Y')}")
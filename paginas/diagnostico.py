@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 🩺 Diagnóstico (oculta: abra o app com ?diagnostico na URL)
+Spans das execuções recentes, percentis por span e exportação Chrome trace / speedscope
+"""
+
+import json
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from nucleo.instrumentacao import HISTORICO, Historico, para_chrome_trace, para_speedscope
+
+def _descricao(coleta):
+    hora = datetime.fromtimestamp(coleta.epoca).strftime('%H:%M:%S')
+    return f"{hora} · {coleta.args.get('pagina', '?')} · {coleta.duracao * 1000:,.1f} ms"
+
+def _tabela_spans(coleta):
+    """Um span por linha, recuado pelo aninhamento, com a fração da execução"""
+    linhas = [{
+        'span': '· ' * nivel + registro.nome,
+        'inicio_ms': registro.inicio * 1000,
+        'duracao_ms': registro.duracao * 1000,
+        'fracao': 100 * registro.duracao / coleta.duracao if coleta.duracao else 0.0,
+        'detalhes': ', '.join(f"{chave}={valor}" for chave, valor in registro.args.items()),
+    } for registro, nivel in coleta.em_ordem()]
+    return pd.DataFrame(linhas, columns=['span', 'inicio_ms', 'duracao_ms', 'fracao', 'detalhes'])
+
+def renderizar(dados, indices):
+    st.markdown('<h1 class="main-header">🩺 Diagnóstico de Desempenho</h1>', unsafe_allow_html=True)
+    st.info("💡 Cada execução do app (rerun) é uma coleta de spans: carga e gravação dos dados, "
+            "cálculos (calcular_*, derivados com acerto/falha de cache), montagem e envio dos gráficos. "
+            "A execução atual entra no histórico quando termina.")
+
+    so_sessao = st.checkbox("Só esta sessão", value=True)
+    sessao = st.session_state.get('id_sessao')
+    execucoes = HISTORICO.recentes(
+        (lambda coleta: coleta.args.get('sessao') == sessao) if so_sessao else None)
+    if not execucoes:
+        st.warning("Nenhuma execução registrada ainda: navegue pelas páginas e volte aqui.")
+        return
+
+    # ========== EXECUÇÕES RECENTES ==========
+    st.subheader("⏱️ Execuções Recentes")
+    duracoes = [coleta.duracao * 1000 for coleta in execucoes]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Execuções", len(execucoes))
+    col2.metric("Última", f"{duracoes[0]:,.1f} ms")
+    col3.metric("Mais lenta", f"{max(duracoes):,.1f} ms")
+
+    escolhida = st.selectbox("Execução", range(len(execucoes)), format_func=lambda i: _descricao(execucoes[i]))
+    st.dataframe(
+        _tabela_spans(execucoes[escolhida]),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'span': st.column_config.TextColumn("Span"),
+            'inicio_ms': st.column_config.NumberColumn("Início (ms)", format="%.1f"),
+            'duracao_ms': st.column_config.NumberColumn("Duração (ms)", format="%.2f"),
+            'fracao': st.column_config.ProgressColumn("Da execução", min_value=0.0, max_value=100.0, format="%.0f%%"),
+            'detalhes': st.column_config.TextColumn("Detalhes"),
+        },
+    )
+
+    # ========== PERCENTIS ==========
+    st.markdown("---")
+    st.subheader("📊 Percentis por Span")
+    historico = HISTORICO
+    if so_sessao:
+        historico = Historico(limite_execucoes=None)
+        for coleta in reversed(execucoes):
+            historico.adicionar(coleta)
+    st.dataframe(
+        pd.DataFrame(historico.percentis()),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            nome: st.column_config.NumberColumn(nome.replace('_ms', ' (ms)'), format="%.2f")
+            for nome in ('total_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms')
+        },
+    )
+
+    nomes = sorted({registro.nome for coleta in execucoes for registro in coleta.spans})
+    nome_span = st.selectbox("Histórico do span", nomes,
+                             index=nomes.index('etapa.renderizar página') if 'etapa.renderizar página' in nomes else 0)
+    evolucao = pd.DataFrame([
+        {'execucao': datetime.fromtimestamp(coleta.epoca),
+         'ms': sum(registro.duracao for registro in coleta.spans if registro.nome == nome_span) * 1000}
+        for coleta in reversed(execucoes)
+        if any(registro.nome == nome_span for registro in coleta.spans)
+    ])
+    st.line_chart(evolucao, x='execucao', y='ms')
+
+    # ========== EXPORTAÇÃO ==========
+    st.markdown("---")
+    st.subheader("💾 Exportar")
+    st.caption("Chrome trace: chrome://tracing ou ui.perfetto.dev • speedscope: www.speedscope.app")
+    sufixo = datetime.now().strftime('%Y%m%d_%H%M%S')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("📥 Chrome trace (JSON)", json.dumps(para_chrome_trace(execucoes)),
+                           file_name=f"trace_{sufixo}.json", mime="application/json")
+    with col2:
+        st.download_button("📥 speedscope (JSON)", json.dumps(para_speedscope(execucoes)),
+                           file_name=f"speedscope_{sufixo}.json", mime="application/json")
+    with col3:
+        if st.button("🗑️ Limpar histórico"):
+            HISTORICO.limpar()
+            st.rerun()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 💸 Fluxo de Caixa
+Entradas e saídas, regras de categorização e importação de extratos
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+
+from nucleo.armazenamento import para_data, para_json
+from nucleo.categorizacao import CATEGORIAS_SAIDA, Classificador, TIPOS_REGRA
+from nucleo.derivados import intervalo_do_filtro
+from nucleo.importacao import DESTINOS, ler_cabecalho_csv, ler_extrato, preparar_importacao
+from paginas.comum import registrar_operacoes, adicionar_registro, definir_valor, consultar, mostrar_grafico
+from paginas.graficos import figura
+
+def _grafico_gastos_categoria(gastos_cat):
+    """Pizza dos gastos por categoria no período filtrado"""
+    return px.pie(
+        values=gastos_cat.values,
+        names=gastos_cat.index,
+        title='Distribuição dos Gastos',
+        color_discrete_sequence=px.colors.sequential.RdBu
+    )
+
+def renderizar(dados, indices):
+    st.markdown('<h1 class="main-header">💸 Controle de Fluxo de Caixa</h1>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["🟢 Entradas", "🔴 Saídas", "📥 Importar Extrato"])
+    
+    # ===== TAB ENTRADAS =====
+    with tab1:
+        st.subheader("💰 Registrar Nova Entrada")
+        
+        with st.form("form_entrada"):
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                data_entrada = st.date_input("📅 Data", value=datetime.now())
+                categoria_entrada = st.selectbox("📂 Categoria", 
+                    ["Salário", "Freelance", "Vendas", "Presente", "Reembolso", "Outros"])
+            
+            with col2:
+                descricao_entrada = st.text_input("📝 Descrição", placeholder="Ex: Salário de Fevereiro")
+                valor_entrada = st.number_input("💵 Valor (R$)", min_value=0.01, value=100.00, format="%.2f")
+            
+            with col3:
+                recorrente = st.checkbox("🔄 Entrada recorrente mensal")
+                st.write("")  # espaçamento
+            
+            submitted = st.form_submit_button("✅ Registrar Entrada", use_container_width=True)
+            
+            if submitted:
+                nova_entrada = {
+                    "data": para_data(data_entrada),
+                    "categoria": categoria_entrada,
+                    "descricao": descricao_entrada,
+                    "valor": valor_entrada,
+                    "recorrente": recorrente
+                }
+                adicionar_registro(dados, 'entradas', nova_entrada)
+                st.success(f"✅ Entrada de R$ {valor_entrada:,.2f} registrada!")
+                st.rerun()
+        
+        # Histórico de entradas
+        st.markdown("---")
+        st.subheader("📋 Histórico de Entradas")
+        
+        if dados.get('entradas'):
+            # Filtro por mês
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                filtro_mes = st.selectbox("Filtrar por mês:", ["Todos", "Este mês", "Mês passado"])
+            
+            # Filtro e ordenação resolvidos pelo armazenamento (SQL no backend SQLite)
+            inicio, fim = intervalo_do_filtro(filtro_mes)
+            df_entradas = consultar(dados, 'listar', 'entradas', inicio, fim)
+            
+            df_display = df_entradas.copy()
+            df_display['data'] = df_display['data'].dt.strftime('%d/%m/%Y')
+            df_display = df_display[['data', 'categoria', 'descricao', 'valor']]
+            df_display.columns = ['Data', 'Categoria', 'Descrição', 'Valor']
+            
+            st.dataframe(
+                df_display.style.format({'Valor': 'R$ {:.2f}'}),
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            total_exibido = df_entradas['valor'].sum()
+            st.metric("💰 Total das entradas exibidas", f"R$ {total_exibido:,.2f}")
+        else:
+            st.info("📌 Nenhuma entrada registrada ainda!")
+    
+    # ===== TAB SAÍDAS =====
+    with tab2:
+        st.subheader("💳 Registrar Nova Saída")
+        
+        with st.form("form_saida"):
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                data_saida = st.date_input("📅 Data", value=datetime.now())
+                categoria_saida = st.selectbox("📂 Categoria", CATEGORIAS_SAIDA)
+            
+            with col2:
+                descricao_saida = st.text_input("📝 Descrição", placeholder="Ex: Almoço no restaurante")
+                valor_saida = st.number_input("💵 Valor (R$)", min_value=0.01, value=10.00, format="%.2f")
+            
+            with col3:
+                recorrente_saida = st.checkbox("🔄 Despesa recorrente mensal")
+                st.write("")  # espaçamento
+            
+            submitted = st.form_submit_button("✅ Registrar Saída", use_container_width=True)
+            
+            if submitted:
+                nova_saida = {
+                    "data": para_data(data_saida),
+                    "categoria": categoria_saida,
+                    "descricao": descricao_saida,
+                    "valor": valor_saida,
+                    "recorrente": recorrente_saida
+                }
+                adicionar_registro(dados, 'saidas', nova_saida)
+                st.success(f"✅ Saída de R$ {valor_saida:,.2f} registrada!")
+                st.rerun()
+        
+        # Histórico de saídas
+        st.markdown("---")
+        st.subheader("📋 Histórico de Saídas")
+        
+        if dados.get('saidas'):
+            # Filtro por mês
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                filtro_mes = st.selectbox("Filtrar por mês:", ["Todos", "Este mês", "Mês passado"], key="filtro_saida")
+            
+            inicio, fim = intervalo_do_filtro(filtro_mes)
+            df_saidas = consultar(dados, 'listar', 'saidas', inicio, fim)
+            
+            df_display = df_saidas.copy()
+            df_display['data'] = df_display['data'].dt.strftime('%d/%m/%Y')
+            df_display = df_display[['data', 'categoria', 'descricao', 'valor']]
+            df_display.columns = ['Data', 'Categoria', 'Descrição', 'Valor']
+            
+            st.dataframe(
+                df_display.style.format({'Valor': 'R$ {:.2f}'}),
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            total_exibido = df_saidas['valor'].sum()
+            st.metric("💳 Total das saídas exibidas", f"R$ {total_exibido:,.2f}")
+            
+            # Gráfico por categoria
+            if len(df_saidas) > 0:
+                st.markdown("---")
+                st.subheader("📊 Gastos por Categoria")
+                
+                gastos_cat = pd.Series(consultar(dados, 'somar_por_categoria', 'saidas', inicio, fim))
+                
+                fig = figura("gastos_categoria", _grafico_gastos_categoria, gastos_cat)
+                mostrar_grafico(fig, use_container_width=True)
+        else:
+            st.info("📌 Nenhuma saída registrada ainda!")
+    
+    # ===== TAB IMPORTAR EXTRATO =====
+    with tab3:
+        st.subheader("📥 Importar Extrato Bancário")
+        st.caption("CSV ou OFX de qualquer tamanho: lido em blocos, sem duplicar lançamentos já registrados")
+        
+        regras = dados.get('regras_categoria', [])
+        
+        with st.expander(f"🏷️ Regras de categorização automática ({len(regras)})"):
+            st.caption(
+                "Saídas importadas sem categoria recebem a da primeira regra que casar com a descrição "
+                "(texto contido ou regex, sem diferenciar maiúsculas) e com a faixa de valor, se houver."
+            )
+            colunas_regras = ['tipo', 'padrao', 'categoria', 'valor_min', 'valor_max']
+            regras_editadas = st.data_editor(
+                pd.DataFrame(regras, columns=colunas_regras).astype({'valor_min': float, 'valor_max': float}),
+                num_rows="dynamic",
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'tipo': st.column_config.SelectboxColumn("Tipo", options=TIPOS_REGRA, default='texto', required=True),
+                    'padrao': st.column_config.TextColumn("Texto ou regex", required=True),
+                    'categoria': st.column_config.SelectboxColumn("Categoria", options=CATEGORIAS_SAIDA, required=True),
+                    'valor_min': st.column_config.NumberColumn("Valor mín. (R$)", min_value=0.0, format="%.2f"),
+                    'valor_max': st.column_config.NumberColumn("Valor máx. (R$)", min_value=0.0, format="%.2f"),
+                },
+                key=f"editor_regras_{hash(para_json(regras))}"
+            )
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("💾 Salvar Regras"):
+                    novas_regras = [
+                        {campo: (None if pd.isna(valor) else valor) for campo, valor in regra.items()}
+                        for regra in regras_editadas.to_dict('records')
+                        if isinstance(regra['padrao'], str) and regra['padrao'].strip()
+                    ]
+                    try:
+                        Classificador(novas_regras)
+                    except ValueError as erro:
+                        st.error(f"❌ {erro}")
+                    else:
+                        definir_valor(dados, ['regras_categoria'], novas_regras)
+                        st.rerun()
+            with col2:
+                if st.button("🔄 Aplicar às saídas em \"Outros\"", disabled=not regras):
+                    df_outros = dados['saidas'].como_dataframe(['id', 'categoria', 'descricao', 'valor'])
+                    df_outros = df_outros[df_outros['categoria'].isna() | (df_outros['categoria'] == 'Outros')]
+                    novas = Classificador(regras).classificar(df_outros['descricao'], df_outros['valor'])
+                    alterar = pd.notna(novas) & (novas != 'Outros')
+                    registrar_operacoes(dados, [
+                        {"op": "atualizar", "colecao": "saidas", "id": int(id_saida), "campos": {"categoria": categoria}}
+                        for id_saida, categoria in zip(df_outros['id'][alterar], novas[alterar])
+                    ])
+                    st.session_state.resumo_importacao = {'recategorizadas': int(alterar.sum())}
+                    st.rerun()
+        
+        arquivo_extrato = st.file_uploader("📄 Arquivo do extrato", type=["csv", "txt", "ofx", "qfx"])
+        
+        if arquivo_extrato is not None:
+            mapeamento = None
+            if not arquivo_extrato.name.lower().endswith(('.ofx', '.qfx')):
+                colunas, _ = ler_cabecalho_csv(arquivo_extrato)
+                
+                def coluna_sugerida(*trechos):
+                    for i, coluna in enumerate(colunas):
+                        if any(trecho in coluna.lower() for trecho in trechos):
+                            return i + 1
+                    return 0
+                
+                st.markdown("**🔗 Colunas do arquivo**")
+                opcoes = ["—"] + colunas
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    coluna_data = st.selectbox("📅 Data", opcoes, index=coluna_sugerida("data", "date"))
+                with col2:
+                    coluna_valor = st.selectbox("💵 Valor", opcoes, index=coluna_sugerida("valor", "value", "amount", "quantia"))
+                with col3:
+                    coluna_descricao = st.selectbox("📝 Descrição", opcoes, index=coluna_sugerida("descri", "hist", "memo", "lançamento"))
+                with col4:
+                    coluna_categoria = st.selectbox("📂 Categoria", opcoes, index=coluna_sugerida("categ"))
+                mapeamento = {
+                    campo: coluna for campo, coluna in [
+                        ('data', coluna_data), ('valor', coluna_valor),
+                        ('descricao', coluna_descricao), ('categoria', coluna_categoria)
+                    ] if coluna != "—"
+                }
+            
+            rotulos_destino = {
+                'sinal': "Pelo sinal (positivos são entradas, negativos são saídas)",
+                'saidas': "Tudo em saídas (ex.: fatura de cartão)",
+                'entradas': "Tudo em entradas",
+            }
+            destino = st.radio("🎯 Destino dos lançamentos", DESTINOS, format_func=rotulos_destino.get)
+            
+            if st.button("📥 Importar", type="primary"):
+                try:
+                    with st.spinner("Importando..."):
+                        operacoes, resumo = preparar_importacao(
+                            ler_extrato(arquivo_extrato, arquivo_extrato.name, mapeamento), dados, destino,
+                            classificador=Classificador(regras))
+                        if operacoes:
+                            registrar_operacoes(dados, operacoes)
+                except ValueError as erro:
+                    st.error(f"❌ {erro}")
+                else:
+                    st.session_state.resumo_importacao = resumo
+                    st.rerun()
+        
+        resumo = st.session_state.pop('resumo_importacao', None)
+        if resumo and 'recategorizadas' in resumo:
+            st.success(f"✅ {resumo['recategorizadas']} saídas recategorizadas pelas regras")
+        elif resumo:
+            st.success(
+                f"✅ {resumo.get('entradas', 0)} entradas e {resumo.get('saidas', 0)} saídas importadas "
+                f"de {resumo['lidas']} linhas"
+            )
+            if resumo.get('categorizadas'):
+                st.info(f"🏷️ {resumo['categorizadas']} saídas categorizadas automaticamente pelas regras")
+            if resumo['duplicadas'] or resumo['invalidas']:
+                st.info(f"ℹ️ {resumo['duplicadas']} já registradas e {resumo['invalidas']} inválidas foram ignoradas")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Figuras Plotly das páginas
+Cache de figuras pelo resumo (hash) das entradas e traços limitados para séries longas: a
+série é reduzida por LTTB à largura do gráfico e, acima de LIMITE_WEBGL pontos, o traço vira
+Scattergl (desenhado por WebGL, não SVG)
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from nucleo.amostragem import lttb
+from nucleo.derivados import CacheDerivados
+from nucleo.instrumentacao import span
+
+# ========== CACHE DE FIGURAS ==========
+# Compartilhado pelas sessões do processo; st.plotly_chart copia a figura (to_dict) e não a altera
+FIGURAS = CacheDerivados(limite=64)
+
+def _alimentar(hash_, valor):
+    if isinstance(valor, (pd.Series, pd.DataFrame)):
+        cabecalho = list(valor.columns) if isinstance(valor, pd.DataFrame) else valor.name
+        hash_.update(repr((type(valor).__name__, cabecalho, valor.shape)).encode())
+        hash_.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes())
+    elif isinstance(valor, np.ndarray) and valor.dtype != object:
+        hash_.update(repr((valor.dtype.str, valor.shape)).encode())
+        hash_.update(np.ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, dict):
+        hash_.update(b'{')
+        for chave in sorted(valor, key=repr):
+            _alimentar(hash_, chave)
+            _alimentar(hash_, valor[chave])
+        hash_.update(b'}')
+    elif isinstance(valor, (list, tuple)):
+        hash_.update(b'[')
+        for item in valor:
+            _alimentar(hash_, item)
+        hash_.update(b']')
+    else:
+        hash_.update(repr(valor).encode())
+    hash_.update(b'|')
+
+def resumo(*entradas):
+    """Hash das séries agregadas e opções de um gráfico (DataFrames, arrays, listas, dicts, escalares)"""
+    hash_ = hashlib.blake2b(digest_size=16)
+    for entrada in entradas:
+        _alimentar(hash_, entrada)
+    return hash_.hexdigest()
+
+def figura(nome, construir, *entradas, **opcoes):
+    """`construir(*entradas, **opcoes)` memorizado pelo resumo das entradas e opções de layout
+
+    Num rerun em que as entradas do gráfico não mudaram (outro widget mexido, troca
+    de página e volta) a figura sai pronta do cache, sem passar pelo Plotly de novo.
+    O span `grafico.<nome>` indica acerto ou falha.
+    """
+    with span(f"grafico.{nome}", cache='acerto') as registro:
+        def calcular():
+            if registro is not None:
+                registro.args['cache'] = 'falha'
+            return construir(*entradas, **opcoes)
+        return FIGURAS.obter((nome, resumo(entradas, opcoes)), None, calcular)
+
+# ========== SÉRIES LONGAS ==========
+LARGURA_PX = 1400        # gráfico de largura total no layout "wide": mais de um ponto por pixel não aparece
+LIMITE_WEBGL = 1000      # pontos a partir dos quais o SVG do Scatter fica lento no navegador
+LIMITE_MARCADORES = 300  # acima disso os marcadores viram um borrão sobre a linha
+
+def serie(x, y, largura_px=LARGURA_PX, mode='lines', **opcoes):
+    """go.Scatter (ou go.Scattergl) com no máximo `largura_px` pontos escolhidos por LTTB"""
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) > largura_px:
+        indices = lttb(x, y, largura_px)
+        x, y = x[indices], y[indices]
+    if len(y) > LIMITE_MARCADORES:
+        mode = mode.replace('+markers', '').replace('markers+', '')
+    tipo = go.Scattergl if len(y) > LIMITE_WEBGL else go.Scatter
+    return tipo(x=x, y=y, mode=mode, **opcoes)
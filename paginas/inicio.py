@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 🏠 Início
+Visão geral: métricas do mês, fluxo de caixa, alertas e ações rápidas
+"""
+
+import streamlit as st
+import plotly.graph_objects as go
+from datetime import datetime
+import calendar
+
+from nucleo.derivados import (
+    calcular_entradas_mes, calcular_patrimonio_atual, calcular_proventos_mes_atual, calcular_saidas_mes,
+    calcular_taxa_poupanca,
+)
+from paginas.comum import mostrar_grafico
+from paginas.graficos import figura
+
+def _grafico_visao_geral_mes(entradas_mes, saidas_mes, saldo_mes):
+    """Barras de entradas e saídas do mês com o saldo"""
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        name='Entradas',
+        x=['Fevereiro'],
+        y=[entradas_mes],
+        marker_color='#2ecc71',
+        text=[f'R$ {entradas_mes:,.2f}'],
+        textposition='auto'
+    ))
+
+    fig.add_trace(go.Bar(
+        name='Saídas',
+        x=['Fevereiro'],
+        y=[saidas_mes],
+        marker_color='#e74c3c',
+        text=[f'R$ {saidas_mes:,.2f}'],
+        textposition='auto'
+    ))
+
+    fig.add_trace(go.Scatter(
+        name='Saldo',
+        x=['Fevereiro'],
+        y=[saldo_mes],
+        mode='markers+text',
+        marker=dict(size=20, color='#3498db', symbol='diamond'),
+        text=[f'R$ {saldo_mes:,.2f}'],
+        textposition='top center'
+    ))
+
+    fig.update_layout(
+        barmode='group',
+        height=400,
+        showlegend=True,
+        hovermode='x unified'
+    )
+    return fig
+
+def renderizar(dados, indices):
+    st.markdown('<h1 class="main-header">🏠 Visão Geral da Sua Vida Financeira</h1>', unsafe_allow_html=True)
+    
+    hoje = datetime.now()
+    mes_atual = calendar.month_name[hoje.month]
+    st.markdown(f"**📅 {mes_atual} de {hoje.year}** • Atualizado em {hoje.strftime('%d/%m/%Y às %H:%M')}")
+    
+    # Calcular métricas
+    patrimonio = calcular_patrimonio_atual(dados['carteira'])
+    entradas_mes = calcular_entradas_mes(indices['entradas'])
+    saidas_mes = calcular_saidas_mes(indices['saidas'])
+    saldo_mes = entradas_mes - saidas_mes
+    proventos_mes = calcular_proventos_mes_atual(indices['proventos'])
+    taxa_poupanca = calcular_taxa_poupanca(indices['entradas'], indices['aportes'])
+    
+    # Cards principais - 4 colunas
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="💰 Patrimônio Total",
+            value=f"R$ {patrimonio:,.2f}",
+            help="Valor total de todos os seus investimentos"
+        )
+    
+    with col2:
+        st.metric(
+            label="💸 Saldo do Mês",
+            value=f"R$ {saldo_mes:,.2f}",
+            delta=f"{(saldo_mes/entradas_mes*100):.1f}% da renda" if entradas_mes > 0 else None,
+            help="Entradas - Saídas deste mês"
+        )
+    
+    with col3:
+        st.metric(
+            label="💵 Proventos",
+            value=f"R$ {proventos_mes:,.2f}",
+            delta="Renda Passiva",
+            help="Dividendos recebidos este mês"
+        )
+    
+    with col4:
+        st.metric(
+            label="📊 Taxa de Poupança",
+            value=f"{taxa_poupanca:.1f}%",
+            delta="🎯 Ideal: >20%",
+            help="% da renda que você está investindo"
+        )
+    
+    st.markdown("---")
+    
+    # Seção: Fluxo de Caixa do Mês
+    st.subheader("💸 Fluxo de Caixa de Fevereiro")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("### 🟢 Entradas")
+        st.markdown(f"### R$ {entradas_mes:,.2f}")
+        if dados.get('entradas'):
+            categorias_entrada = indices['entradas'].totais_categoria(hoje.year, hoje.month)
+            
+            for cat, valor in sorted(categorias_entrada.items(), key=lambda x: x[1], reverse=True)[:3]:
+                st.caption(f"• {cat}: R$ {valor:,.2f}")
+    
+    with col2:
+        st.markdown("### 🔴 Saídas")
+        st.markdown(f"### R$ {saidas_mes:,.2f}")
+        if dados.get('saidas'):
+            categorias_saida = indices['saidas'].totais_categoria(hoje.year, hoje.month)
+            
+            for cat, valor in sorted(categorias_saida.items(), key=lambda x: x[1], reverse=True)[:3]:
+                st.caption(f"• {cat}: R$ {valor:,.2f}")
+    
+    with col3:
+        st.markdown("### 💰 Saldo")
+        cor_saldo = "🟢" if saldo_mes > 0 else "🔴"
+        st.markdown(f"### {cor_saldo} R$ {saldo_mes:,.2f}")
+        if saldo_mes > 0:
+            st.success("🎉 Parabéns! Mês positivo!")
+        elif saldo_mes < 0:
+            st.warning("⚠️ Atenção ao déficit!")
+        else:
+            st.info("⚖️ Saldo equilibrado")
+    
+    # Gráfico de entradas vs saídas
+    if dados.get('entradas') or dados.get('saidas'):
+        st.markdown("---")
+        st.subheader("📊 Visão Geral do Mês")
+        
+        fig = figura("visao_geral_mes", _grafico_visao_geral_mes, entradas_mes, saidas_mes, saldo_mes)
+        
+        mostrar_grafico(fig, use_container_width=True)
+    
+    # Mensagens motivacionais
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 🎯 Suas Conquistas")
+        if patrimonio > 0:
+            st.success(f"✅ Você já acumulou R$ {patrimonio:,.2f} em investimentos!")
+        if proventos_mes > 0:
+            st.success(f"✅ Recebeu R$ {proventos_mes:,.2f} de renda passiva este mês!")
+        if taxa_poupanca >= 20:
+            st.success(f"✅ Taxa de poupança de {taxa_poupanca:.1f}% - Excelente!")
+        if saldo_mes > 0:
+            st.success(f"✅ Saldo positivo de R$ {saldo_mes:,.2f} no mês!")
+        
+        if patrimonio == 0 and proventos_mes == 0:
+            st.info("💡 Comece adicionando seus ativos em 'Carteira'!")
+    
+    with col2:
+        st.markdown("### 💡 Dicas Personalizadas")
+        if taxa_poupanca < 20:
+            st.warning(f"💪 Sua taxa de poupança está em {taxa_poupanca:.1f}%. Tente aumentar para 20%!")
+        if saldo_mes < 0:
+            st.warning("💰 Revise seus gastos em 'Despesas' para equilibrar as contas.")
+        if len(dados['carteira']) < 3:
+            st.info("📊 Diversifique! Considere ter pelo menos 3 ativos diferentes.")
+        if not dados.get('metas', {}).get('patrimonio_anual'):
+            st.info("🎯 Defina suas metas em 'Metas' para acompanhar seu progresso!")
+    
+    # Quick Actions
+    st.markdown("---")
+    st.subheader("⚡ Ações Rápidas")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if st.button("💸 Adicionar Entrada", use_container_width=True):
+            pass
+    with col2:
+        if st.button("💼 Ver Carteira", use_container_width=True):
+            pass
+    with col3:
+        if st.button("📊 Ver Relatórios", use_container_width=True):
+            pass
+    with col4:
+        if st.button("🎯 Minhas Metas", use_container_width=True):
+            pass
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 🎯 Metas
+Metas de patrimônio e renda, acompanhamento e planejamento
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime
+
+from nucleo.derivados import (
+    calcular_patrimonio_atual, calcular_proventos_mes_atual, ordenado_por_data, ordenado_por_id,
+)
+from nucleo.projecoes import (
+    MESES_MAXIMOS, RENDIMENTO_PASSIVO_ANUAL, aporte_necessario, formatar_prazo, meses_necessarios,
+    rentabilidade_necessaria,
+)
+from paginas.comum import definir_valores
+
+def renderizar(dados, indices):
+    st.markdown('<h1 class="main-header">🎯 Minhas Metas de Investimento</h1>', unsafe_allow_html=True)
+    
+    # Configurar metas
+    st.subheader("⚙️ Definir Metas")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        meta_patrimonio = st.number_input(
+            f"💰 Meta de Patrimônio para {datetime.now().year} (R$)",
+            min_value=0.0,
+            value=float(dados['metas'].get('patrimonio_anual', 0.0)),
+            format="%.2f"
+        )
+    
+    with col2:
+        meta_renda = st.number_input(
+            "💵 Meta de Renda Passiva Mensal (R$)",
+            min_value=0.0,
+            value=float(dados['metas'].get('renda_passiva_mensal', 0.0)),
+            format="%.2f"
+        )
+    
+    with col3:
+        meta_economia = st.number_input(
+            "🐷 Meta de Economia Mensal (R$)",
+            min_value=0.0,
+            value=float(dados['metas'].get('economia_mensal', 0.0)),
+            format="%.2f",
+            help="Quanto você pretende aportar por mês; usado no planejamento abaixo"
+        )
+    
+    if st.button("💾 Salvar Metas"):
+        definir_valores(dados, [
+            (['metas', 'patrimonio_anual'], meta_patrimonio),
+            (['metas', 'renda_passiva_mensal'], meta_renda),
+            (['metas', 'economia_mensal'], meta_economia),
+        ])
+        st.success("✅ Metas atualizadas!")
+    
+    # Acompanhamento
+    st.markdown("---")
+    st.subheader("📊 Acompanhamento das Metas")
+    
+    patrimonio_atual = calcular_patrimonio_atual(dados['carteira'])
+    proventos_mes = calcular_proventos_mes_atual(indices['proventos'])
+    
+    # Meta de Patrimônio
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 💰 Meta de Patrimônio")
+        if meta_patrimonio > 0:
+            progresso_patrimonio = (patrimonio_atual / meta_patrimonio * 100)
+            st.progress(min(progresso_patrimonio / 100, 1.0))
+            st.metric("Progresso", f"{progresso_patrimonio:.1f}%")
+            st.metric("Falta", f"R$ {max(0, meta_patrimonio - patrimonio_atual):,.2f}")
+        else:
+            st.info("📌 Defina sua meta acima!")
+    
+    with col2:
+        st.markdown("### 💵 Meta de Renda Passiva")
+        if meta_renda > 0:
+            progresso_renda = (proventos_mes / meta_renda * 100)
+            st.progress(min(progresso_renda / 100, 1.0))
+            st.metric("Progresso", f"{progresso_renda:.1f}%")
+            st.metric("Falta", f"R$ {max(0, meta_renda - proventos_mes):,.2f}")
+        else:
+            st.info("📌 Defina sua meta acima!")
+    
+    # Projeções
+    st.markdown("---")
+    st.subheader("🔮 Projeções")
+    
+    if patrimonio_atual > 0 and len(dados['historico_patrimonio']) > 1:
+        df_hist = ordenado_por_data(dados['historico_patrimonio'])
+        
+        dias_passados = (df_hist.iloc[-1]['data'] - df_hist.iloc[0]['data']).days
+        if dias_passados > 0:
+            crescimento_dia = (df_hist.iloc[-1]['valor'] - df_hist.iloc[0]['valor']) / dias_passados
+            projecao_12m = patrimonio_atual + (crescimento_dia * 365)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.metric("📈 Projeção em 12 meses", f"R$ {projecao_12m:,.2f}")
+            
+            with col2:
+                total_prov_ano = dados['proventos'].somar('valor')
+                projecao_prov = (total_prov_ano / datetime.now().month) * 12 if datetime.now().month > 0 else 0
+                st.metric("💵 Projeção de Proventos/Ano", f"R$ {projecao_prov:,.2f}")
+    
+    # Planejamento (fórmulas de anuidade sobre grades de cenários)
+    st.markdown("---")
+    st.subheader("🧮 Planejamento das Metas")
+    
+    aportes_recentes = ordenado_por_id(dados['aportes'])['valor'].iloc[-3:]
+    aporte_base = meta_economia or (float(aportes_recentes.mean()) if len(aportes_recentes) else 0.0)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        rentabilidade_plano = st.slider(
+            "📈 Rentabilidade anual esperada (%)",
+            min_value=0.0,
+            max_value=30.0,
+            value=12.0,
+            step=0.5,
+            key="rentabilidade_plano"
+        )
+    with col2:
+        anos_renda = st.slider(
+            "⏳ Prazo para a meta de renda passiva (anos)",
+            min_value=1,
+            max_value=MESES_MAXIMOS // 12,
+            value=10
+        )
+    st.caption(
+        f"Aporte considerado: R$ {aporte_base:,.2f}/mês "
+        f"({'meta de economia' if meta_economia else 'média dos últimos aportes'}). "
+        f"A renda passiva supõe {RENDIMENTO_PASSIVO_ANUAL:.0f}% a.a. sobre o patrimônio."
+    )
+    
+    # Cada meta vira um valor alvo de patrimônio com um prazo em meses
+    planos = []
+    if meta_patrimonio > 0:
+        planos.append(("💰 Patrimônio", meta_patrimonio, 13 - datetime.now().month))
+    if meta_renda > 0:
+        planos.append(("💵 Renda passiva", meta_renda * 12 / (RENDIMENTO_PASSIVO_ANUAL / 100), anos_renda * 12))
+    
+    if planos:
+        nomes = [nome for nome, _, _ in planos]
+        alvos = np.array([alvo for _, alvo, _ in planos])
+        prazos = np.array([prazo for _, _, prazo in planos])
+        
+        # Uma chamada por grandeza para todas as metas de uma vez
+        aportes_necessarios = aporte_necessario(alvos, patrimonio_atual, rentabilidade_plano, prazos)
+        tempos = meses_necessarios(alvos, patrimonio_atual, aporte_base, rentabilidade_plano)
+        rentabilidades = rentabilidade_necessaria(alvos, patrimonio_atual, aporte_base, prazos)
+        
+        df_plano = pd.DataFrame({
+            'Meta': nomes,
+            'Patrimônio alvo': [f"R$ {alvo:,.2f}" for alvo in alvos],
+            'Prazo': [formatar_prazo(prazo) for prazo in prazos],
+            'Aporte mensal necessário': [f"R$ {valor:,.2f}" for valor in aportes_necessarios],
+            'Tempo com o aporte atual': [formatar_prazo(tempo) for tempo in tempos],
+            'Rentabilidade necessária': [
+                "Já atingida" if alvo <= patrimonio_atual else
+                f"{taxa:.1f}% a.a." if np.isfinite(taxa) else "Inalcançável"
+                for alvo, taxa in zip(alvos, rentabilidades)
+            ],
+        })
+        st.dataframe(df_plano, use_container_width=True, hide_index=True)
+        
+        # Grades de cenários para a meta escolhida
+        st.markdown("#### 🔢 Cenários")
+        escolhida = st.selectbox("Meta", nomes)
+        alvo = alvos[nomes.index(escolhida)]
+        
+        grade_rentabilidades = np.array([4.0, 6.0, 8.0, 10.0, 12.0, 15.0])
+        grade_aportes = np.array([0.5, 1.0, 1.5, 2.0, 3.0]) * (aporte_base or 500.0)
+        grade_anos = np.array([1, 3, 5, 10, 20, 30])
+        rotulos_rent = [f"{r:.0f}% a.a." for r in grade_rentabilidades]
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**⏱️ Tempo até a meta** (rentabilidade × aporte)")
+            tempos = meses_necessarios(alvo, patrimonio_atual, grade_aportes[None, :], grade_rentabilidades[:, None])
+            st.dataframe(
+                pd.DataFrame(
+                    [[formatar_prazo(t) for t in linha] for linha in tempos],
+                    index=rotulos_rent,
+                    columns=[f"R$ {a:,.0f}" for a in grade_aportes]
+                ),
+                use_container_width=True
+            )
+        
+        with col2:
+            st.markdown("**💸 Aporte mensal necessário** (rentabilidade × prazo)")
+            aportes_grade = aporte_necessario(alvo, patrimonio_atual, grade_rentabilidades[:, None], grade_anos[None, :] * 12)
+            st.dataframe(
+                pd.DataFrame(
+                    aportes_grade,
+                    index=rotulos_rent,
+                    columns=[f"{anos} ano{'s' if anos > 1 else ''}" for anos in grade_anos]
+                ).style.format("R$ {:,.2f}"),
+                use_container_width=True
+            )
+    else:
+        st.info("📌 Defina uma meta de patrimônio ou de renda passiva para ver o planejamento!")
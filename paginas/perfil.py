@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página ⚙️ Perfil
+Dados pessoais, estatísticas, exportação e importação
+"""
+
+import streamlit as st
+from datetime import datetime
+import io
+import json
+
+from nucleo.armazenamento import para_data, para_json
+from sistema_investimentos import criar_sistema_investimentos
+from paginas.comum import TAMANHOS_PAGINA, salvar_dados, definir_valores
+
+def renderizar(dados, indices):
+    itens_por_pagina = dados['perfil'].get('itens_por_pagina', 20)
+
+    st.markdown('<h1 class="main-header">⚙️ Configurações e Perfil</h1>', unsafe_allow_html=True)
+    
+    st.subheader("👤 Seus Dados")
+    
+    with st.form("form_perfil"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            nome = st.text_input(
+                "📝 Nome",
+                value=dados.get('perfil', {}).get('nome', ''),
+                placeholder="Seu nome"
+            )
+            renda_mensal = st.number_input(
+                "💰 Renda Mensal Média (R$)",
+                min_value=0.0,
+                value=float(dados.get('perfil', {}).get('renda_mensal', 0)),
+                format="%.2f"
+            )
+        
+        with col2:
+            data_inicio = st.date_input(
+                "📅 Data de Início do Controle",
+                value=dados.get('perfil', {}).get('data_inicio') or datetime.now()
+            )
+            novo_itens_por_pagina = st.selectbox(
+                "📄 Itens por página nas listas",
+                TAMANHOS_PAGINA,
+                index=TAMANHOS_PAGINA.index(itens_por_pagina) if itens_por_pagina in TAMANHOS_PAGINA else 1
+            )
+        
+        submitted = st.form_submit_button("💾 Salvar Perfil")
+        
+        if submitted:
+            definir_valores(dados, [
+                (['perfil', 'nome'], nome),
+                (['perfil', 'renda_mensal'], renda_mensal),
+                (['perfil', 'data_inicio'], para_data(data_inicio)),
+                (['perfil', 'itens_por_pagina'], novo_itens_por_pagina),
+            ])
+            st.success("✅ Perfil atualizado!")
+            st.rerun()
+    
+    st.markdown("---")
+    st.subheader("📊 Estatísticas da Sua Jornada")
+    
+    if dados.get('perfil', {}).get('data_inicio'):
+        data_inicio = dados['perfil']['data_inicio']
+        dias_usando = (datetime.now() - data_inicio).days
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("📅 Dias no Sistema", f"{dias_usando}")
+        
+        with col2:
+            st.metric("💼 Ativos na Carteira", f"{len(dados['carteira'])}")
+        
+        with col3:
+            st.metric("💰 Proventos Recebidos", f"{len(dados['proventos'])}")
+        
+        with col4:
+            st.metric("📅 Aportes Realizados", f"{len(dados['aportes'])}")
+    
+    st.markdown("---")
+    st.subheader("⚙️ Configurações Avançadas")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📁 Gerenciamento de Dados")
+        
+        if st.button("📥 Exportar Dados (JSON)", use_container_width=True):
+            st.download_button(
+                label="💾 Download JSON",
+                data=para_json(dados, indent=2),
+                file_name=f"backup_investimentos_{datetime.now().strftime('%Y%m%d')}.json",
+                mime="application/json"
+            )
+        
+        valores_calculados = st.checkbox(
+            "Planilha com valores já calculados",
+            help="Totais e indicadores saem como números, sem fórmulas: abre pronta em qualquer leitor"
+        )
+        if st.button("📊 Exportar Planilha (Excel)", use_container_width=True):
+            planilha = io.BytesIO()
+            criar_sistema_investimentos(planilha, dados, verboso=False, precalculado=valores_calculados)
+            st.download_button(
+                label="💾 Download Planilha",
+                data=planilha.getvalue(),
+                file_name=f"Sistema_Investimentos_{datetime.now().strftime('%Y%m%d')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+        
+        arquivo_importado = st.file_uploader("📤 Importar Dados (JSON)", type="json")
+        if arquivo_importado is not None:
+            if st.button("✅ Confirmar Importação", use_container_width=True):
+                salvar_dados(json.load(arquivo_importado))
+                st.success("✅ Dados importados!")
+                st.rerun()
+        
+        st.markdown("---")
+        
+        if st.button("🗑️ Limpar Todos os Dados", use_container_width=True, type="secondary"):
+            if st.checkbox("⚠️ Confirmo que quero apagar TUDO"):
+                dados = {
+                    "carteira": [],
+                    "proventos": [],
+                    "aportes": [],
+                    "historico_patrimonio": [],
+                    "entradas": [],
+                    "saidas": [],
+                    "despesas_fixas": [],
+                    "metas": {},
+                    "cdi_anual": 0,
+                    "perfil": {}
+                }
+                salvar_dados(dados)
+                st.success("✅ Dados limpos! Recarregue a página.")
+    
+    with col2:
+        st.markdown("#### ℹ️ Sobre o Sistema")
+        st.info("""
+        **Sistema Financeiro Completo v2.0**
+        
+        Criado para ajudar você a:
+        - 💸 Controlar entradas e saídas
+        - 💼 Gerenciar investimentos
+        - 📊 Analisar performance
+        - 🎯 Alcançar suas metas
+        - 🔮 Projetar seu futuro financeiro
+        
+        **Desenvolvido com:**
+        - Python 3.14
+        - Streamlit
+        - Plotly
+        
+        Seus dados são salvos localmente.
+        """)
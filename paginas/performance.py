@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 📈 Performance
+Evolução do patrimônio, rentabilidade real (TWR e XIRR) e configurações de benchmark
+"""
+
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from datetime import datetime
+
+from nucleo.armazenamento import para_data
+from nucleo.derivados import calcular_patrimonio_atual, ordenado_por_data
+from nucleo.retornos import retornos_carteira, retornos_por_ativo
+from paginas.comum import adicionar_registro, definir_valor, mostrar_grafico
+from paginas.graficos import figura, serie
+
+def _grafico_evolucao_patrimonial(df_hist):
+    """Linha do patrimônio registrado ao longo do tempo"""
+    fig = go.Figure()
+
+    # Anos de registros diários: a série é reduzida à largura do gráfico (LTTB)
+    fig.add_trace(serie(
+        df_hist['data'],
+        df_hist['valor'],
+        mode='lines+markers',
+        name='Patrimônio',
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=8)
+    ))
+
+    fig.update_layout(
+        title='Evolução Patrimonial',
+        xaxis_title='Data',
+        yaxis_title='Patrimônio (R$)',
+        hovermode='x unified',
+        height=500
+    )
+    return fig
+
+def renderizar(dados, indices):
+    st.markdown('<h1 class="main-header">📈 Acompanhamento de Performance</h1>', unsafe_allow_html=True)
+    
+    # Configurar CDI
+    st.subheader("⚙️ Configurações")
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        cdi = st.number_input("📊 CDI Acumulado em 2026 (%)", 
+                             min_value=0.0, 
+                             value=float(dados.get('cdi_anual', 0.0)), 
+                             format="%.2f")
+    
+    with col2:
+        if st.button("💾 Salvar CDI"):
+            definir_valor(dados, ['cdi_anual'], cdi)
+            st.success("✅ CDI atualizado!")
+    
+    # Adicionar registro de patrimônio
+    st.markdown("---")
+    with st.expander("➕ Registrar Patrimônio do Mês", expanded=False):
+        with st.form("form_patrimonio"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                data_registro = st.date_input("📅 Data", value=datetime.now())
+            
+            with col2:
+                valor_patrimonio = st.number_input(
+                    "💰 Patrimônio Total (R$)", 
+                    min_value=0.01, 
+                    value=max(calcular_patrimonio_atual(dados['carteira']), 0.01),
+                    format="%.2f"
+                )
+            
+            submitted = st.form_submit_button("✅ Registrar")
+            
+            if submitted:
+                novo_registro = {
+                    "data": para_data(data_registro),
+                    "valor": valor_patrimonio
+                }
+                adicionar_registro(dados, 'historico_patrimonio', novo_registro)
+                st.success("✅ Patrimônio registrado!")
+                st.rerun()
+    
+    # Gráfico de evolução
+    st.markdown("---")
+    if dados['historico_patrimonio']:
+        df_hist = ordenado_por_data(dados['historico_patrimonio'])
+        
+        fig = figura("evolucao_patrimonial", _grafico_evolucao_patrimonial, df_hist[['data', 'valor']])
+        
+        mostrar_grafico(fig, use_container_width=True)
+        
+        # Estatísticas
+        col1, col2, col3 = st.columns(3)
+        
+        patrimonio_inicial = df_hist.iloc[0]['valor']
+        patrimonio_atual = df_hist.iloc[-1]['valor']
+        crescimento = ((patrimonio_atual - patrimonio_inicial) / patrimonio_inicial * 100)
+        
+        with col1:
+            st.metric("🏁 Patrimônio Inicial", f"R$ {patrimonio_inicial:,.2f}")
+        
+        with col2:
+            st.metric("📊 Patrimônio Atual", f"R$ {patrimonio_atual:,.2f}")
+        
+        with col3:
+            st.metric("📈 Crescimento", f"{crescimento:+.2f}%")
+    else:
+        st.info("📌 Registre o patrimônio mensalmente para acompanhar sua evolução!")
+    
+    # Rentabilidade considerando quando cada aporte entrou
+    if dados['carteira']:
+        st.markdown("---")
+        st.subheader("📐 Rentabilidade Real")
+        hoje = datetime.now().date()
+        retorno = retornos_carteira(dados['carteira'], dados['aportes'], dados['proventos'],
+                                    dados['historico_patrimonio'], hoje)
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("💸 XIRR (a.a.)", f"{retorno['xirr_%']:+.2f}%" if np.isfinite(retorno['xirr_%']) else "—",
+                      help="Taxa interna de retorno dos seus aportes, proventos e do valor atual da carteira: "
+                           "pesa cada real pelo tempo que ficou investido")
+        
+        with col2:
+            st.metric("⏱️ TWR acumulada", f"{retorno['twr_%']:+.2f}%" if np.isfinite(retorno['twr_%']) else "—",
+                      help="Retorno entre os registros de patrimônio descontando os aportes: "
+                           "mede a gestão, não o momento dos aportes")
+        
+        with col3:
+            st.metric("📅 TWR (a.a.)", f"{retorno['twr_anual_%']:+.2f}%" if np.isfinite(retorno['twr_anual_%']) else "—",
+                      help="Só com pelo menos um ano de registros de patrimônio")
+        
+        with st.expander("📊 Rentabilidade por Ativo"):
+            df_ret = retornos_por_ativo(dados['carteira'], dados['aportes'], dados['proventos'], hoje)
+            st.dataframe(
+                df_ret.sort_values('xirr_%', ascending=False),
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    'codigo': st.column_config.TextColumn("Ativo"),
+                    'aportado': st.column_config.NumberColumn("Aportado", format="R$ %.2f"),
+                    'proventos': st.column_config.NumberColumn("Proventos", format="R$ %.2f"),
+                    'valor_atual': st.column_config.NumberColumn("Valor Atual", format="R$ %.2f"),
+                    'twr_%': st.column_config.NumberColumn("TWR", format="%+.2f%%"),
+                    'twr_anual_%': st.column_config.NumberColumn("TWR a.a.", format="%+.2f%%"),
+                    'xirr_%': st.column_config.NumberColumn("XIRR a.a.", format="%+.2f%%"),
+                    'desde': st.column_config.DateColumn("Desde", format="DD/MM/YYYY"),
+                },
+            )
+            st.caption("Posições sem aportes registrados entram como compra ao preço médio na data de inclusão; "
+                       "a TWR por ativo usa o preço de cada aporte e a cotação atual.")
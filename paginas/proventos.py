@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 💰 Proventos
+Registro e histórico de proventos, totais por mês
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+
+from nucleo.armazenamento import para_data
+from nucleo.derivados import calcular_proventos_mes_atual, ordenado_por_data
+from paginas.comum import (
+    MODOS_EXIBICAO, adicionar_registro, remover_registro, consultar, paginar, editar_em_tabela, mostrar_grafico,
+)
+from paginas.graficos import figura
+
+def _grafico_proventos_mes(proventos_mes):
+    """Barras dos proventos recebidos por mês"""
+    return px.bar(
+        proventos_mes,
+        x='mes',
+        y='valor',
+        title='Evolução Mensal de Proventos',
+        labels={'mes': 'Mês', 'valor': 'Valor (R$)'},
+        color='valor',
+        color_continuous_scale='Greens'
+    )
+
+def renderizar(dados, indices):
+    itens_por_pagina = dados['perfil'].get('itens_por_pagina', 20)
+
+    st.markdown('<h1 class="main-header">💰 Controle de Proventos</h1>', unsafe_allow_html=True)
+    
+    # Formulário para adicionar provento
+    with st.expander("➕ Registrar Novo Provento", expanded=False):
+        with st.form("form_provento"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                data_prov = st.date_input("📅 Data do Recebimento", value=datetime.now())
+                ativo = st.text_input("🏢 Código do Ativo", placeholder="Ex: MXRF11")
+                tipo_prov = st.selectbox("📂 Tipo", ["Dividendo", "JCP", "Rendimento", "Juros"])
+            
+            with col2:
+                valor = st.number_input("💵 Valor Recebido (R$)", min_value=0.01, value=1.00, format="%.2f")
+            
+            submitted = st.form_submit_button("✅ Registrar Provento")
+            
+            if submitted:
+                if ativo.strip():
+                    novo_prov = {
+                        "data": para_data(data_prov),
+                        "ativo": ativo.upper().strip(),
+                        "tipo": tipo_prov,
+                        "valor": valor
+                    }
+                    adicionar_registro(dados, 'proventos', novo_prov)
+                    st.success(f"✅ Provento de {ativo.upper()} registrado!")
+                    st.rerun()
+                else:
+                    st.error("❌ Por favor, preencha o código do ativo.")
+    
+    # Resumo de proventos
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+    
+    total_mes = calcular_proventos_mes_atual(indices['proventos'])
+    total_ano = dados['proventos'].somar('valor')
+    media_mensal = total_ano / datetime.now().month if datetime.now().month > 0 else 0
+    
+    with col1:
+        st.metric("💵 Recebido este Mês", f"R$ {total_mes:,.2f}")
+    
+    with col2:
+        st.metric("📊 Média Mensal", f"R$ {media_mensal:,.2f}")
+    
+    with col3:
+        st.metric("🎯 Projeção Anual", f"R$ {media_mensal * 12:,.2f}")
+    
+    # Histórico de proventos
+    st.markdown("---")
+    st.subheader("📋 Histórico de Proventos")
+    
+    if dados['proventos']:
+        df_prov = ordenado_por_data(dados['proventos'], True)
+        
+        modo = st.radio("Modo de exibição:", MODOS_EXIBICAO, horizontal=True, key="modo_proventos")
+        inicio, fim = paginar(len(df_prov), "pag_proventos", itens_por_pagina)
+        df_pagina = df_prov.iloc[inicio:fim]
+        
+        if modo == "📝 Tabela editável":
+            editar_em_tabela(
+                dados, 'proventos', df_pagina, ['data', 'ativo', 'tipo', 'valor'],
+                {
+                    "data": st.column_config.DateColumn("Data", format="DD/MM/YYYY", required=True),
+                    "ativo": st.column_config.TextColumn("Ativo", required=True),
+                    "tipo": st.column_config.SelectboxColumn("Tipo", options=["Dividendo", "JCP", "Rendimento", "Juros"]),
+                    "valor": st.column_config.NumberColumn("Valor", min_value=0.01, format="R$ %.2f", required=True),
+                }
+            )
+        else:
+            for provento in df_pagina.to_dict('records'):
+                col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 2, 1])
+            
+                with col1:
+                    st.write(f"**{provento['data'].strftime('%d/%m/%Y')}**")
+                with col2:
+                    st.write(provento['ativo'])
+                with col3:
+                    st.write(provento['tipo'])
+                with col4:
+                    st.write(f"R$ {provento['valor']:.2f}")
+                with col5:
+                    if st.button("🗑️", key=f"del_prov_{provento['id']}", help="Remover provento"):
+                        remover_registro(dados, 'proventos', provento['id'])
+                        st.success(f"✅ Provento de {provento['ativo']} removido!")
+                        st.rerun()
+            
+                st.markdown("---")
+        
+        # Gráfico de proventos por mês
+        st.markdown("---")
+        st.subheader("📊 Proventos por Mês")
+        
+        totais_mes = consultar(dados, 'somar_por_mes', 'proventos')
+        proventos_mes = pd.DataFrame({'mes': list(totais_mes.keys()), 'valor': list(totais_mes.values())})
+        
+        fig = figura("proventos_mes", _grafico_proventos_mes, proventos_mes)
+        mostrar_grafico(fig, use_container_width=True)
+    else:
+        st.info("📌 Nenhum provento registrado ainda. Use o formulário acima!")
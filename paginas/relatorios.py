@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Página 📊 Relatórios
+Análises da carteira, finanças pessoais, projeções e comparativos
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.express as px
+from datetime import datetime
+
+from nucleo.derivados import (
+    calcular_entradas_mes, calcular_patrimonio_atual, calcular_proventos_mes_atual,
+    calcular_rentabilidade_total, calcular_saidas_mes, calcular_taxa_poupanca, calcular_total_investido,
+    carteira_detalhada, ordenado_por_data, ordenado_por_id,
+)
+from nucleo.projecoes import MESES_MAXIMOS, RENDIMENTO_PASSIVO_ANUAL, meses_ate, simular_patrimonio
+from paginas.comum import mostrar_grafico
+from paginas.graficos import figura
+
+def _grafico_composicao_carteira(df_cart):
+    """Pizza do patrimônio atual por ativo"""
+    return px.pie(
+        df_cart,
+        values='atual',
+        names='codigo',
+        title='Distribuição do Patrimônio',
+        color_discrete_sequence=px.colors.sequential.Viridis
+    )
+
+def _grafico_gastos_categoria_mes(gastos_cat):
+    """Barras horizontais dos gastos do mês por categoria"""
+    return px.bar(
+        x=gastos_cat.values,
+        y=gastos_cat.index,
+        orientation='h',
+        title='Gastos por Categoria este Mês',
+        labels={'x': 'Valor (R$)', 'y': 'Categoria'},
+        color=gastos_cat.values,
+        color_continuous_scale='Reds'
+    )
+
+def _grafico_projecao_patrimonio(meses, pessimista, mediana, otimista, patrimonio):
+    """Faixa P5–P95 e mediana da projeção, com o patrimônio atual"""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=meses,
+        y=otimista,
+        mode='lines',
+        name='Otimista (P95)',
+        line=dict(color='rgba(52, 152, 219, 0.5)', width=1)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=meses,
+        y=pessimista,
+        mode='lines',
+        name='Pessimista (P5)',
+        line=dict(color='rgba(52, 152, 219, 0.5)', width=1),
+        fill='tonexty',
+        fillcolor='rgba(52, 152, 219, 0.2)'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=meses,
+        y=mediana,
+        mode='lines',
+        name='Mediana (P50)',
+        line=dict(color='#3498db', width=3)
+    ))
+
+    # Linha atual
+    fig.add_hline(
+        y=patrimonio,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Atual: R$ {patrimonio:,.2f}"
+    )
+
+    fig.update_layout(
+        xaxis_title="Meses no Futuro",
+        yaxis_title="Patrimônio (R$)",
+        height=500,
+        hovermode='x unified'
+    )
+    return fig
+
+def renderizar(dados, indices):
+    st.markdown('<h1 class="main-header">📊 Relatórios e Análises Detalhadas</h1>', unsafe_allow_html=True)
+    
+    st.info("💡 **Insights completos sobre sua saúde financeira e projeções futuras**")
+    
+    # Calcular todas as métricas
+    patrimonio = calcular_patrimonio_atual(dados['carteira'])
+    rentabilidade = calcular_rentabilidade_total(dados['carteira'])
+    entradas_mes = calcular_entradas_mes(indices['entradas'])
+    saidas_mes = calcular_saidas_mes(indices['saidas'])
+    proventos_mes = calcular_proventos_mes_atual(indices['proventos'])
+    taxa_poupanca = calcular_taxa_poupanca(indices['entradas'], indices['aportes'])
+    
+    # Tabs de relatórios
+    tab1, tab2, tab3, tab4 = st.tabs(["📈 Investimentos", "💰 Finanças Pessoais", "🔮 Projeções", "📊 Comparativos"])
+    
+    # ===== TAB INVESTIMENTOS =====
+    with tab1:
+        st.subheader("📊 Análise da Carteira")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Patrimônio", f"R$ {patrimonio:,.2f}")
+        with col2:
+            st.metric("Rentabilidade", f"{rentabilidade:.2f}%")
+        with col3:
+            total_investido = calcular_total_investido(dados['carteira'])
+            st.metric("Total Investido", f"R$ {total_investido:,.2f}")
+        with col4:
+            lucro = patrimonio - total_investido
+            st.metric("Lucro/Prejuízo", f"R$ {lucro:,.2f}", delta=f"{rentabilidade:+.2f}%")
+        
+        if dados['carteira']:
+            st.markdown("---")
+            st.markdown("#### 🏆 Performance por Ativo")
+            
+            df_cart = carteira_detalhada(dados['carteira'])
+            
+            # Ordenar por rentabilidade
+            df_cart = df_cart.sort_values('rent_%', ascending=False)
+            
+            for _, ativo in df_cart.iterrows():
+                col1, col2, col3, col4 = st.columns([2, 2, 2, 2])
+                
+                with col1:
+                    emoji = "🟢" if ativo['rent_%'] > 0 else "🔴" if ativo['rent_%'] < 0 else "⚪"
+                    st.markdown(f"{emoji} **{ativo['codigo']}** • {ativo['tipo']}")
+                
+                with col2:
+                    st.caption(f"Investido: R$ {ativo['investido']:,.2f}")
+                
+                with col3:
+                    st.caption(f"Atual: R$ {ativo['atual']:,.2f}")
+                
+                with col4:
+                    cor = "green" if ativo['rent_%'] > 0 else "red" if ativo['rent_%'] < 0 else "gray"
+                    st.markdown(f":{cor}[{ativo['rent_%']:+.2f}%]")
+                
+                # Barra de progresso
+                progress = min(max((ativo['rent_%'] + 20) / 40, 0), 1)  # Normalizar para 0-1
+                st.progress(progress)
+                st.markdown("---")
+            
+            # Gráfico de composição
+            st.markdown("#### 📊 Composição da Carteira")
+            fig = figura("composicao_carteira", _grafico_composicao_carteira, df_cart[['codigo', 'atual']])
+            mostrar_grafico(fig, use_container_width=True)
+        else:
+            st.warning("⚠️ Adicione ativos na aba 'Carteira' para ver análises detalhadas!")
+    
+    # ===== TAB FINANÇAS PESSOAIS =====
+    with tab2:
+        st.subheader("💰 Análise Financeira Pessoal")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Entradas", f"R$ {entradas_mes:,.2f}")
+        with col2:
+            st.metric("Saídas", f"R$ {saidas_mes:,.2f}")
+        with col3:
+            saldo = entradas_mes - saidas_mes
+            st.metric("Saldo", f"R$ {saldo:,.2f}")
+        with col4:
+            st.metric("Taxa Poupança", f"{taxa_poupanca:.1f}%")
+        
+        st.markdown("---")
+        
+        # Saúde Financeira
+        st.markdown("#### 🏥 Indicadores de Saúde Financeira")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**📊 Taxa de Poupança**")
+            if taxa_poupanca >= 30:
+                st.success(f"✅ Excelente! {taxa_poupanca:.1f}% (Ideal: >30%)")
+            elif taxa_poupanca >= 20:
+                st.info(f"👍 Bom! {taxa_poupanca:.1f}% (Ideal: >30%)")
+            elif taxa_poupanca >= 10:
+                st.warning(f"⚠️ Pode melhorar! {taxa_poupanca:.1f}% (Ideal: >30%)")
+            else:
+                st.error(f"❌ Atenção! {taxa_poupanca:.1f}% (Ideal: >30%)")
+            
+            st.markdown("**💰 Índice de Liquidez**")
+            liquidez = (patrimonio / saidas_mes) if saidas_mes > 0 else 0
+            if liquidez >= 6:
+                st.success(f"✅ Excelente! {liquidez:.1f} meses de reserva")
+            elif liquidez >= 3:
+                st.info(f"👍 Bom! {liquidez:.1f} meses de reserva")
+            else:
+                st.warning(f"⚠️ Aumente sua reserva! {liquidez:.1f} meses")
+        
+        with col2:
+            st.markdown("**📈 Crescimento Patrimonial**")
+            if len(dados['historico_patrimonio']) >= 2:
+                hist = ordenado_por_data(dados['historico_patrimonio'])['valor']
+                crescimento_mensal = ((hist.iloc[-1] - hist.iloc[0]) / hist.iloc[0] * 100)
+                if crescimento_mensal > 5:
+                    st.success(f"✅ Ótimo ritmo! {crescimento_mensal:+.1f}%")
+                elif crescimento_mensal > 0:
+                    st.info(f"👍 Crescendo! {crescimento_mensal:+.1f}%")
+                else:
+                    st.warning(f"⚠️ Patrimônio estagnado ou caindo")
+            else:
+                st.info("📌 Registre seu patrimônio em 'Performance' para acompanhar")
+            
+            st.markdown("**💸 Renda Passiva**")
+            percentual_renda_passiva = (proventos_mes / entradas_mes * 100) if entradas_mes > 0 else 0
+            if percentual_renda_passiva >= 10:
+                st.success(f"✅ Excelente! {percentual_renda_passiva:.1f}% da renda")
+            elif percentual_renda_passiva >= 5:
+                st.info(f"👍 Bom início! {percentual_renda_passiva:.1f}% da renda")
+            elif percentual_renda_passiva > 0:
+                st.warning(f"📈 Continue investindo! {percentual_renda_passiva:.1f}%")
+            else:
+                st.error("❌ Invista em ativos que geram renda!")
+        
+        # Gráfico de gastos
+        if dados.get('saidas'):
+            st.markdown("---")
+            st.markdown("#### 📊 Onde Seu Dinheiro Está Indo?")
+            
+            hoje = datetime.now()
+            gastos_mes = indices['saidas'].totais_categoria(hoje.year, hoje.month)
+            
+            if gastos_mes:
+                gastos_cat = pd.Series(gastos_mes).sort_values(ascending=True)
+                
+                fig = figura("gastos_categoria_mes", _grafico_gastos_categoria_mes, gastos_cat)
+                mostrar_grafico(fig, use_container_width=True)
+    
+    # ===== TAB PROJEÇÕES =====
+    with tab3:
+        st.subheader("🔮 Projeções Futuras")
+        
+        st.info("💡 **Simulação de Monte Carlo com 10 mil cenários de rentabilidade, a partir do seu ritmo atual de investimentos**")
+        
+        # Parâmetros para projeção
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            aporte_mensal = st.number_input(
+                "💰 Aporte mensal estimado (R$)",
+                min_value=0.0,
+                value=float(ordenado_por_id(dados['aportes'])['valor'].iloc[-3:].sum() / 3 if len(dados['aportes']) >= 3 else 100),
+                format="%.2f"
+            )
+            crescimento_aporte = st.slider(
+                "📆 Aumento anual do aporte (%)",
+                min_value=0.0,
+                max_value=20.0,
+                value=0.0,
+                step=0.5
+            )
+            anos_projecao = st.slider(
+                "⏳ Horizonte (anos)",
+                min_value=1,
+                max_value=MESES_MAXIMOS // 12,
+                value=3
+            )
+        
+        with col2:
+            rentabilidade_anual = st.slider(
+                "📈 Rentabilidade anual esperada (%)",
+                min_value=0.0,
+                max_value=30.0,
+                value=12.0,
+                step=0.5
+            )
+            volatilidade_anual = st.slider(
+                "🎲 Volatilidade anual (%)",
+                min_value=0.0,
+                max_value=40.0,
+                value=15.0,
+                step=0.5
+            )
+        
+        st.markdown("---")
+        
+        # Calcular projeções (P5, P50, P95 de cada mês)
+        meses = list(range(1, anos_projecao * 12 + 1))
+        pessimista, mediana, otimista = simular_patrimonio(
+            patrimonio, aporte_mensal, rentabilidade_anual, volatilidade_anual,
+            crescimento_aporte, len(meses)
+        )
+        
+        # Exibir projeções chave
+        marcos = sorted({1, (anos_projecao + 1) // 2, anos_projecao})
+        for coluna, anos in zip(st.columns(len(marcos)), marcos):
+            with coluna:
+                i = anos * 12 - 1
+                st.metric(
+                    f"🎯 Em {anos} Ano{'s' if anos > 1 else ''}",
+                    f"R$ {mediana[i]:,.2f}",
+                    delta=f"+R$ {mediana[i]-patrimonio:,.2f}",
+                    help=f"Entre R$ {pessimista[i]:,.2f} e R$ {otimista[i]:,.2f} em 90% dos cenários"
+                )
+        
+        # Gráfico de projeção
+        st.markdown("---")
+        st.markdown("#### 📈 Evolução Projetada do Patrimônio")
+        
+        fig = figura("projecao_patrimonio", _grafico_projecao_patrimonio, meses, pessimista, mediana, otimista, patrimonio)
+        
+        mostrar_grafico(fig, use_container_width=True)
+        
+        # Projeção de renda passiva
+        st.markdown("---")
+        st.markdown("#### 💰 Projeção de Renda Passiva")
+        
+        dy_medio = RENDIMENTO_PASSIVO_ANUAL / 100
+        renda_passiva_projetada = mediana * dy_medio / 12
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric(
+                "💵 Renda Passiva em 1 Ano",
+                f"R$ {renda_passiva_projetada[11]:,.2f}/mês"
+            )
+            st.metric(
+                f"💵 Renda Passiva em {anos_projecao} Anos",
+                f"R$ {renda_passiva_projetada[-1]:,.2f}/mês"
+            )
+        
+        with col2:
+            independencia = entradas_mes  # Valor necessário para independência
+            meses_para_independencia = meses_ate(renda_passiva_projetada, independencia)
+            
+            if meses_para_independencia:
+                anos = meses_para_independencia // 12
+                meses_rest = meses_para_independencia % 12
+                st.success(f"🎯 **Independência Financeira em:**")
+                st.markdown(f"### {anos} anos e {meses_rest} meses")
+                st.caption("No cenário mediano")
+            else:
+                st.warning(f"📈 Aumente aportes para alcançar independência em {anos_projecao} anos!")
+    
+    # ===== TAB COMPARATIVOS =====
+    with tab4:
+        st.subheader("📊 Comparação com Benchmarks")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            cdi = dados.get('cdi_anual', 0)
+            st.metric("CDI Acumulado 2026", f"{cdi:.2f}%")
+            
+            if rentabilidade > cdi:
+                st.success(f"✅ Você está **{rentabilidade - cdi:.2f}%** acima do CDI!")
+            elif rentabilidade < cdi:
+                st.warning(f"⚠️ Você está **{cdi - rentabilidade:.2f}%** abaixo do CDI")
+            else:
+                st.info("⚖️ Você está empatado com o CDI")
+        
+        with col2:
+            percentual_cdi = (rentabilidade / cdi * 100) if cdi > 0 else 0
+            st.metric("% do CDI", f"{percentual_cdi:.1f}%")
+            
+            if percentual_cdi >= 110:
+                st.success("🔥 Performance excelente!")
+            elif percentual_cdi >= 100:
+                st.info("✅ Batendo o CDI!")
+            else:
+                st.warning("📊 Revise sua estratégia")
+        
+        st.markdown("---")
+        st.markdown("#### 💡 Recomendações Personalizadas")
+        
+        # Recomendações baseadas no perfil
+        if taxa_poupanca < 20:
+            st.warning("💰 **Aumente sua taxa de poupança**\nTente economizar pelo menos 20% da sua renda mensal.")
+        
+        if len(dados['carteira']) < 3:
+            st.info("🎯 **Diversifique sua carteira**\nTenha pelo menos 3-5 ativos diferentes para reduzir riscos.")
+        
+        if proventos_mes == 0:
+            st.warning("💵 **Invista em ativos que geram renda**\nFIIs e ações pagadoras de dividendos podem gerar renda passiva.")
+        
+        if rentabilidade < cdi:
+            st.error("📉 **Reavalie sua estratégia**\nSua carteira está abaixo do CDI. Considere ativos de maior rentabilidade.")
+        
+        if patrimonio > 0 and len(dados.get('metas', {})) == 0:
+            st.info("🎯 **Defina suas metas**\nEstabeleça objetivos claros de patrimônio e renda passiva.")
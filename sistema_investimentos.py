@@ -5,654 +5,874 @@ Sistema de Acompanhamento de Investimentos
 Especializado para carteira de FIIs e Ações
 """
 
+import argparse
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import copy
+from pathlib import Path
+
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import column_index_from_string, coordinate_to_tuple, get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 from openpyxl.formatting.rule import CellIsRule
-from openpyxl.chart import PieChart, LineChart, Reference
-from datetime import datetime, timedelta
-
-def criar_sistema_investimentos():
-    """Cria planilha completa de controle de investimentos"""
-    wb = Workbook()
-    wb.remove(wb.active)  # Remove a planilha padrão
-    
-    # ========== DEFINIÇÕES DE ESTILO ==========
-    # Cores profissionais
-    cor_header_azul = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-    cor_header_verde = PatternFill(start_color="2E7D32", end_color="2E7D32", fill_type="solid")
-    cor_header_laranja = PatternFill(start_color="E65100", end_color="E65100", fill_type="solid")
-    cor_header_roxo = PatternFill(start_color="6A1B9A", end_color="6A1B9A", fill_type="solid")
-    cor_header_vermelho = PatternFill(start_color="C62828", end_color="C62828", fill_type="solid")
-    
-    cor_positivo = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
-    cor_negativo = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
-    cor_neutro = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
-    cor_info = PatternFill(start_color="BBDEFB", end_color="BBDEFB", fill_type="solid")
-    cor_destaque = PatternFill(start_color="FFE0B2", end_color="FFE0B2", fill_type="solid")
-    
-    # Fontes
-    font_header = Font(bold=True, size=11, color="FFFFFF")
-    font_titulo = Font(bold=True, size=14, color="1F4E78")
-    
-    # Bordas
-    border_thin = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    border_thick = Border(
-        left=Side(style='medium'),
-        right=Side(style='medium'),
-        top=Side(style='medium'),
-        bottom=Side(style='medium')
-    )
-    
-    # ========== ABA 1: DASHBOARD ==========
-    ws_dash = wb.create_sheet("📊 Dashboard")
-    
+from datetime import datetime
+
+import numpy as np
+
+from nucleo.armazenamento import carregar_arquivo
+
+# ========== DEFINIÇÕES DE ESTILO ==========
+# Cores profissionais
+AZUL = "1F4E78"
+VERDE = "2E7D32"
+LARANJA = "E65100"
+ROXO = "6A1B9A"
+VERMELHO = "C62828"
+BRANCO = "FFFFFF"
+CINZA = "666666"
+
+def _fundo(cor):
+    return PatternFill(start_color=cor, end_color=cor, fill_type="solid")
+
+cor_header_azul = _fundo(AZUL)
+cor_header_verde = _fundo(VERDE)
+cor_header_laranja = _fundo(LARANJA)
+cor_header_roxo = _fundo(ROXO)
+cor_header_vermelho = _fundo(VERMELHO)
+
+cor_positivo = _fundo("C8E6C9")
+cor_negativo = _fundo("FFCDD2")
+cor_neutro = _fundo("FFF9C4")
+cor_info = _fundo("BBDEFB")
+cor_destaque = _fundo("FFE0B2")
+
+FUNDOS_CABECALHO = {'azul': cor_header_azul, 'verde': cor_header_verde,
+                    'laranja': cor_header_laranja, 'roxo': cor_header_roxo}
+
+# Fontes
+font_header = Font(bold=True, size=11, color=BRANCO)
+
+# Bordas
+border_thin = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+border_thick = Border(
+    left=Side(style='medium'),
+    right=Side(style='medium'),
+    top=Side(style='medium'),
+    bottom=Side(style='medium')
+)
+
+CENTRO = Alignment(horizontal='center')
+CENTRO_QUEBRA = Alignment(horizontal='center', wrap_text=True)
+
+MOEDA = 'R$ #,##0.00'
+PERCENTUAL = '0.00%'
+VARIACAO = '+0.00%;-0.00%'
+DATA = 'DD/MM/YYYY'
+
+def _estilos():
+    """Estilos nomeados da planilha: cada combinação de fonte/fundo/borda/formato existe uma só vez"""
+    estilos = {
+        'titulo_dashboard': dict(font=Font(bold=True, size=18, color=AZUL), alignment=CENTRO),
+        'nota': dict(font=Font(size=10, italic=True)),
+        'data_atualizacao': dict(font=Font(size=10, bold=True), number_format=DATA),
+        'instrucao': dict(font=Font(italic=True, size=9, color=CINZA)),
+        'dica': dict(font=Font(italic=True, size=9, color=AZUL)),
+        'exemplo': dict(font=Font(italic=True, size=9)),
+        'exemplo_data': dict(font=Font(italic=True, size=9), number_format=DATA),
+        'rotulo': dict(font=Font(bold=True)),
+        'data': dict(number_format=DATA),
+        'moeda': dict(number_format=MOEDA),
+        'percentual': dict(number_format=PERCENTUAL),
+        # Cards e indicadores do Dashboard
+        'kpi_moeda': dict(font=Font(bold=True, size=20, color=VERDE), fill=cor_positivo, border=border_thick,
+                          alignment=CENTRO, number_format=MOEDA),
+        'kpi_percentual': dict(font=Font(bold=True, size=20), fill=cor_info, border=border_thick,
+                               alignment=CENTRO, number_format=PERCENTUAL),
+        'moeda_laranja': dict(font=Font(bold=True, color=LARANJA), number_format=MOEDA),
+        'moeda_verde': dict(font=Font(bold=True, color=VERDE), number_format=MOEDA),
+        'moeda_pendente': dict(font=Font(bold=True), fill=cor_neutro, number_format=MOEDA),
+        # Grades com borda fina
+        'grade': dict(border=border_thin, alignment=CENTRO),
+        'grade_moeda': dict(border=border_thin, alignment=CENTRO, number_format=MOEDA),
+        'grade_percentual': dict(border=border_thin, alignment=CENTRO, number_format=PERCENTUAL),
+        'grade_percentual_1': dict(border=border_thin, alignment=CENTRO, number_format='0.0%'),
+        'grade_percentual_0': dict(border=border_thin, alignment=CENTRO, number_format='0%'),
+        'grade_variacao': dict(border=border_thin, alignment=CENTRO, number_format=VARIACAO),
+        'grade_rotulo': dict(font=Font(bold=True), border=border_thin),
+        'celula_moeda': dict(border=border_thin, number_format=MOEDA),
+        'celula_percentual': dict(border=border_thin, number_format=PERCENTUAL),
+        'celula_variacao': dict(border=border_thin, number_format=VARIACAO),
+        'celula_cdi': dict(font=Font(bold=True), fill=cor_info, border=border_thin, number_format=PERCENTUAL),
+        # Totais e resumos
+        'faixa_azul': dict(font=font_header, fill=cor_header_azul, alignment=CENTRO),
+        'total_moeda_info': dict(font=Font(bold=True, size=12), fill=cor_info, border=border_thick, number_format=MOEDA),
+        'total_moeda_positivo': dict(font=Font(bold=True, size=12), fill=cor_positivo, border=border_thick,
+                                     number_format=MOEDA),
+        'total_percentual_destaque': dict(font=Font(bold=True, size=12), fill=cor_destaque, border=border_thick,
+                                          number_format=PERCENTUAL),
+        'total_realizado': dict(font=Font(bold=True, size=12), fill=cor_destaque, border=border_thick,
+                                number_format='0%'),
+        'moeda_positivo': dict(font=Font(bold=True, size=12, color=VERDE), fill=cor_positivo, number_format=MOEDA),
+        'moeda_info': dict(font=Font(bold=True), fill=cor_info, number_format=MOEDA),
+        'moeda_destaque': dict(font=Font(bold=True, size=12), fill=cor_destaque, number_format=MOEDA),
+        'moeda_acumulado': dict(font=Font(bold=True, size=13, color=VERDE), fill=cor_positivo, border=border_thick,
+                                number_format=MOEDA),
+        'moeda_negrito': dict(font=Font(bold=True), number_format=MOEDA),
+        'progresso': dict(font=Font(bold=True, size=14), fill=cor_info, border=border_thick, number_format='0.0%'),
+    }
+    for nome, fundo in FUNDOS_CABECALHO.items():
+        estilos[f'titulo_aba_{nome}'] = dict(font=Font(bold=True, size=16, color=BRANCO), fill=fundo, alignment=CENTRO)
+        estilos[f'card_{nome}'] = dict(font=Font(bold=True, size=13, color=BRANCO), fill=fundo, alignment=CENTRO)
+        estilos[f'secao_{nome}'] = dict(font=Font(bold=True, size=12, color=BRANCO), fill=fundo, alignment=CENTRO)
+        estilos[f'cabecalho_{nome}'] = dict(font=font_header, fill=fundo, border=border_thick, alignment=CENTRO_QUEBRA)
+        estilos[f'grade_cabecalho_{nome}'] = dict(font=font_header, fill=fundo, border=border_thin, alignment=CENTRO)
+    return estilos
+
+def registrar_estilos(wb):
+    """Registra os estilos nomeados no workbook (objetos novos a cada workbook)"""
+    for nome, atributos in _estilos().items():
+        wb.add_named_style(NamedStyle(name=nome, **atributos))
+
+# ========== MONTAGEM DAS ABAS ==========
+class Bloco:
+    """Linhas de um histórico escritas a partir de (linha, coluna), uma tupla por linha"""
+
+    def __init__(self, linha, coluna, linhas, estilos):
+        self.linha = linha
+        self.coluna = coluna
+        self.estilos = estilos
+        self.ultima = linha - 1   # última linha já escrita
+        self._linhas = iter(linhas)
+        self.esgotado = False
+
+    def proxima(self):
+        """Próxima tupla de valores, ou None quando o histórico acaba"""
+        if self.esgotado:
+            return None
+        valores = next(self._linhas, None)
+        if valores is None:
+            self.esgotado = True
+        else:
+            self.ultima += 1
+        return valores
+
+class Folha:
+    """Conteúdo de uma aba, escrito linha a linha e em ordem
+
+    A ordem permite usar as abas write_only do openpyxl: cada linha vai para o
+    arquivo assim que é montada e os blocos de histórico são consumidos sob
+    demanda, então a memória não cresce com o número de linhas.
+    """
+
+    def __init__(self, titulo):
+        self.titulo = titulo
+        self.celulas = {}       # linha -> {coluna: (valor, estilo)}
+        self.blocos = []
+        self.mesclas = []
+        self.alturas = {}
+        self.larguras = {}
+        self.validacoes = []    # (DataValidation, intervalo)
+        self.condicionais = []  # (intervalo, regra)
+        self.tabelas = []
+
+    def celula(self, ref, valor=None, estilo=None):
+        linha, coluna = coordinate_to_tuple(ref)
+        self.celulas.setdefault(linha, {})[coluna] = (valor, estilo)
+
+    def mesclar(self, intervalo):
+        self.mesclas.append(intervalo)
+
+    def bloco(self, ref, linhas, estilos):
+        linha, coluna = coordinate_to_tuple(ref)
+        bloco = Bloco(linha, coluna, linhas, estilos)
+        self.blocos.append(bloco)
+        return bloco
+
+    def validacao(self, dv, intervalo):
+        self.validacoes.append((dv, intervalo))
+
+    def condicional(self, intervalo, regra):
+        self.condicionais.append((intervalo, regra))
+
+    def tabela(self, nome, intervalo, titulos):
+        """Tabela nomeada; os títulos precisam ser iguais aos textos do cabeçalho"""
+        self.tabelas.append(Table(
+            displayName=nome, ref=intervalo, autoFilter=AutoFilter(ref=intervalo),
+            tableColumns=[TableColumn(id=i, name=titulo) for i, titulo in enumerate(titulos, start=1)],
+            tableStyleInfo=TableStyleInfo(name='TableStyleLight1', showRowStripes=True)))
+
+    def _linhas(self):
+        """(número, {coluna: (valor, estilo)}) de cada linha não vazia, em ordem"""
+        ultima_fixa = max(self.celulas, default=0)
+        numero = 1
+        while numero <= ultima_fixa or any(not b.esgotado for b in self.blocos):
+            linha = dict(self.celulas.get(numero, {}))
+            for bloco in self.blocos:
+                if bloco.linha <= numero:
+                    valores = bloco.proxima()
+                    if valores is not None:
+                        for deslocamento, (valor, estilo) in enumerate(zip(valores, bloco.estilos)):
+                            if valor is not None or estilo is not None:
+                                linha[bloco.coluna + deslocamento] = (valor, estilo)
+            yield numero, linha
+            numero += 1
+
+    def escrever(self, ws, wb):
+        """Escreve a folha numa aba comum ou write_only"""
+        for coluna, largura in self.larguras.items():
+            ws.column_dimensions[coluna].width = largura
+        for linha, altura in self.alturas.items():
+            ws.row_dimensions[linha].height = altura
+
+        # Atribuir pelo nome (cell.style = ...) procura o estilo na lista do
+        # workbook a cada célula; o array de índices é resolvido uma vez só
+        indices = {nome: estilo.as_tuple() for nome, estilo in zip(wb.named_styles, wb._named_styles)}
+        streaming = not hasattr(ws, 'cell')
+        # Cada linha é serializada antes do próximo append: uma célula já
+        # estilizada por (coluna, estilo) é reaproveitada em todas as linhas
+        reutilizaveis = {}
+
+        for numero, linha in self._linhas():
+            if streaming:
+                celulas = [None] * max(linha, default=0)
+                for coluna, (valor, estilo) in linha.items():
+                    if estilo is None:
+                        celulas[coluna - 1] = valor
+                        continue
+                    celula = reutilizaveis.get((coluna, estilo))
+                    if celula is None:
+                        celula = reutilizaveis[coluna, estilo] = WriteOnlyCell(ws)
+                        celula._style = copy(indices[estilo])
+                    celula.value = valor
+                    celulas[coluna - 1] = celula
+                ws.append(celulas)
+            else:
+                for coluna, (valor, estilo) in linha.items():
+                    celula = ws.cell(row=numero, column=coluna, value=valor)
+                    if estilo is not None:
+                        celula._style = copy(indices[estilo])
+
+        # Mesclas, validações, formatação condicional e tabelas vão no fim da aba
+        for intervalo in self.mesclas:
+            if streaming:
+                ws.merged_cells.add(intervalo)
+            else:
+                ws.merge_cells(intervalo)
+        for dv, intervalo in self.validacoes:
+            dv.add(intervalo)
+            ws.data_validations.append(dv)
+        for intervalo, regra in self.condicionais:
+            ws.conditional_formatting.add(intervalo, regra)
+        for tabela in self.tabelas:
+            with warnings.catch_warnings():
+                # Aviso incondicional no write_only; as colunas já vêm em tableColumns
+                warnings.filterwarnings('ignore', 'In write-only mode')
+                ws.add_table(tabela)
+
+def _cabecalhos(folha, linha, coluna_inicial, titulos, cores, estilo='cabecalho'):
+    coluna = column_index_from_string(coluna_inicial)
+    for deslocamento, (titulo, cor) in enumerate(zip(titulos, cores)):
+        folha.celula(f'{get_column_letter(coluna + deslocamento)}{linha}', titulo, f'{estilo}_{cor}')
+
+def _larguras(folha, larguras):
+    folha.larguras.update(larguras)
+
+# ========== DADOS DO APP ==========
+# Abas referenciadas nas fórmulas (nomes com emoji precisam de aspas)
+ABA_DASHBOARD = "📊 Dashboard"
+ABA_CARTEIRA = "💼 Carteira"
+ABA_APORTES = "📅 Aportes"
+ABA_PROVENTOS = "💰 Proventos"
+ABA_PERFORMANCE = "📈 Performance"
+ABA_METAS = "🎯 Metas"
+
+LINHA_DADOS = 6  # primeira linha de dados das listas (cabeçalho na linha 5)
+
+# Sem registros, as listas ficam com a janela vazia do modelo para o usuário preencher
+LINHAS_MODELO = {
+    "carteira": 15,
+    "aportes": 100,
+    "proventos": 95,
+    "historico_patrimonio": 12,
+}
+
+MESES = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+         'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+def _ref(aba, intervalo):
+    return f"'{aba}'!{intervalo}"
+
+def _data(valor):
+    """Data do registro do app (datetime ou texto ISO) para a célula"""
+    if isinstance(valor, str):
+        return datetime.fromisoformat(valor[:10])
+    return valor
+
+def _registros(dados, colecao):
+    """Registros da coleção (lista ou livro), em ordem de data quando houver"""
+    registros = list(dados.get(colecao) or [])
+    if registros and 'data' in registros[0]:
+        registros.sort(key=lambda registro: _data(registro['data']))
+    return registros
+
+class Lista:
+    """Registros de uma coleção e as linhas que ela ocupa na aba"""
+
+    def __init__(self, dados, colecao):
+        self.registros = _registros(dados, colecao)
+        self.linhas = len(self.registros) or LINHAS_MODELO[colecao]
+        self.ultima = LINHA_DADOS + self.linhas - 1
+
+    def __bool__(self):
+        return bool(self.registros)
+
+    def coluna(self, letra, absoluta=False):
+        """Intervalo da coluna só nas linhas da lista (ex.: F6:F250)"""
+        if absoluta:
+            return f'${letra}${LINHA_DADOS}:${letra}${self.ultima}'
+        return f'{letra}{LINHA_DADOS}:{letra}{self.ultima}'
+
+def _tabela(folha, nome, coluna_inicial, titulos, lista):
+    """Tabela nomeada cobrindo cabeçalho + linhas da lista"""
+    coluna_final = get_column_letter(column_index_from_string(coluna_inicial) + len(titulos) - 1)
+    folha.tabela(nome, f'{coluna_inicial}{LINHA_DADOS - 1}:{coluna_final}{lista.ultima}', titulos)
+
+# ========== VALORES PRÉ-CALCULADOS ==========
+# No modo pré-calculado as células de resumo recebem valores calculados aqui,
+# com as mesmas regras das fórmulas; o arquivo abre sem recálculo (nada de
+# TODAY() ou SUMIFS para o Excel/LibreOffice reavaliar).
+
+def _numeros(lista, campo):
+    return np.array([registro.get(campo) or 0 for registro in lista.registros], dtype=float)
+
+def _dias(lista):
+    return np.array([_data(registro['data']) for registro in lista.registros], dtype='datetime64[D]')
+
+def _razao(numerador, denominador):
+    """Divisão que vale 0 quando o denominador é 0 (o IFERROR das fórmulas)"""
+    numerador, denominador = np.asarray(numerador, dtype=float), np.asarray(denominador, dtype=float)
+    return np.divide(numerador, denominador, out=np.zeros(np.broadcast(numerador, denominador).shape),
+                     where=denominador != 0)
+
+def _status_aporte(realizado, meta):
+    if realizado == 0:
+        return "⏳ Aguardando"
+    return "✅ Meta Atingida!" if realizado >= meta else "📊 Em Progresso"
+
+def _status_cdi(percentual):
+    if percentual >= 1.1:
+        return "🔥 Excelente!"
+    return "✅ Batendo!" if percentual >= 1 else "⚠️ Abaixo"
+
+def calcular_resumo(carteira, aportes, proventos, historico, metas, cdi_anual, hoje):
+    """Todos os valores que as fórmulas da planilha calculariam, em NumPy"""
+    hoje = datetime(hoje.year, hoje.month, hoje.day)  # TODAY(), sem as horas
+    r = {'hoje': hoje, 'cdi': (cdi_anual or 0) / 100}
+
+    # Carteira
+    cotas = _numeros(carteira, 'cotas')
+    r['codigo_ativo'] = [ativo.get('codigo') for ativo in carteira.registros]
+    r['cotas_ativo'] = cotas
+    r['investido_ativo'] = cotas * _numeros(carteira, 'preco_medio')
+    r['atual_ativo'] = cotas * _numeros(carteira, 'cotacao_atual')
+    r['rent_ativo'] = _razao(r['atual_ativo'] - r['investido_ativo'], r['investido_ativo'])
+    r['investido'] = float(r['investido_ativo'].sum())
+    r['patrimonio'] = float(r['atual_ativo'].sum())
+    r['rent_carteira'] = float(_razao(r['patrimonio'] - r['investido'], r['investido']))
+    r['peso_ativo'] = _razao(r['atual_ativo'], r['patrimonio'])
+
+    # Performance: variação entre snapshots e rentabilidade sobre o primeiro
+    patrimonios = _numeros(historico, 'valor')
+    r['variacao'] = np.concatenate([[np.nan], _razao(np.diff(patrimonios), patrimonios[:-1])]) \
+        if len(patrimonios) else patrimonios
+    inicial = patrimonios[0] if len(patrimonios) else 0
+    r['rentabilidade'] = float(_razao(r['patrimonio'] - inicial, inicial))
+    r['pct_cdi'] = float(_razao(r['rentabilidade'], r['cdi']))
+    r['rent_vs_cdi'] = r['rentabilidade'] - r['cdi']
+    r['status_cdi'] = _status_cdi(r['pct_cdi'])
+
+    # Proventos do mês e do ano corrente
+    inicio_mes = np.datetime64(hoje.strftime('%Y-%m-01'), 'D')
+    inicio_ano = np.datetime64(f'{hoje.year}-01-01', 'D')
+    datas, valores = _dias(proventos), _numeros(proventos, 'valor')
+    r['proventos_mes'] = float(valores[datas >= inicio_mes].sum())
+    r['proventos_ano'] = float(valores[datas >= inicio_ano].sum())
+    r['proventos_media'] = r['proventos_ano'] / hoje.month
+    r['proventos_projecao'] = r['proventos_media'] * 12
+
+    # Aportes por mês do ano corrente contra a meta mensal
+    datas, valores = _dias(aportes), _numeros(aportes, 'valor')
+    do_ano = datas.astype('datetime64[Y]') == np.datetime64(str(hoje.year), 'Y')
+    meses = datas[do_ano].astype('datetime64[M]').astype(int) % 12
+    r['meta_aporte'] = metas.get('economia_mensal') or 0
+    r['aportes_mes'] = np.bincount(meses, weights=valores[do_ano], minlength=12)
+    r['realizado_mes'] = _razao(r['aportes_mes'], r['meta_aporte'])
+    r['status_mes'] = [_status_aporte(valor, r['meta_aporte']) for valor in r['aportes_mes']]
+    r['meta_ano'] = r['meta_aporte'] * 12
+    r['aportes_ano'] = float(r['aportes_mes'].sum())
+    r['realizado_ano'] = float(_razao(r['aportes_ano'], r['meta_ano']))
+    r['meta_mes'] = r['meta_aporte']
+    r['aportado_mes'] = float(r['aportes_mes'][hoje.month - 1])
+    r['falta_mes'] = max(r['meta_mes'] - r['aportado_mes'], 0)
+
+    # Metas
+    meta_patrimonio = metas.get('patrimonio_anual') or 0
+    meta_renda = metas.get('renda_passiva_mensal') or 0
+    r['pct_meta_patrimonio'] = float(_razao(r['patrimonio'], meta_patrimonio))
+    r['falta_patrimonio'] = max(meta_patrimonio - r['patrimonio'], 0)
+    r['pct_meta_renda'] = float(_razao(r['proventos_media'], meta_renda))
+    r['falta_renda'] = max(meta_renda - r['proventos_media'], 0)
+    r['patrimonio_1_ano'] = r['patrimonio'] * (1 + r['cdi'])
+    r['renda_1_ano'] = r['proventos_media'] * 1.1
+    return r
+
+def _formula_ou_valor(resumo):
+    """Escolhe o conteúdo das células calculadas: a fórmula ou, com `resumo`, o valor
+
+    v(fórmula, chave[, índice]) -> fórmula, ou resumo[chave][índice]; índices fora
+    da lista (linhas vazias do modelo) deixam a célula vazia.
+    """
+    if resumo is None:
+        return lambda formula, chave, indice=None: formula
+
+    def valor(formula, chave, indice=None):
+        resultado = resumo[chave]
+        if indice is not None:
+            if indice >= len(resultado):
+                return None
+            resultado = resultado[indice]
+        if isinstance(resultado, np.generic):
+            resultado = resultado.item()
+        return None if resultado != resultado else resultado  # NaN vira célula vazia
+    return valor
+
+# ========== ABA 1: DASHBOARD ==========
+def montar_dashboard(carteira, proventos, ano, v):
+    folha = Folha(ABA_DASHBOARD)
+
     # Título
-    ws_dash['B2'] = "🎯 MEU SISTEMA DE INVESTIMENTOS"
-    ws_dash['B2'].font = Font(bold=True, size=18, color="1F4E78")
-    ws_dash['B2'].alignment = Alignment(horizontal='center')
-    ws_dash.merge_cells('B2:H2')
-    ws_dash.row_dimensions[2].height = 30
-    
+    folha.celula('B2', "🎯 MEU SISTEMA DE INVESTIMENTOS", 'titulo_dashboard')
+    folha.mesclar('B2:H2')
+    folha.alturas[2] = 30
+
     # Subtítulo com data
-    ws_dash['B3'] = "📅 Última Atualização:"
-    ws_dash['B3'].font = Font(size=10, italic=True)
-    ws_dash['C3'] = '=HOJE()'
-    ws_dash['C3'].number_format = 'DD/MM/YYYY'
-    ws_dash['C3'].font = Font(size=10, bold=True)
-    
+    folha.celula('B3', "📅 Última Atualização:", 'nota')
+    folha.celula('C3', v('=TODAY()', 'hoje'), 'data_atualizacao')
+
     # Cards de resumo
-    ws_dash['B5'] = "💰 PATRIMÔNIO ATUAL"
-    ws_dash['B5'].font = Font(bold=True, size=13, color="FFFFFF")
-    ws_dash['B5'].fill = cor_header_verde
-    ws_dash['B5'].alignment = Alignment(horizontal='center')
-    ws_dash.merge_cells('B5:C5')
-    
-    ws_dash['B6'] = '=SOMARPRODUTO(Carteira!D6:D20,Carteira!E6:E20)'
-    ws_dash['B6'].number_format = 'R$ #,##0.00'
-    ws_dash['B6'].font = Font(bold=True, size=20, color="2E7D32")
-    ws_dash['B6'].alignment = Alignment(horizontal='center')
-    ws_dash['B6'].fill = cor_positivo
-    ws_dash['B6'].border = border_thick
-    ws_dash.merge_cells('B6:C6')
-    ws_dash.row_dimensions[6].height = 40
-    
-    ws_dash['E5'] = "📈 RENTABILIDADE 2026"
-    ws_dash['E5'].font = Font(bold=True, size=13, color="FFFFFF")
-    ws_dash['E5'].fill = cor_header_azul
-    ws_dash['E5'].alignment = Alignment(horizontal='center')
-    ws_dash.merge_cells('E5:F5')
-    
-    ws_dash['E6'] = '=((B6-Performance!C6)/Performance!C6)'
-    ws_dash['E6'].number_format = '0.00%'
-    ws_dash['E6'].font = Font(bold=True, size=20)
-    ws_dash['E6'].alignment = Alignment(horizontal='center')
-    ws_dash['E6'].fill = cor_info
-    ws_dash['E6'].border = border_thick
-    ws_dash.merge_cells('E6:F6')
-    
-    ws_dash['G5'] = "💵 PROVENTOS/MÊS"
-    ws_dash['G5'].font = Font(bold=True, size=13, color="FFFFFF")
-    ws_dash['G5'].fill = cor_header_verde
-    ws_dash['G5'].alignment = Alignment(horizontal='center')
-    ws_dash.merge_cells('G5:H5')
-    
-    ws_dash['G6'] = '=SOMASE(Proventos!B:B,">="&DATA(ANO(HOJE()),MÊS(HOJE()),1),Proventos!E:E)'
-    ws_dash['G6'].number_format = 'R$ #,##0.00'
-    ws_dash['G6'].font = Font(bold=True, size=20, color="2E7D32")
-    ws_dash['G6'].alignment = Alignment(horizontal='center')
-    ws_dash['G6'].fill = cor_positivo
-    ws_dash['G6'].border = border_thick
-    ws_dash.merge_cells('G6:H6')
-    
+    folha.celula('B5', "💰 PATRIMÔNIO ATUAL", 'card_verde')
+    folha.mesclar('B5:C5')
+    folha.celula('B6', v(f"=SUM({_ref(ABA_CARTEIRA, carteira.coluna('H'))})", 'patrimonio'), 'kpi_moeda')
+    folha.mesclar('B6:C6')
+    folha.alturas[6] = 40
+
+    folha.celula('E5', f"📈 RENTABILIDADE {ano}", 'card_azul')
+    folha.mesclar('E5:F5')
+    inicial = _ref(ABA_PERFORMANCE, f'C{LINHA_DADOS}')
+    folha.celula('E6', v(f'=IFERROR((B6-{inicial})/{inicial},0)', 'rentabilidade'), 'kpi_percentual')
+    folha.mesclar('E6:F6')
+
+    folha.celula('G5', "💵 PROVENTOS/MÊS", 'card_verde')
+    folha.mesclar('G5:H5')
+    folha.celula('G6', v(f"=SUMIFS({_ref(ABA_PROVENTOS, proventos.coluna('F'))},"
+                         f"{_ref(ABA_PROVENTOS, proventos.coluna('B'))},\">=\"&DATE(YEAR(TODAY()),MONTH(TODAY()),1))",
+                         'proventos_mes'), 'kpi_moeda')
+    folha.mesclar('G6:H6')
+
     # Performance vs CDI
-    ws_dash['B9'] = "📊 PERFORMANCE vs BENCHMARKS"
-    ws_dash['B9'].font = Font(bold=True, size=12, color="FFFFFF")
-    ws_dash['B9'].fill = cor_header_azul
-    ws_dash['B9'].alignment = Alignment(horizontal='center')
-    ws_dash.merge_cells('B9:H9')
-    
-    headers_perf = ['B10', 'C10', 'D10', 'E10', 'F10']
-    valores_perf = ['Indicador', 'Rentabilidade', 'Vs. Minha Carteira', '% do CDI', 'Status']
-    for cell, valor in zip(headers_perf, valores_perf):
-        ws_dash[cell] = valor
-        ws_dash[cell].fill = cor_header_azul
-        ws_dash[cell].font = font_header
-        ws_dash[cell].alignment = Alignment(horizontal='center')
-        ws_dash[cell].border = border_thin
-    
-    ws_dash['B11'] = 'Minha Carteira'
-    ws_dash['C11'] = '=E6'
-    ws_dash['C11'].number_format = '0.00%'
-    ws_dash['D11'] = '-'
-    ws_dash['E11'] = '=(E6/Performance!C8)'
-    ws_dash['E11'].number_format = '0.00%'
-    ws_dash['F11'] = '=SE(E11>=1.1,"🔥 Excelente!",SE(E11>=1,"✅ Batendo!","⚠️ Abaixo"))'
-    
-    ws_dash['B12'] = 'CDI'
-    ws_dash['C12'] = '=Performance!C8'
-    ws_dash['C12'].number_format = '0.00%'
-    ws_dash['D12'] = '=E6-C12'
-    ws_dash['D12'].number_format = '+0.00%;-0.00%'
-    ws_dash['E12'] = '100,00%'
-    ws_dash['F12'] = 'Benchmark'
-    
-    for row in [11, 12]:
-        for col in ['B', 'C', 'D', 'E', 'F']:
-            ws_dash[f'{col}{row}'].border = border_thin
-            ws_dash[f'{col}{row}'].alignment = Alignment(horizontal='center')
-    
-    # Composição da carteira
-    ws_dash['B15'] = "📂 COMPOSIÇÃO DA CARTEIRA"
-    ws_dash['B15'].font = Font(bold=True, size=12, color="FFFFFF")
-    ws_dash['B15'].fill = cor_header_roxo
-    ws_dash['B15'].alignment = Alignment(horizontal='center')
-    ws_dash.merge_cells('B15:F15')
-    
-    headers_comp = ['B16', 'C16', 'D16', 'E16', 'F16']
-    valores_comp = ['Ativo', 'Cotas', 'Valor Investido', 'Valor Atual', '% Carteira']
-    for cell, valor in zip(headers_comp, valores_comp):
-        ws_dash[cell] = valor
-        ws_dash[cell].fill = cor_header_roxo
-        ws_dash[cell].font = font_header
-        ws_dash[cell].alignment = Alignment(horizontal='center')
-        ws_dash[cell].border = border_thin
-    
-    # Fórmulas para buscar dados da carteira
-    for idx, row in enumerate([17, 18, 19], start=1):
-        ws_dash[f'B{row}'] = f'=ÍNDICE(Carteira!B:B,{idx+5})'
-        ws_dash[f'C{row}'] = f'=ÍNDICE(Carteira!D:D,{idx+5})'
-        ws_dash[f'D{row}'] = f'=ÍNDICE(Carteira!F:F,{idx+5})'
-        ws_dash[f'D{row}'].number_format = 'R$ #,##0.00'
-        ws_dash[f'E{row}'] = f'=C{row}*ÍNDICE(Carteira!E:E,{idx+5})'
-        ws_dash[f'E{row}'].number_format = 'R$ #,##0.00'
-        ws_dash[f'F{row}'] = f'=E{row}/B6'
-        ws_dash[f'F{row}'].number_format = '0.0%'
-        
-        for col in ['B', 'C', 'D', 'E', 'F']:
-            ws_dash[f'{col}{row}'].border = border_thin
-            ws_dash[f'{col}{row}'].alignment = Alignment(horizontal='center')
-    
-    # Meta do mês
-    ws_dash['B22'] = "🎯 META DO MÊS ATUAL"
-    ws_dash['B22'].font = Font(bold=True, size=12, color="FFFFFF")
-    ws_dash['B22'].fill = cor_header_laranja
-    ws_dash['B22'].alignment = Alignment(horizontal='center')
-    ws_dash.merge_cells('B22:F22')
-    
-    ws_dash['B23'] = 'Meta de Aporte:'
-    ws_dash['C23'] = '=ÍNDICE(Aportes!D:D,MÊS(HOJE())+5)'
-    ws_dash['C23'].number_format = 'R$ #,##0.00'
-    ws_dash['C23'].font = Font(bold=True, color="E65100")
-    
-    ws_dash['B24'] = 'Já Aportado:'
-    ws_dash['C24'] = '=ÍNDICE(Aportes!E:E,MÊS(HOJE())+5)'
-    ws_dash['C24'].number_format = 'R$ #,##0.00'
-    ws_dash['C24'].font = Font(bold=True, color="2E7D32")
-    
-    ws_dash['B25'] = 'Falta Aportar:'
-    ws_dash['C25'] = '=C23-C24'
-    ws_dash['C25'].number_format = 'R$ #,##0.00'
-    ws_dash['C25'].font = Font(bold=True)
-    ws_dash['C25'].fill = cor_neutro
-    
-    # Larguras
-    ws_dash.column_dimensions['B'].width = 20
-    ws_dash.column_dimensions['C'].width = 15
-    ws_dash.column_dimensions['D'].width = 15
-    ws_dash.column_dimensions['E'].width = 18
-    ws_dash.column_dimensions['F'].width = 18
-    ws_dash.column_dimensions['G'].width = 18
-    ws_dash.column_dimensions['H'].width = 18
-    
-    # ========== ABA 2: CARTEIRA ==========
-    ws_carteira = wb.create_sheet("💼 Carteira")
-    
-    ws_carteira['B2'] = "💼 MINHA CARTEIRA DE INVESTIMENTOS"
-    ws_carteira['B2'].font = Font(bold=True, size=16, color="FFFFFF")
-    ws_carteira['B2'].fill = cor_header_roxo
-    ws_carteira['B2'].alignment = Alignment(horizontal='center')
-    ws_carteira.merge_cells('B2:I2')
-    ws_carteira.row_dimensions[2].height = 35
-    
-    ws_carteira['B3'] = "💡 INSTRUÇÕES: Adicione seus ativos abaixo. Atualize as cotações na coluna E para ver o valor atual automaticamente."
-    ws_carteira['B3'].font = Font(italic=True, size=9, color="666666")
-    ws_carteira.merge_cells('B3:I3')
-    
-    headers_cart = ['B5', 'C5', 'D5', 'E5', 'F5', 'G5', 'H5', 'I5']
-    valores_cart = ['🏢 Ativo', '📂 Tipo', '🔢 Cotas', '💵 Cotação Atual', '💰 Preço Médio', '📊 Total Investido', '📈 Valor Atual', '📊 Rent. %']
-    cores_cart = [cor_header_azul, cor_header_roxo, cor_header_verde, cor_header_laranja, cor_header_laranja, cor_header_azul, cor_header_verde, cor_header_roxo]
-    
-    for cell, valor, cor in zip(headers_cart, valores_cart, cores_cart):
-        ws_carteira[cell] = valor
-        ws_carteira[cell].fill = cor
-        ws_carteira[cell].font = font_header
-        ws_carteira[cell].alignment = Alignment(horizontal='center', wrap_text=True)
-        ws_carteira[cell].border = border_thick
-    ws_carteira.row_dimensions[5].height = 35
-    
-    # Primeira linha com instruções
-    ws_carteira['B6'] = '👉 Digite aqui (ex: MXRF11)'
-    ws_carteira['B6'].font = Font(italic=True, size=9, color="1F4E78")
-    ws_carteira['C6'] = 'FII'
-    ws_carteira['C6'].font = Font(italic=True, size=9)
-    
+    cdi = _ref(ABA_PERFORMANCE, 'I6')
+    folha.celula('B9', "📊 PERFORMANCE vs BENCHMARKS", 'secao_azul')
+    folha.mesclar('B9:H9')
+    _cabecalhos(folha, 10, 'B', ['Indicador', 'Rentabilidade', 'Vs. Minha Carteira', '% do CDI', 'Status'],
+                ['azul'] * 5, 'grade_cabecalho')
+
+    folha.celula('B11', 'Minha Carteira', 'grade')
+    folha.celula('C11', v('=E6', 'rentabilidade'), 'grade_percentual')
+    folha.celula('D11', '-', 'grade')
+    folha.celula('E11', v(f'=IFERROR(E6/{cdi},0)', 'pct_cdi'), 'grade_percentual')
+    folha.celula('F11', v('=IF(E11>=1.1,"🔥 Excelente!",IF(E11>=1,"✅ Batendo!","⚠️ Abaixo"))', 'status_cdi'), 'grade')
+
+    folha.celula('B12', 'CDI', 'grade')
+    folha.celula('C12', v(f'={cdi}', 'cdi'), 'grade_percentual')
+    folha.celula('D12', v('=E6-C12', 'rent_vs_cdi'), 'grade_variacao')
+    folha.celula('E12', '100,00%', 'grade')
+    folha.celula('F12', 'Benchmark', 'grade')
+
+    # Composição da carteira: uma linha por ativo (três no modelo vazio)
+    folha.celula('B15', "📂 COMPOSIÇÃO DA CARTEIRA", 'secao_roxo')
+    folha.mesclar('B15:F15')
+    _cabecalhos(folha, 16, 'B', ['Ativo', 'Cotas', 'Valor Investido', 'Valor Atual', '% Carteira'],
+                ['roxo'] * 5, 'grade_cabecalho')
+
+    def composicao():
+        for idx in range(len(carteira.registros) or 3):
+            origem = LINHA_DADOS + idx
+            yield (v(f"={_ref(ABA_CARTEIRA, f'B{origem}')}", 'codigo_ativo', idx),
+                   v(f"={_ref(ABA_CARTEIRA, f'D{origem}')}", 'cotas_ativo', idx),
+                   v(f"={_ref(ABA_CARTEIRA, f'G{origem}')}", 'investido_ativo', idx),
+                   v(f"={_ref(ABA_CARTEIRA, f'H{origem}')}", 'atual_ativo', idx),
+                   v(f'=IFERROR(E{17 + idx}/$B$6,0)', 'peso_ativo', idx))
+
+    folha.bloco('B17', composicao(), ('grade', 'grade', 'grade_moeda', 'grade_moeda', 'grade_percentual_1'))
+
+    # Meta do mês (abaixo da composição)
+    meta = 17 + (len(carteira.registros) or 3) + 2
+    folha.celula(f'B{meta}', "🎯 META DO MÊS ATUAL", 'secao_laranja')
+    folha.mesclar(f'B{meta}:F{meta}')
+
+    planejado = _ref(ABA_APORTES, f'D{LINHA_DADOS}:D{LINHA_DADOS + 11}')
+    realizado = _ref(ABA_APORTES, f'E{LINHA_DADOS}:E{LINHA_DADOS + 11}')
+    folha.celula(f'B{meta + 1}', 'Meta de Aporte:')
+    folha.celula(f'C{meta + 1}', v(f'=INDEX({planejado},MONTH(TODAY()))', 'meta_mes'), 'moeda_laranja')
+    folha.celula(f'B{meta + 2}', 'Já Aportado:')
+    folha.celula(f'C{meta + 2}', v(f'=INDEX({realizado},MONTH(TODAY()))', 'aportado_mes'), 'moeda_verde')
+    folha.celula(f'B{meta + 3}', 'Falta Aportar:')
+    folha.celula(f'C{meta + 3}', v(f'=MAX(C{meta + 1}-C{meta + 2},0)', 'falta_mes'), 'moeda_pendente')
+
+    _larguras(folha, {'B': 20, 'C': 15, 'D': 15, 'E': 18, 'F': 18, 'G': 18, 'H': 18})
+    return folha
+
+# ========== ABA 2: CARTEIRA ==========
+def _linhas_carteira(carteira, v):
+    for idx in range(carteira.linhas):
+        linha = LINHA_DADOS + idx
+        if carteira:
+            ativo = carteira.registros[idx]
+            valores = (ativo.get('codigo'), ativo.get('tipo'), ativo.get('cotas'),
+                       ativo.get('cotacao_atual'), ativo.get('preco_medio'))
+        else:
+            valores = (None,) * 5
+        yield (*valores, v(f'=D{linha}*F{linha}', 'investido_ativo', idx), v(f'=D{linha}*E{linha}', 'atual_ativo', idx),
+               v(f'=IFERROR((H{linha}-G{linha})/G{linha},0)', 'rent_ativo', idx))
+
+def montar_carteira(carteira, v):
+    folha = Folha(ABA_CARTEIRA)
+
+    folha.celula('B2', "💼 MINHA CARTEIRA DE INVESTIMENTOS", 'titulo_aba_roxo')
+    folha.mesclar('B2:I2')
+    folha.alturas[2] = 35
+
+    folha.celula('B3', "💡 INSTRUÇÕES: Adicione seus ativos abaixo. Atualize as cotações na coluna E para ver o valor atual automaticamente.", 'instrucao')
+    folha.mesclar('B3:I3')
+
+    titulos = ['🏢 Ativo', '📂 Tipo', '🔢 Cotas', '💵 Cotação Atual', '💰 Preço Médio',
+               '📊 Total Investido', '📈 Valor Atual', '📊 Rent. %']
+    _cabecalhos(folha, 5, 'B', titulos, ['azul', 'roxo', 'verde', 'laranja', 'laranja', 'azul', 'verde', 'roxo'])
+    folha.alturas[5] = 35
+    _tabela(folha, 'tbCarteira', 'B', titulos, carteira)
+
+    # Ativos (no modelo vazio, linhas só com as fórmulas e o exemplo na primeira)
+    folha.bloco(f'B{LINHA_DADOS}', _linhas_carteira(carteira, v),
+                (None, None, None, 'moeda', 'moeda', 'moeda', 'moeda', 'percentual'))
+    if not carteira:
+        folha.celula('B6', '👉 Digite aqui (ex: MXRF11)', 'dica')
+        folha.celula('C6', 'FII', 'exemplo')
+
     # Validação de dados para tipo
     dv_tipo = DataValidation(type="list", formula1='"FII,Ação,Renda Fixa"', allow_blank=False)
     dv_tipo.prompt = 'Selecione: FII, Ação ou Renda Fixa'
     dv_tipo.promptTitle = 'Tipo de Ativo'
-    ws_carteira.add_data_validation(dv_tipo)
-    dv_tipo.add('C6:C20')
-    
-    # Adicionar fórmulas nas colunas
-    ws_carteira['F6'] = '=D6*E6'
-    ws_carteira['F6'].number_format = 'R$ #,##0.00'
-    ws_carteira['G6'] = '=D6*E6'
-    ws_carteira['G6'].number_format = 'R$ #,##0.00'
-    ws_carteira['H6'] = '=(G6-F6)/F6'
-    ws_carteira['H6'].number_format = '0.00%'
-    
+    folha.validacao(dv_tipo, carteira.coluna('C'))
+
     # Formatação condicional para rentabilidade
-    ws_carteira.conditional_formatting.add('H6:H20',
-        CellIsRule(operator='greaterThan', formula=['0'], stopIfTrue=True, fill=cor_positivo, font=Font(color="2E7D32", bold=True)))
-    ws_carteira.conditional_formatting.add('H6:H20',
-        CellIsRule(operator='lessThan', formula=['0'], stopIfTrue=True, fill=cor_negativo, font=Font(color="C62828", bold=True)))
-    
-    # Totais
-    ws_carteira['B22'] = "💰 TOTAIS"
-    ws_carteira['B22'].font = Font(bold=True, size=12, color="FFFFFF")
-    ws_carteira['B22'].fill = cor_header_azul
-    ws_carteira['B22'].alignment = Alignment(horizontal='center')
-    ws_carteira.merge_cells('B22:E22')
-    
-    ws_carteira['F22'] = '=SOMA(F6:F20)'
-    ws_carteira['F22'].number_format = 'R$ #,##0.00'
-    ws_carteira['F22'].font = Font(bold=True, size=12)
-    ws_carteira['F22'].fill = cor_info
-    ws_carteira['F22'].border = border_thick
-    
-    ws_carteira['G22'] = '=SOMA(G6:G20)'
-    ws_carteira['G22'].number_format = 'R$ #,##0.00'
-    ws_carteira['G22'].font = Font(bold=True, size=12)
-    ws_carteira['G22'].fill = cor_positivo
-    ws_carteira['G22'].border = border_thick
-    
-    ws_carteira['H22'] = '=(G22-F22)/F22'
-    ws_carteira['H22'].number_format = '0.00%'
-    ws_carteira['H22'].font = Font(bold=True, size=12)
-    ws_carteira['H22'].fill = cor_destaque
-    ws_carteira['H22'].border = border_thick
-    
-    # Larguras
-    ws_carteira.column_dimensions['B'].width = 18
-    ws_carteira.column_dimensions['C'].width = 12
-    ws_carteira.column_dimensions['D'].width = 10
-    ws_carteira.column_dimensions['E'].width = 15
-    ws_carteira.column_dimensions['F'].width = 15
-    ws_carteira.column_dimensions['G'].width = 15
-    ws_carteira.column_dimensions['H'].width = 15
-    ws_carteira.column_dimensions['I'].width = 12
-    
-    # ========== ABA 3: APORTES ==========
-    ws_aportes = wb.create_sheet("📅 Aportes")
-    
-    ws_aportes['B2'] = "📅 PLANEJAMENTO DE APORTES MENSAIS"
-    ws_aportes['B2'].font = Font(bold=True, size=16, color="FFFFFF")
-    ws_aportes['B2'].fill = cor_header_laranja
-    ws_aportes['B2'].alignment = Alignment(horizontal='center')
-    ws_aportes.merge_cells('B2:G2')
-    ws_aportes.row_dimensions[2].height = 35
-    
-    ws_aportes['B3'] = "🎯 OBJETIVO: Acompanhe suas metas de aporte mensal e quanto já foi investido"
-    ws_aportes['B3'].font = Font(italic=True, size=9, color="666666")
-    ws_aportes.merge_cells('B3:G3')
-    
-    headers_ap = ['B5', 'C5', 'D5', 'E5', 'F5', 'G5']
-    valores_ap = ['📅 Mês', '🏢 Meta de Cotas', '💰 Meta Valor (R$)', '✅ Já Aportado', '📊 % Realizado', '📝 Status']
-    cores_ap = [cor_header_azul, cor_header_verde, cor_header_laranja, cor_header_verde, cor_header_roxo, cor_header_azul]
-    
-    for cell, valor, cor in zip(headers_ap, valores_ap, cores_ap):
-        ws_aportes[cell] = valor
-        ws_aportes[cell].fill = cor
-        ws_aportes[cell].font = font_header
-        ws_aportes[cell].alignment = Alignment(horizontal='center', wrap_text=True)
-        ws_aportes[cell].border = border_thick
-    ws_aportes.row_dimensions[5].height = 35
-    
-    # Meses do ano
-    meses = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 
-             'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
-    
-    for idx, mes in enumerate(meses, start=6):
-        ws_aportes[f'B{idx}'] = mes
-        ws_aportes[f'B{idx}'].font = Font(bold=True)
-        ws_aportes[f'B{idx}'].border = border_thin
-        
-        # Fórmulas
-        ws_aportes[f'F{idx}'] = f'=SE(E{idx}=0,"⏳ Aguardando",SE(E{idx}>=D{idx},"✅ Meta Atingida!","📊 Em Progresso"))'
-        ws_aportes[f'F{idx}'].border = border_thin
-        ws_aportes[f'F{idx}'].alignment = Alignment(horizontal='center')
-        
-        ws_aportes[f'G{idx}'] = f'=E{idx}/D{idx}'
-        ws_aportes[f'G{idx}'].number_format = '0%'
-        ws_aportes[f'G{idx}'].border = border_thin
-        ws_aportes[f'G{idx}'].alignment = Alignment(horizontal='center')
-        
-        for col in ['C', 'D', 'E']:
-            ws_aportes[f'{col}{idx}'].border = border_thin
-            ws_aportes[f'{col}{idx}'].alignment = Alignment(horizontal='center')
-            if col in ['D', 'E']:
-                ws_aportes[f'{col}{idx}'].number_format = 'R$ #,##0.00'
-    
+    folha.condicional(carteira.coluna('I'),
+        CellIsRule(operator='greaterThan', formula=['0'], stopIfTrue=True, fill=cor_positivo, font=Font(color=VERDE, bold=True)))
+    folha.condicional(carteira.coluna('I'),
+        CellIsRule(operator='lessThan', formula=['0'], stopIfTrue=True, fill=cor_negativo, font=Font(color=VERMELHO, bold=True)))
+
+    # Totais (logo abaixo da lista)
+    total = carteira.ultima + 2
+    folha.celula(f'B{total}', "💰 TOTAIS", 'secao_azul')
+    folha.mesclar(f'B{total}:F{total}')
+    folha.celula(f'G{total}', v(f"=SUM({carteira.coluna('G')})", 'investido'), 'total_moeda_info')
+    folha.celula(f'H{total}', v(f"=SUM({carteira.coluna('H')})", 'patrimonio'), 'total_moeda_positivo')
+    folha.celula(f'I{total}', v(f'=IFERROR((H{total}-G{total})/G{total},0)', 'rent_carteira'), 'total_percentual_destaque')
+
+    _larguras(folha, {'B': 18, 'C': 12, 'D': 10, 'E': 15, 'F': 15, 'G': 15, 'H': 15, 'I': 12})
+    return folha
+
+# ========== ABA 3: APORTES ==========
+def _linhas_aportes(aportes):
+    for aporte in aportes.registros:
+        yield _data(aporte.get('data')), aporte.get('ativo'), aporte.get('cotas'), aporte.get('valor')
+
+def montar_aportes(aportes, meta_mensal, v):
+    folha = Folha(ABA_APORTES)
+
+    folha.celula('B2', "📅 PLANEJAMENTO DE APORTES MENSAIS", 'titulo_aba_laranja')
+    folha.mesclar('B2:G2')
+    folha.alturas[2] = 35
+
+    folha.celula('B3', "🎯 OBJETIVO: Acompanhe suas metas de aporte mensal e quanto já foi investido", 'instrucao')
+    folha.mesclar('B3:G3')
+
+    _cabecalhos(folha, 5, 'B',
+                ['📅 Mês', '🏢 Meta de Cotas', '💰 Meta Valor (R$)', '✅ Já Aportado', '📊 % Realizado', '📝 Status'],
+                ['azul', 'verde', 'laranja', 'verde', 'roxo', 'azul'])
+    folha.alturas[5] = 35
+
+    # Meses do ano corrente; "Já Aportado" soma o histórico (colunas I:L) do mês
+    datas, valores = aportes.coluna('I', absoluta=True), aportes.coluna('L', absoluta=True)
+    for mes, nome in enumerate(MESES, start=1):
+        idx = LINHA_DADOS + mes - 1
+        folha.celula(f'B{idx}', nome, 'grade_rotulo')
+        folha.celula(f'C{idx}', None, 'grade')
+        folha.celula(f'D{idx}', meta_mensal or None, 'grade_moeda')
+        folha.celula(f'E{idx}', v(f'=SUMIFS({valores},{datas},">="&DATE(YEAR(TODAY()),{mes},1),'
+                                  f'{datas},"<"&DATE(YEAR(TODAY()),{mes + 1},1))', 'aportes_mes', mes - 1), 'grade_moeda')
+        folha.celula(f'F{idx}', v(f'=IF(E{idx}=0,"⏳ Aguardando",IF(E{idx}>=D{idx},"✅ Meta Atingida!","📊 Em Progresso"))',
+                                  'status_mes', mes - 1), 'grade')
+        folha.celula(f'G{idx}', v(f'=IFERROR(E{idx}/D{idx},0)', 'realizado_mes', mes - 1), 'grade_percentual_0')
+
     # Formatação condicional
-    ws_aportes.conditional_formatting.add('G6:G17',
+    folha.condicional('G6:G17',
         CellIsRule(operator='greaterThanOrEqual', formula=['1'], stopIfTrue=True, fill=cor_positivo))
-    ws_aportes.conditional_formatting.add('G6:G17',
+    folha.condicional('G6:G17',
         CellIsRule(operator='between', formula=['0.5', '0.99'], stopIfTrue=True, fill=cor_neutro))
-    ws_aportes.conditional_formatting.add('G6:G17',
+    folha.condicional('G6:G17',
         CellIsRule(operator='lessThan', formula=['0.5'], stopIfTrue=True, fill=cor_negativo))
-    
+
     # Totais anuais
-    ws_aportes['B19'] = "📊 TOTAL ANUAL"
-    ws_aportes['B19'].font = Font(bold=True, size=11, color="FFFFFF")
-    ws_aportes['B19'].fill = cor_header_azul
-    ws_aportes['B19'].alignment = Alignment(horizontal='center')
-    ws_aportes.merge_cells('B19:C19')
-    
-    ws_aportes['D19'] = '=SOMA(D6:D17)'
-    ws_aportes['D19'].number_format = 'R$ #,##0.00'
-    ws_aportes['D19'].font = Font(bold=True, size=12)
-    ws_aportes['D19'].fill = cor_info
-    ws_aportes['D19'].border = border_thick
-    
-    ws_aportes['E19'] = '=SOMA(E6:E17)'
-    ws_aportes['E19'].number_format = 'R$ #,##0.00'
-    ws_aportes['E19'].font = Font(bold=True, size=12)
-    ws_aportes['E19'].fill = cor_positivo
-    ws_aportes['E19'].border = border_thick
-    
-    ws_aportes['G19'] = '=E19/D19'
-    ws_aportes['G19'].number_format = '0%'
-    ws_aportes['G19'].font = Font(bold=True, size=12)
-    ws_aportes['G19'].fill = cor_destaque
-    ws_aportes['G19'].border = border_thick
-    
-    # Larguras
-    ws_aportes.column_dimensions['B'].width = 15
-    ws_aportes.column_dimensions['C'].width = 15
-    ws_aportes.column_dimensions['D'].width = 18
-    ws_aportes.column_dimensions['E'].width = 18
-    ws_aportes.column_dimensions['F'].width = 20
-    ws_aportes.column_dimensions['G'].width = 15
-    
-    # ========== ABA 4: PROVENTOS ==========
-    ws_prov = wb.create_sheet("💰 Proventos")
-    
-    ws_prov['B2'] = "💰 CONTROLE DE PROVENTOS RECEBIDOS"
-    ws_prov['B2'].font = Font(bold=True, size=16, color="FFFFFF")
-    ws_prov['B2'].fill = cor_header_verde
-    ws_prov['B2'].alignment = Alignment(horizontal='center')
-    ws_prov.merge_cells('B2:F2')
-    ws_prov.row_dimensions[2].height = 35
-    
-    ws_prov['B3'] = "📝 Registre aqui todos os dividendos, JCP e rendimentos que você receber"
-    ws_prov['B3'].font = Font(italic=True, size=9, color="666666")
-    ws_prov.merge_cells('B3:F3')
-    
-    headers_pr = ['B5', 'C5', 'D5', 'E5', 'F5']
-    valores_pr = ['📅 Data', '🏢 Ativo', '📂 Tipo', '💵 Valor/Cota', '💰 Total Recebido']
-    cores_pr = [cor_header_azul, cor_header_azul, cor_header_verde, cor_header_laranja, cor_header_verde]
-    
-    for cell, valor, cor in zip(headers_pr, valores_pr, cores_pr):
-        ws_prov[cell] = valor
-        ws_prov[cell].fill = cor
-        ws_prov[cell].font = font_header
-        ws_prov[cell].alignment = Alignment(horizontal='center', wrap_text=True)
-        ws_prov[cell].border = border_thick
-    ws_prov.row_dimensions[5].height = 30
-    
+    folha.celula('B19', "📊 TOTAL ANUAL", 'faixa_azul')
+    folha.mesclar('B19:C19')
+    folha.celula('D19', v('=SUM(D6:D17)', 'meta_ano'), 'total_moeda_info')
+    folha.celula('E19', v('=SUM(E6:E17)', 'aportes_ano'), 'total_moeda_positivo')
+    folha.celula('G19', v('=IFERROR(E19/D19,0)', 'realizado_ano'), 'total_realizado')
+
+    # Histórico de aportes (ao lado do planejamento, cresce para baixo)
+    folha.celula('I3', "🧾 HISTÓRICO DE APORTES", 'secao_laranja')
+    folha.mesclar('I3:L3')
+    titulos = ['📅 Data', '🏢 Ativo', '🔢 Cotas', '💰 Valor']
+    _cabecalhos(folha, 5, 'I', titulos, ['azul', 'azul', 'verde', 'laranja'])
+    _tabela(folha, 'tbAportes', 'I', titulos, aportes)
+    folha.bloco(f'I{LINHA_DADOS}', _linhas_aportes(aportes), ('data', None, None, 'moeda'))
+
+    _larguras(folha, {'B': 15, 'C': 15, 'D': 18, 'E': 18, 'F': 20, 'G': 15,
+                      'I': 13, 'J': 15, 'K': 10, 'L': 15})
+    return folha
+
+# ========== ABA 4: PROVENTOS ==========
+def _linhas_proventos(proventos):
+    for provento in proventos.registros:
+        # Valor/Cota não é registrado no app: o valor do provento é o total recebido
+        yield _data(provento.get('data')), provento.get('ativo'), provento.get('tipo'), None, provento.get('valor')
+
+def montar_proventos(proventos, ano, v):
+    folha = Folha(ABA_PROVENTOS)
+
+    folha.celula('B2', "💰 CONTROLE DE PROVENTOS RECEBIDOS", 'titulo_aba_verde')
+    folha.mesclar('B2:F2')
+    folha.alturas[2] = 35
+
+    folha.celula('B3', "📝 Registre aqui todos os dividendos, JCP e rendimentos que você receber", 'instrucao')
+    folha.mesclar('B3:F3')
+
+    titulos = ['📅 Data', '🏢 Ativo', '📂 Tipo', '💵 Valor/Cota', '💰 Total Recebido']
+    _cabecalhos(folha, 5, 'B', titulos, ['azul', 'azul', 'verde', 'laranja', 'verde'])
+    folha.alturas[5] = 30
+    _tabela(folha, 'tbProventos', 'B', titulos, proventos)
+
+    # Registros: o histórico do app ou, sem ele, a linha de exemplo
+    folha.bloco(f'B{LINHA_DADOS}', _linhas_proventos(proventos), ('data', None, None, None, 'moeda'))
+    if not proventos:
+        folha.celula('B6', v('=TODAY()', 'hoje'), 'exemplo_data')
+        folha.celula('C6', '👉 Digite o código do ativo', 'dica')
+
     # Validação
     dv_tipo_prov = DataValidation(type="list", formula1='"Dividendo,JCP,Rendimento,Juros"', allow_blank=False)
     dv_tipo_prov.prompt = 'Selecione o tipo de provento'
     dv_tipo_prov.promptTitle = 'Tipo'
-    ws_prov.add_data_validation(dv_tipo_prov)
-    dv_tipo_prov.add('D6:D100')
-    
-    # Primeira linha
-    ws_prov['B6'] = '=HOJE()'
-    ws_prov['B6'].number_format = 'DD/MM/YYYY'
-    ws_prov['B6'].font = Font(italic=True, size=9)
-    
-    ws_prov['C6'] = '👉 Digite o código do ativo'
-    ws_prov['C6'].font = Font(italic=True, size=9, color="1F4E78")
-    
-    # Resumo mensal
-    ws_prov['B10'] = "📊 RESUMO POR MÊS"
-    ws_prov['B10'].font = Font(bold=True, size=12, color="FFFFFF")
-    ws_prov['B10'].fill = cor_header_azul
-    ws_prov['B10'].alignment = Alignment(horizontal='center')
-    ws_prov.merge_cells('B10:D10')
-    
-    ws_prov['B11'] = 'Mês Atual:'
-    ws_prov['C11'] = '=SOMASE(B:B,">="&DATA(ANO(HOJE()),MÊS(HOJE()),1),E:E)'
-    ws_prov['C11'].number_format = 'R$ #,##0.00'
-    ws_prov['C11'].font = Font(bold=True, size=12, color="2E7D32")
-    ws_prov['C11'].fill = cor_positivo
-    
-    ws_prov['B12'] = 'Média Mensal:'
-    ws_prov['C12'] = '=SOMA(E:E)/MÊS(HOJE())'
-    ws_prov['C12'].number_format = 'R$ #,##0.00'
-    ws_prov['C12'].font = Font(bold=True)
-    ws_prov['C12'].fill = cor_info
-    
-    ws_prov['B13'] = 'Projeção Anual:'
-    ws_prov['C13'] = '=C12*12'
-    ws_prov['C13'].number_format = 'R$ #,##0.00'
-    ws_prov['C13'].font = Font(bold=True, size=12)
-    ws_prov['C13'].fill = cor_destaque
-    
-    ws_prov['B14'] = 'Acumulado 2026:'
-    ws_prov['C14'] = '=SOMA(E:E)'
-    ws_prov['C14'].number_format = 'R$ #,##0.00'
-    ws_prov['C14'].font = Font(bold=True, size=13, color="2E7D32")
-    ws_prov['C14'].fill = cor_positivo
-    ws_prov['C14'].border = border_thick
-    
-    # Larguras
-    ws_prov.column_dimensions['B'].width = 15
-    ws_prov.column_dimensions['C'].width = 18
-    ws_prov.column_dimensions['D'].width = 15
-    ws_prov.column_dimensions['E'].width = 15
-    ws_prov.column_dimensions['F'].width = 18
-    
-    # ========== ABA 5: PERFORMANCE ==========
-    ws_perf = wb.create_sheet("📈 Performance")
-    
-    ws_perf['B2'] = "📈 ACOMPANHAMENTO DE PERFORMANCE"
-    ws_perf['B2'].font = Font(bold=True, size=16, color="FFFFFF")
-    ws_perf['B2'].fill = cor_header_azul
-    ws_perf['B2'].alignment = Alignment(horizontal='center')
-    ws_perf.merge_cells('B2:F2')
-    ws_perf.row_dimensions[2].height = 35
-    
-    ws_perf['B3'] = "📊 Acompanhe a evolução do seu patrimônio mês a mês"
-    ws_perf['B3'].font = Font(italic=True, size=9, color="666666")
-    ws_perf.merge_cells('B3:F3')
-    
-    headers_pf = ['B5', 'C5', 'D5', 'E5', 'F5']
-    valores_pf = ['📅 Mês', '💰 Patrimônio', '📊 Variação %', '📈 CDI Acum.', '🎯 Vs. CDI']
-    cores_pf = [cor_header_azul, cor_header_verde, cor_header_roxo, cor_header_laranja, cor_header_azul]
-    
-    for cell, valor, cor in zip(headers_pf, valores_pf, cores_pf):
-        ws_perf[cell] = valor
-        ws_perf[cell].fill = cor
-        ws_perf[cell].font = font_header
-        ws_perf[cell].alignment = Alignment(horizontal='center', wrap_text=True)
-        ws_perf[cell].border = border_thick
-    ws_perf.row_dimensions[5].height = 30
-    
-    # Linha inicial (Janeiro)
-    ws_perf['B6'] = '2026-01'
-    ws_perf['B6'].font = Font(bold=True)
-    ws_perf['C6'] = 0  # Patrimônio inicial - usuário preenche
-    ws_perf['C6'].number_format = 'R$ #,##0.00'
-    
-    # Fevereiro em diante (usuário preenche conforme os meses passam)
-    for idx, mes in enumerate(['02', '03', '04', '05', '06', '07', '08', '09', '10', '11', '12'], start=7):
-        ws_perf[f'B{idx}'] = f'2026-{mes}'
-        ws_perf[f'B{idx}'].font = Font(bold=True)
-        ws_perf[f'B{idx}'].border = border_thin
-        
-        ws_perf[f'C{idx}'].number_format = 'R$ #,##0.00'
-        ws_perf[f'C{idx}'].border = border_thin
-        
-        ws_perf[f'D{idx}'] = f'=(C{idx}-C{idx-1})/C{idx-1}'
-        ws_perf[f'D{idx}'].number_format = '0.00%'
-        ws_perf[f'D{idx}'].border = border_thin
-        
-        ws_perf[f'E{idx}'].number_format = '0.00%'
-        ws_perf[f'E{idx}'].border = border_thin
-        
-        ws_perf[f'F{idx}'] = f'=D{idx}-E{idx}'
-        ws_perf[f'F{idx}'].number_format = '+0.00%;-0.00%'
-        ws_perf[f'F{idx}'].border = border_thin
-    
+    folha.validacao(dv_tipo_prov, proventos.coluna('D'))
+
+    # Resumo mensal (ao lado dos registros, para a lista poder crescer)
+    datas, valores = proventos.coluna('B'), proventos.coluna('F')
+    inicio_ano = '">="&DATE(YEAR(TODAY()),1,1)'
+    folha.celula('H5', "📊 RESUMO POR MÊS", 'secao_azul')
+    folha.mesclar('H5:I5')
+
+    folha.celula('H6', 'Mês Atual:')
+    folha.celula('I6', v(f'=SUMIFS({valores},{datas},">="&DATE(YEAR(TODAY()),MONTH(TODAY()),1))', 'proventos_mes'),
+                 'moeda_positivo')
+    folha.celula('H7', 'Média Mensal:')
+    folha.celula('I7', v('=I9/MONTH(TODAY())', 'proventos_media'), 'moeda_info')
+    folha.celula('H8', 'Projeção Anual:')
+    folha.celula('I8', v('=I7*12', 'proventos_projecao'), 'moeda_destaque')
+    folha.celula('H9', f'Acumulado {ano}:')
+    folha.celula('I9', v(f'=SUMIFS({valores},{datas},{inicio_ano})', 'proventos_ano'), 'moeda_acumulado')
+
+    _larguras(folha, {'B': 15, 'C': 18, 'D': 15, 'E': 15, 'F': 18, 'H': 18, 'I': 18})
+    return folha
+
+# ========== ABA 5: PERFORMANCE ==========
+def _linhas_performance(historico, ano, v):
+    for idx in range(historico.linhas):
+        linha = LINHA_DADOS + idx
+        if historico:
+            ponto = historico.registros[idx]
+            mes, patrimonio = _data(ponto.get('data')), ponto.get('valor')
+        else:
+            mes, patrimonio = f'{ano}-{idx + 1:02d}', 0 if idx == 0 else None  # usuário preenche
+        variacao = None if idx == 0 else v(f'=IFERROR((C{linha}-C{linha - 1})/C{linha - 1},0)', 'variacao', idx)
+        yield mes, patrimonio, variacao, None, v(f'=D{linha}-E{linha}', 'variacao', idx)
+
+def montar_performance(historico, cdi_anual, ano, v):
+    folha = Folha(ABA_PERFORMANCE)
+
+    folha.celula('B2', "📈 ACOMPANHAMENTO DE PERFORMANCE", 'titulo_aba_azul')
+    folha.mesclar('B2:F2')
+    folha.alturas[2] = 35
+
+    folha.celula('B3', "📊 Acompanhe a evolução do seu patrimônio mês a mês", 'instrucao')
+    folha.mesclar('B3:F3')
+
+    titulos = ['📅 Mês', '💰 Patrimônio', '📊 Variação %', '📈 CDI Acum.', '🎯 Vs. CDI']
+    _cabecalhos(folha, 5, 'B', titulos, ['azul', 'verde', 'roxo', 'laranja', 'azul'])
+    folha.alturas[5] = 30
+    _tabela(folha, 'tbPatrimonio', 'B', titulos, historico)
+
+    # Um registro por snapshot do patrimônio (no modelo vazio, os meses do ano)
+    folha.bloco(f'B{LINHA_DADOS}', _linhas_performance(historico, ano, v),
+                ('data' if historico else 'grade_rotulo', 'celula_moeda', 'celula_percentual',
+                 'celula_percentual', 'celula_variacao'))
+
     # Campo para CDI acumulado do ano
-    ws_perf['B8'] = 'CDI Acumulado 2026:'
-    ws_perf['B8'].font = Font(bold=True)
-    ws_perf['C8'] = 0  # Usuário atualiza com CDI real
-    ws_perf['C8'].number_format = '0.00%'
-    ws_perf['C8'].fill = cor_info
-    ws_perf['C8'].font = Font(bold=True)
-    
+    folha.celula('H5', "📈 BENCHMARK", 'secao_azul')
+    folha.mesclar('H5:I5')
+    folha.celula('H6', f'CDI Acumulado {ano}:', 'grade_rotulo')
+    folha.celula('I6', (cdi_anual or 0) / 100, 'celula_cdi')  # Usuário atualiza com CDI real
+
     # Formatação condicional
-    ws_perf.conditional_formatting.add('D7:D17',
-        CellIsRule(operator='greaterThan', formula=['0'], stopIfTrue=True, fill=cor_positivo, font=Font(color="2E7D32", bold=True)))
-    ws_perf.conditional_formatting.add('D7:D17',
-        CellIsRule(operator='lessThan', formula=['0'], stopIfTrue=True, fill=cor_negativo, font=Font(color="C62828", bold=True)))
-    
-    ws_perf.conditional_formatting.add('F6:F17',
+    folha.condicional(historico.coluna('D'),
+        CellIsRule(operator='greaterThan', formula=['0'], stopIfTrue=True, fill=cor_positivo, font=Font(color=VERDE, bold=True)))
+    folha.condicional(historico.coluna('D'),
+        CellIsRule(operator='lessThan', formula=['0'], stopIfTrue=True, fill=cor_negativo, font=Font(color=VERMELHO, bold=True)))
+
+    folha.condicional(historico.coluna('F'),
         CellIsRule(operator='greaterThan', formula=['0'], stopIfTrue=True, fill=cor_positivo))
-    ws_perf.conditional_formatting.add('F6:F17',
+    folha.condicional(historico.coluna('F'),
         CellIsRule(operator='lessThan', formula=['0'], stopIfTrue=True, fill=cor_negativo))
-    
-    # Larguras
-    ws_perf.column_dimensions['B'].width = 15
-    ws_perf.column_dimensions['C'].width = 18
-    ws_perf.column_dimensions['D'].width = 15
-    ws_perf.column_dimensions['E'].width = 15
-    ws_perf.column_dimensions['F'].width = 15
-    
-    # ========== ABA 6: METAS ==========
-    ws_metas = wb.create_sheet("🎯 Metas")
-    
-    ws_metas['B2'] = "🎯 MINHAS METAS DE LONGO PRAZO"
-    ws_metas['B2'].font = Font(bold=True, size=16, color="FFFFFF")
-    ws_metas['B2'].fill = cor_header_laranja
-    ws_metas['B2'].alignment = Alignment(horizontal='center')
-    ws_metas.merge_cells('B2:F2')
-    ws_metas.row_dimensions[2].height = 35
-    
+
+    _larguras(folha, {'B': 15, 'C': 18, 'D': 15, 'E': 15, 'F': 15, 'H': 22, 'I': 12})
+    return folha
+
+# ========== ABA 6: METAS ==========
+def montar_metas(metas, ano, v):
+    folha = Folha(ABA_METAS)
+
+    folha.celula('B2', "🎯 MINHAS METAS DE LONGO PRAZO", 'titulo_aba_laranja')
+    folha.mesclar('B2:F2')
+    folha.alturas[2] = 35
+
     # Meta de Patrimônio
-    ws_metas['B5'] = "💰 META DE PATRIMÔNIO"
-    ws_metas['B5'].font = Font(bold=True, size=12, color="FFFFFF")
-    ws_metas['B5'].fill = cor_header_verde
-    ws_metas['B5'].alignment = Alignment(horizontal='center')
-    ws_metas.merge_cells('B5:D5')
-    
-    ws_metas['B6'] = 'Meta para 2026:'
-    ws_metas['C6'] = 0  # Usuário define
-    ws_metas['C6'].number_format = 'R$ #,##0.00'
-    ws_metas['C6'].font = Font(bold=True, size=12)
-    ws_metas['C6'].fill = cor_destaque
-    
-    ws_metas['B7'] = 'Patrimônio Atual:'
-    ws_metas['C7'] = '=Dashboard!B6'
-    ws_metas['C7'].number_format = 'R$ #,##0.00'
-    ws_metas['C7'].font = Font(bold=True, size=12, color="2E7D32")
-    ws_metas['C7'].fill = cor_positivo
-    
-    ws_metas['B8'] = '% Atingido:'
-    ws_metas['C8'] = '=C7/C6'
-    ws_metas['C8'].number_format = '0.0%'
-    ws_metas['C8'].font = Font(bold=True, size=14)
-    ws_metas['C8'].fill = cor_info
-    ws_metas['C8'].border = border_thick
-    
-    ws_metas['B9'] = 'Falta para a Meta:'
-    ws_metas['C9'] = '=C6-C7'
-    ws_metas['C9'].number_format = 'R$ #,##0.00'
-    ws_metas['C9'].font = Font(bold=True)
-    
+    folha.celula('B5', "💰 META DE PATRIMÔNIO", 'secao_verde')
+    folha.mesclar('B5:D5')
+
+    folha.celula('B6', f'Meta para {ano}:')
+    folha.celula('C6', metas.get('patrimonio_anual', 0), 'moeda_destaque')  # Usuário define
+    folha.celula('B7', 'Patrimônio Atual:')
+    folha.celula('C7', v(f"={_ref(ABA_DASHBOARD, 'B6')}", 'patrimonio'), 'moeda_positivo')
+    folha.celula('B8', '% Atingido:')
+    folha.celula('C8', v('=IFERROR(C7/C6,0)', 'pct_meta_patrimonio'), 'progresso')
+    folha.celula('B9', 'Falta para a Meta:')
+    folha.celula('C9', v('=MAX(C6-C7,0)', 'falta_patrimonio'), 'moeda_negrito')
+
     # Meta de Renda Passiva
-    ws_metas['B12'] = "💵 META DE RENDA PASSIVA"
-    ws_metas['B12'].font = Font(bold=True, size=12, color="FFFFFF")
-    ws_metas['B12'].fill = cor_header_verde
-    ws_metas['B12'].alignment = Alignment(horizontal='center')
-    ws_metas.merge_cells('B12:D12')
-    
-    ws_metas['B13'] = 'Meta Mensal:'
-    ws_metas['C13'] = 0  # Usuário define (ex: R$ 1.000)
-    ws_metas['C13'].number_format = 'R$ #,##0.00'
-    ws_metas['C13'].font = Font(bold=True, size=12)
-    ws_metas['C13'].fill = cor_destaque
-    
-    ws_metas['B14'] = 'Recebendo Agora:'
-    ws_metas['C14'] = '=Proventos!C12'
-    ws_metas['C14'].number_format = 'R$ #,##0.00'
-    ws_metas['C14'].font = Font(bold=True, size=12, color="2E7D32")
-    ws_metas['C14'].fill = cor_positivo
-    
-    ws_metas['B15'] = '% Atingido:'
-    ws_metas['C15'] = '=C14/C13'
-    ws_metas['C15'].number_format = '0.0%'
-    ws_metas['C15'].font = Font(bold=True, size=14)
-    ws_metas['C15'].fill = cor_info
-    ws_metas['C15'].border = border_thick
-    
-    ws_metas['B16'] = 'Falta para a Meta:'
-    ws_metas['C16'] = '=C13-C14'
-    ws_metas['C16'].number_format = 'R$ #,##0.00'
-    ws_metas['C16'].font = Font(bold=True)
-    
+    folha.celula('B12', "💵 META DE RENDA PASSIVA", 'secao_verde')
+    folha.mesclar('B12:D12')
+
+    folha.celula('B13', 'Meta Mensal:')
+    folha.celula('C13', metas.get('renda_passiva_mensal', 0), 'moeda_destaque')  # Usuário define (ex: R$ 1.000)
+    folha.celula('B14', 'Recebendo Agora:')
+    folha.celula('C14', v(f"={_ref(ABA_PROVENTOS, 'I7')}", 'proventos_media'), 'moeda_positivo')
+    folha.celula('B15', '% Atingido:')
+    folha.celula('C15', v('=IFERROR(C14/C13,0)', 'pct_meta_renda'), 'progresso')
+    folha.celula('B16', 'Falta para a Meta:')
+    folha.celula('C16', v('=MAX(C13-C14,0)', 'falta_renda'), 'moeda_negrito')
+
     # Projeções
-    ws_metas['B19'] = "📊 PROJEÇÕES"
-    ws_metas['B19'].font = Font(bold=True, size=12, color="FFFFFF")
-    ws_metas['B19'].fill = cor_header_azul
-    ws_metas['B19'].alignment = Alignment(horizontal='center')
-    ws_metas.merge_cells('B19:D19')
-    
-    ws_metas['B20'] = 'Mantendo ritmo atual:'
-    ws_metas['B20'].font = Font(bold=True)
-    
-    ws_metas['B21'] = 'Patrimônio em 1 ano:'
-    ws_metas['C21'] = '=Dashboard!B6*(1+Performance!C8)'
-    ws_metas['C21'].number_format = 'R$ #,##0.00'
-    
-    ws_metas['B22'] = 'Renda passiva em 1 ano:'
-    ws_metas['C22'] = '=Proventos!C12*1.1'
-    ws_metas['C22'].number_format = 'R$ #,##0.00'
-    
-    # Larguras
-    ws_metas.column_dimensions['B'].width = 25
-    ws_metas.column_dimensions['C'].width = 20
-    ws_metas.column_dimensions['D'].width = 15
-    
+    folha.celula('B19', "📊 PROJEÇÕES", 'secao_azul')
+    folha.mesclar('B19:D19')
+
+    folha.celula('B20', 'Mantendo ritmo atual:', 'rotulo')
+    folha.celula('B21', 'Patrimônio em 1 ano:')
+    folha.celula('C21', v(f"={_ref(ABA_DASHBOARD, 'B6')}*(1+{_ref(ABA_PERFORMANCE, 'I6')})", 'patrimonio_1_ano'), 'moeda')
+    folha.celula('B22', 'Renda passiva em 1 ano:')
+    folha.celula('C22', v(f"={_ref(ABA_PROVENTOS, 'I7')}*1.1", 'renda_1_ano'), 'moeda')
+
+    _larguras(folha, {'B': 25, 'C': 20, 'D': 15})
+    return folha
+
+# ========== GERAÇÃO ==========
+def criar_sistema_investimentos(arquivo=None, dados=None, streaming=True, verboso=True, precalculado=False):
+    """Cria planilha completa de controle de investimentos
+
+    Com `dados` (a estrutura do app, ex.: carregar_arquivo(...)) a planilha
+    sai preenchida: carteira, aportes, proventos e histórico do patrimônio
+    viram tabelas nomeadas e as fórmulas cobrem exatamente as linhas
+    existentes. Sem eles, sai o modelo vazio. Com `streaming` as abas são
+    write_only, com memória constante mesmo com milhares de registros.
+    Com `precalculado` os totais, percentuais e status saem como valores
+    calculados aqui (sem TODAY/SUMIFS), e a planilha abre pronta em qualquer
+    leitor, sem recálculo; as células de entrada continuam editáveis.
+    `arquivo` pode ser um caminho ou um arquivo binário; é devolvido no fim.
+    """
+    dados = dados or {}
+    ano = datetime.now().year
+    carteira = Lista(dados, 'carteira')
+    aportes = Lista(dados, 'aportes')
+    proventos = Lista(dados, 'proventos')
+    historico = Lista(dados, 'historico_patrimonio')
+    metas = dados.get('metas') or {}
+    resumo = None
+    if precalculado:
+        resumo = calcular_resumo(carteira, aportes, proventos, historico, metas,
+                                 dados.get('cdi_anual'), datetime.now())
+    v = _formula_ou_valor(resumo)
+
+    wb = Workbook(write_only=streaming)
+    if not streaming:
+        wb.remove(wb.active)  # Remove a planilha padrão
+    registrar_estilos(wb)
+
+    folhas = [
+        montar_dashboard(carteira, proventos, ano, v),
+        montar_carteira(carteira, v),
+        montar_aportes(aportes, metas.get('economia_mensal'), v),
+        montar_proventos(proventos, ano, v),
+        montar_performance(historico, dados.get('cdi_anual'), ano, v),
+        montar_metas(metas, ano, v),
+    ]
+    for folha in folhas:
+        folha.escrever(wb.create_sheet(folha.titulo), wb)
+
     # ========== SALVAR ARQUIVO ==========
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-    filename = f"Sistema_Investimentos_{timestamp}.xlsx"
-    wb.save(filename)
-    
+    if arquivo is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        arquivo = f"Sistema_Investimentos_{timestamp}.xlsx"
+    wb.save(arquivo)
+    if not verboso:
+        return arquivo
+
     print("=" * 80)
     print("✅ SISTEMA DE INVESTIMENTOS CRIADO COM SUCESSO!")
     print("=" * 80)
-    print(f"📁 Arquivo: {filename}")
-    print(f"📊 Total de abas: {len(wb.sheetnames)}")
+    print(f"📁 Arquivo: {arquivo}")
+    print(f"📊 Total de abas: {len(folhas)}")
+    if dados:
+        print(f"🧾 Dados: {len(carteira.registros)} ativos, {len(aportes.registros)} aportes, "
+              f"{len(proventos.registros)} proventos, {len(historico.registros)} registros de patrimônio")
     print("\n🎯 ABAS CRIADAS:")
     print("   1. 📊 Dashboard - Visão geral do patrimônio e performance")
     print("   2. 💼 Carteira - Controle de suas cotas e ativos")
@@ -670,6 +890,86 @@ def criar_sistema_investimentos():
     print("   7. Acompanhe seu progresso no Dashboard!")
     print("\n🚀 Bons investimentos!")
     print("=" * 80)
+    return arquivo
+
+def exportar_planilha(arquivo_dados, arquivo=None, **opcoes):
+    """Gera a planilha preenchida com os dados salvos pelo app em `arquivo_dados`"""
+    return criar_sistema_investimentos(arquivo, carregar_arquivo(arquivo_dados), **opcoes)
+
+# ========== GERAÇÃO EM LOTE ==========
+COLECOES_PLANILHA = ('carteira', 'aportes', 'proventos', 'historico_patrimonio')
+
+def arquivos_carteiras(diretorio):
+    """Um arquivo de dados por carteira, em ordem de nome: o .db quando existe, senão o .json"""
+    arquivos = {}
+    for caminho in sorted(Path(diretorio).iterdir()):
+        if caminho.suffix in ('.json', '.db') and caminho.is_file():
+            if caminho.stem not in arquivos or caminho.suffix == '.db':
+                arquivos[caminho.stem] = caminho
+    return [arquivos[nome] for nome in sorted(arquivos)]
+
+def _gerar_carteira(arquivo_dados, arquivo, opcoes):
+    """Tarefa de um processo do lote: (nº de linhas de dados, segundos)"""
+    inicio = time.perf_counter()
+    dados = carregar_arquivo(arquivo_dados)
+    linhas = sum(len(dados.get(colecao) or ()) for colecao in COLECOES_PLANILHA)
+    criar_sistema_investimentos(arquivo, dados, verboso=False, **opcoes)
+    return linhas, time.perf_counter() - inicio
+
+def gerar_lote(diretorio, saida, processos=None, saida_progresso=sys.stdout, **opcoes):
+    """Uma planilha `<saida>/<carteira>.xlsx` por arquivo de dados de `diretorio`
+
+    As carteiras são distribuídas num pool de processos; o nome de saída vem só
+    do nome do arquivo de dados, então rodar de novo sobrescreve as mesmas
+    planilhas. Devolve {'planilhas', 'falhas', 'linhas', 'segundos'}.
+    """
+    saida = Path(saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    arquivos = arquivos_carteiras(diretorio)
+    resumo = {'planilhas': 0, 'falhas': [], 'linhas': 0, 'segundos': 0.0}
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        tarefas = {pool.submit(_gerar_carteira, arquivo, saida / f"{arquivo.stem}.xlsx", opcoes): arquivo
+                   for arquivo in arquivos}
+        for feitas, tarefa in enumerate(as_completed(tarefas), 1):
+            arquivo = tarefas[tarefa]
+            try:
+                linhas, segundos = tarefa.result()
+            except Exception as erro:
+                resumo['falhas'].append((arquivo.name, str(erro)))
+                situacao = f"❌ {erro}"
+            else:
+                resumo['planilhas'] += 1
+                resumo['linhas'] += linhas
+                situacao = f"✅ {linhas} linhas em {segundos:.2f}s"
+            print(f"[{feitas}/{len(arquivos)}] {arquivo.name}: {situacao}", file=saida_progresso, flush=True)
+    resumo['segundos'] = time.perf_counter() - inicio
+    return resumo
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Gera a planilha de investimentos de cada carteira de um diretório "
+                    "(arquivos .json/.db do app), em paralelo.")
+    parser.add_argument('diretorio', nargs='?', help="diretório com os arquivos de dados; sem ele, gera o modelo vazio")
+    parser.add_argument('-o', '--saida', default='planilhas', help="diretório das planilhas (padrão: planilhas)")
+    parser.add_argument('-j', '--processos', type=int, default=os.cpu_count(),
+                        help="processos em paralelo (padrão: nº de CPUs)")
+    parser.add_argument('--precalculado', action='store_true', help="valores já calculados, sem fórmulas")
+    parser.add_argument('--em-memoria', action='store_true', help="sem write_only (mais lento, mais memória)")
+    args = parser.parse_args(argumentos)
+
+    if args.diretorio is None:
+        criar_sistema_investimentos()
+        return 0
+    resumo = gerar_lote(args.diretorio, args.saida, args.processos,
+                        precalculado=args.precalculado, streaming=not args.em_memoria)
+    segundos = resumo['segundos'] or 1e-9
+    print(f"\n📊 {resumo['planilhas']} planilhas em {resumo['segundos']:.2f}s "
+          f"({resumo['planilhas'] / segundos:.1f} planilhas/s, {resumo['linhas'] / segundos:,.0f} linhas/s)"
+          f" com {args.processos} processos")
+    for nome, erro in resumo['falhas']:
+        print(f"❌ {nome}: {erro}")
+    return 1 if resumo['falhas'] else 0
 
 if __name__ == "__main__":
-    criar_sistema_investimentos()
+    sys.exit(main())
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regras de categorização com grupos próprios (python -m pytest, na raiz do projeto)
+"""
+
+from nucleo.categorizacao import Classificador
+
+def test_regra_com_referencia_a_grupo():
+    classificador = Classificador([
+        {'tipo': 'regex', 'padrao': r'(a)\1', 'categoria': 'Repetida'},
+        {'tipo': 'texto', 'padrao': 'uber', 'categoria': 'Transporte'},
+    ])
+    assert list(classificador.classificar(['x aa y', 'uber', 'x a y'], [10, 10, 10])) == \
+        ['Repetida', 'Transporte', None]
+
+def test_regras_com_o_mesmo_grupo_nomeado():
+    classificador = Classificador([
+        {'tipo': 'regex', 'padrao': r'(?P<n>pix)\s+\d+', 'categoria': 'Transferência'},
+        {'tipo': 'regex', 'padrao': r'(?P<n>ifood|rappi)', 'categoria': 'Alimentação'},
+        {'tipo': 'texto', 'padrao': 'posto', 'categoria': 'Transporte'},
+    ])
+    assert list(classificador.classificar(['PIX 123', 'iFood *Pedido', 'Posto Shell', 'pix'], [5, 5, 5, 5])) == \
+        ['Transferência', 'Alimentação', 'Transporte', None]
+
+def test_prioridade_e_faixa_de_valor_com_regras_isoladas():
+    classificador = Classificador([
+        {'tipo': 'regex', 'padrao': r'(uber)', 'categoria': 'Barata', 'valor_max': 20},
+        {'tipo': 'texto', 'padrao': 'uber', 'categoria': 'Transporte'},
+    ])
+    assert list(classificador.classificar(['Uber trip', 'Uber trip'], [-15, -40])) == ['Barata', 'Transporte']